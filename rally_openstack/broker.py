@@ -0,0 +1,277 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Publisher/consumer broker with adaptive number of consumers.
+
+It is a drop-in replacement of ``rally.common.broker`` which doesn't start
+all consumers at once. The number of jobs processed simultaneously starts
+small and grows while the latency of jobs stays flat. As soon as OpenStack
+APIs report overload (409, 413, 429 or 503 status codes) or the latency
+climbs, the number of simultaneous jobs is halved.
+"""
+
+import collections
+import threading
+import time
+
+from rally.common import logging
+
+
+LOG = logging.getLogger(__name__)
+
+# HTTP status codes which mean that the cloud can't serve more requests now
+OVERLOAD_STATUSES = (409, 413, 429, 503)
+
+# The number of simultaneous jobs to start with
+INITIAL_CONSUMERS = 2
+
+# The latency (the exponential moving average) is treated as climbing if it
+# is LATENCY_GROWTH times bigger than the best one observed
+LATENCY_GROWTH = 2.0
+
+# Latencies below this value (in seconds) are treated as equal, so the noise
+# of very fast jobs doesn't look like a climbing latency
+MIN_LATENCY = 0.01
+
+# The weight of the latest job in the latency moving average
+LATENCY_WEIGHT = 0.3
+
+# The best latency drifts towards the current one by this fraction after
+# every job, so a few lucky fast jobs do not make all the following ones
+# look slow forever
+BEST_LATENCY_DRIFT = 0.05
+
+_local = threading.local()
+
+
+def is_overload_error(e):
+    """Checks whether the exception means that the API is overloaded."""
+    return getattr(e, "code", getattr(e, "http_status", None)) in (
+        OVERLOAD_STATUSES)
+
+
+def report_error(e):
+    """Report an error of an API call made by the current consumer.
+
+    Consumers that handle errors by themselves (i.e. retry a request and do
+    not re-raise an exception) should call this method to let the broker know
+    about overloaded API. It does nothing outside of broker's consumers.
+
+    :param e: an exception raised by the API client
+    """
+    limit = getattr(_local, "limit", None)
+    if limit is not None and is_overload_error(e):
+        limit.decrease()
+
+
+def ignore_latency():
+    """Exclude the current job from the latency tracking.
+
+    Consumers should call this method for jobs which do not make API calls
+    (i.e. skip a resource), since the duration of such jobs says nothing
+    about the latency of APIs. It does nothing outside of broker's
+    consumers.
+    """
+    if getattr(_local, "limit", None) is not None:
+        _local.ignore_latency = True
+
+
+class AdaptiveLimit(object):
+    """A limit of simultaneous jobs which is tuned by latency of jobs.
+
+    The limit grows by one after every `limit` successful jobs with a flat
+    latency (additive increase) and is halved on overload (multiplicative
+    decrease). After the decrease, results of the jobs which were in flight
+    are ignored so one burst of errors halves the limit only once.
+    """
+
+    def __init__(self, max_value, min_value=1, initial=INITIAL_CONSUMERS):
+        self.max_value = max(max_value, 1)
+        self.min_value = max(min(min_value, self.max_value), 1)
+        self.value = max(min(initial, self.max_value), self.min_value)
+        self._active = 0
+        self._successes = 0
+        self._cooldown = 0
+        self._latency = None
+        self._best_latency = None
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """Wait until one more job can be started."""
+        with self._cond:
+            while self._active >= self.value:
+                self._cond.wait()
+            self._active += 1
+
+    def release(self, latency=None, overloaded=False):
+        """Finish the job started by acquire().
+
+        :param latency: the duration of the job in seconds
+        :param overloaded: whether the job failed because of overloaded API
+        """
+        with self._cond:
+            self._active -= 1
+            if self._cooldown:
+                self._cooldown -= 1
+            elif overloaded:
+                self._decrease()
+            elif latency is not None:
+                self._observe(latency)
+            self._cond.notify_all()
+
+    def decrease(self):
+        """Halve the limit because of overloaded API."""
+        with self._cond:
+            self._decrease()
+
+    def _decrease(self):
+        if self._cooldown:
+            return
+        value = max(self.min_value, self.value // 2)
+        if value != self.value:
+            LOG.debug("Decreasing the number of simultaneous jobs from %s "
+                      "to %s." % (self.value, value))
+        self.value = value
+        self._successes = 0
+        self._latency = None
+        # the jobs which are in flight were started with the old limit, so
+        # their results say nothing about the new one
+        self._cooldown = self._active
+
+    def _observe(self, latency):
+        if self._latency is None:
+            self._latency = latency
+        else:
+            self._latency = (LATENCY_WEIGHT * latency
+                             + (1 - LATENCY_WEIGHT) * self._latency)
+        if self._best_latency is None or self._latency < self._best_latency:
+            self._best_latency = self._latency
+        else:
+            self._best_latency += BEST_LATENCY_DRIFT * (
+                self._latency - self._best_latency)
+
+        if self._latency > (max(self._best_latency, MIN_LATENCY)
+                            * LATENCY_GROWTH):
+            self._decrease()
+            # the latency of the new limit is the new baseline, so one climb
+            # halves the limit only once
+            self._best_latency = None
+            return
+
+        self._successes += 1
+        if self._successes >= self.value and self.value < self.max_value:
+            self._successes = 0
+            self.value += 1
+            LOG.debug("Increasing the number of simultaneous jobs to %s."
+                      % self.value)
+
+
+def _consumer(consume, queue, limit, errors=None):
+    """Worker that consumes tasks from queue while the limit allows it.
+
+    :param consume: method that consumes an object removed from the queue
+    :param queue: deque object to popleft() objects from
+    :param limit: AdaptiveLimit object
+    :param errors: a list to store exceptions raised by consume()
+    """
+    _local.limit = limit
+    cache = {}
+    try:
+        while True:
+            limit.acquire()
+            try:
+                args = queue.popleft()
+            except IndexError:
+                limit.release()
+                break
+
+            overloaded = False
+            _local.ignore_latency = False
+            started_at = time.time()
+            try:
+                consume(cache, args)
+            except Exception as e:
+                if errors is not None:
+                    errors.append(e)
+                overloaded = is_overload_error(e)
+                msg = "Failed to consume a task from the queue"
+                if logging.is_debug():
+                    LOG.exception(msg)
+                else:
+                    LOG.warning("%s: %s" % (msg, e))
+            finally:
+                latency = None
+                if not _local.ignore_latency:
+                    latency = time.time() - started_at
+                limit.release(latency, overloaded)
+    finally:
+        _local.limit = None
+
+
+def _publisher(publish, queue):
+    """Calls a publish method that fills queue with jobs.
+
+    :param publish: method that fills the queue
+    :param queue: deque object to be filled by the publish() method
+    """
+    try:
+        publish(queue)
+    except Exception as e:
+        msg = "Failed to publish a task to the queue"
+        if logging.is_debug():
+            LOG.exception(msg)
+        else:
+            LOG.warning("%s: %s" % (msg, e))
+
+
+def run(publish, consume, consumers_count=1, adaptive=False, reraise=False):
+    """Run broker.
+
+    publish() put to queue, consume() process one element from queue.
+
+    When publish() is finished and elements from queue are processed process
+    is finished all consumers threads are cleaned.
+
+    :param publish: Function that puts values to the queue
+    :param consume: Function that processes a single value from the queue
+    :param consumers_count: The maximum number of consumers
+    :param adaptive: Whether to start with a few consumers and tune their
+        number by latency of jobs and API errors. Otherwise, all
+        consumers_count consumers work all the time.
+    :param reraise: Whether to raise the first error of consume() after all
+        the jobs are processed. Otherwise, errors are only logged.
+    """
+    queue = collections.deque()
+    _publisher(publish, queue)
+
+    consumers_count = min(consumers_count, len(queue))
+    if adaptive:
+        limit = AdaptiveLimit(consumers_count)
+    else:
+        limit = AdaptiveLimit(consumers_count, min_value=consumers_count,
+                              initial=consumers_count)
+
+    errors = [] if reraise else None
+    consumers = []
+    for i in range(consumers_count):
+        consumer = threading.Thread(target=_consumer,
+                                    args=(consume, queue, limit, errors))
+        consumer.start()
+        consumers.append(consumer)
+
+    for consumer in consumers:
+        consumer.join()
+
+    if errors:
+        raise errors[0]
@@ -23,5 +23,39 @@ OPTS = {"openstack": [
     cfg.IntOpt("cleanup_threads",
                default=20,
                deprecated_group="cleanup",
-               help="Number of cleanup threads to run")
+               help="Number of cleanup threads to run"),
+    cfg.BoolOpt("cleanup_adaptive_threads",
+                default=False,
+                help="Start cleanup of every resource manager with a few "
+                     "threads and add more of them (up to cleanup_threads) "
+                     "while the latency of API calls stays flat. The number "
+                     "of threads is reduced when API reports overload "
+                     "(409, 413, 429 or 503 status codes) or the latency "
+                     "climbs."),
+    cfg.IntOpt("cleanup_families_concurrency",
+               default=4,
+               help="Number of independent service families (i.e. nova, "
+                    "glance, designate) which resources are cleaned up "
+                    "simultaneously. 1 means that all resource managers are "
+                    "processed strictly one after another."),
+    cfg.StrOpt("cleanup_journal_dir",
+               default="",
+               help="A directory to store journals of cleanup progress in "
+                    "(i.e. ~/.rally/cleanup). Cleanup of the whole cloud "
+                    "(`rally env cleanup`) continues from the journal of the "
+                    "interrupted call with the same arguments: resources "
+                    "which deletion is confirmed are skipped, deletion of "
+                    "the requested ones is only confirmed and finished "
+                    "resource managers are not listed again. Empty value "
+                    "disables journals."),
+    cfg.BoolOpt("cleanup_batch_polling",
+                default=True,
+                help="Confirm deletion of resources by listing all resources "
+                     "of a tenant once per polling interval instead of "
+                     "fetching each deleted resource separately."),
+    cfg.BoolOpt("cleanup_admin_bulk_list",
+                default=True,
+                help="List resources of all tenants at once using admin "
+                     "credential (if resource manager supports it) instead of "
+                     "one list call per tenant.")
 ]}
@@ -48,5 +48,11 @@ OPTS = {"openstack": [
                  default=1.0,
                  deprecated_group="benchmark",
                  help="Interval between checks when waiting for image "
-                      "creation.")
+                      "creation."),
+    cfg.IntOpt("images_context_workers",
+               default=10,
+               help="The number of tenants to upload images to "
+                    "simultaneously at images context. The remote image "
+                    "is downloaded only once to a local temporary file "
+                    "and uploaded from there to all tenants.")
 ]}
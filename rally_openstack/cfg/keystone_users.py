@@ -23,6 +23,21 @@ OPTS = {"openstack": [
                deprecated_group="users_context",
                help="The number of concurrent threads to use for serving "
                     "users context."),
+    cfg.BoolOpt("users_context_adaptive_workers",
+                default=False,
+                help="Start creating and deleting of users and projects "
+                     "with a few threads and add more of them (up to "
+                     "users_context_resource_management_workers) while the "
+                     "latency of keystone API stays flat. The number of "
+                     "threads is reduced when keystone reports overload or "
+                     "the latency climbs."),
+    cfg.BoolOpt("users_context_pipelined",
+                default=True,
+                help="Create users of a project right after the project "
+                     "is created instead of waiting for all projects. It "
+                     "is used only if there are enough projects to keep "
+                     "all users_context_resource_management_workers "
+                     "threads busy."),
     cfg.StrOpt("project_domain",
                default="default",
                deprecated_group="users_context",
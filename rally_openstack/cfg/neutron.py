@@ -36,4 +36,12 @@ OPTS = {"openstack": [
                     "Linux bridge agent",
                 ],
                 help="Neutron L2 agent types to find hosts to bind"),
+    cfg.IntOpt("network_context_workers",
+               default=10,
+               help="The number of tenants to create and delete networks "
+                    "of simultaneously at network context."),
+    cfg.IntOpt("allow_ssh_context_workers",
+               default=10,
+               help="The number of tenants to create security groups in "
+                    "simultaneously at allow_ssh context."),
 ]}
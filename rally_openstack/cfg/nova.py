@@ -304,5 +304,18 @@ OPTS = {"openstack": [
     cfg.FloatOpt("nova_detach_volume_poll_interval",
                  default=2.0,
                  deprecated_group="benchmark",
-                 help="Nova volume detach poll interval")
+                 help="Nova volume detach poll interval"),
+    cfg.IntOpt("servers_context_workers",
+               default=10,
+               help="The number of tenants to boot servers in "
+                    "simultaneously at servers context."),
+    cfg.IntOpt("keypair_context_workers",
+               default=10,
+               help="The number of users to create keypairs for "
+                    "simultaneously at keypair context."),
+    cfg.IntOpt("nova_servers_requests_workers",
+               default=10,
+               help="The number of simultaneous create or delete requests "
+                    "sent while booting or deleting several servers at "
+                    "once.")
 ]}
@@ -22,5 +22,22 @@ OPTS = {
             "openstack_client_http_timeout",
             default=180.0,
             help="HTTP timeout for any of OpenStack service in seconds")
+    ],
+    "openstack": [
+        cfg.IntOpt(
+            "keystone_session_pool_size",
+            default=1000,
+            help="The number of keystone sessions (and tokens) which are "
+                 "shared by all clients of the same credential within "
+                 "process. The least recently used sessions are dropped "
+                 "first. 0 disables sharing, i.e. every new Clients object "
+                 "authenticates by itself."),
+        cfg.IntOpt(
+            "keystone_token_refresh_margin",
+            default=300,
+            help="The number of seconds before the expiry of keystone token "
+                 "to refresh it in background. Clients which were created "
+                 "with the expiring token are re-created as well. 0 "
+                 "disables proactive refresh.")
     ]
 }
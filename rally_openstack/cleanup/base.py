@@ -41,7 +41,8 @@ class NoName(object):
 def resource(service, resource, order=0, admin_required=False,
              perform_for_admin_only=False, tenant_resource=False,
              max_attempts=3, timeout=CONF.openstack.resource_deletion_timeout,
-             interval=1, threads=CONF.openstack.cleanup_threads):
+             interval=1, threads=CONF.openstack.cleanup_threads,
+             complete_listing=False):
     """Decorator that overrides resource specification.
 
     Just put it on top of your resource class and specify arguments that you
@@ -61,6 +62,9 @@ def resource(service, resource, order=0, admin_required=False,
     :param interval: Resource status pooling interval
     :param threads: Amount of threads (workers) that are deleting resources
                     simultaneously
+    :param complete_listing: list() returns all resources of the user or
+                             tenant without pagination or filtering, so the
+                             resource which is missing in it is deleted
     """
 
     def inner(cls):
@@ -75,6 +79,7 @@ def resource(service, resource, order=0, admin_required=False,
         cls._interval = interval
         cls._threads = threads
         cls._tenant_resource = tenant_resource
+        cls._complete_listing = complete_listing
 
         return cls
 
@@ -99,7 +104,10 @@ class ResourceManager(object):
         self.tenant_uuid = tenant_uuid
 
     def _manager(self):
-        client = self._admin_required and self.admin or self.user
+        # NOTE: there is no user while cleaning up the whole cloud, so
+        #   admin is used for all resources in that case
+        client = ((self._admin_required or not self.user) and self.admin
+                  or self.user)
         return getattr(getattr(client, self._service)(), self._resource)
 
     def id(self):
@@ -131,3 +139,14 @@ class ResourceManager(object):
     def list(self):
         """List all resources specific for admin or user."""
         return self._manager().list()
+
+    def list_all_tenants(self):
+        """List resources of all tenants at once using admin credential.
+
+        Resource managers which are able to do it should override this method
+        to avoid one list call per tenant while cleaning up.
+
+        :returns: a dict with tenant ids as keys and lists of resources as
+            values or None if such kind of listing is not supported
+        """
+        return None
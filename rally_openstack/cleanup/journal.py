@@ -0,0 +1,196 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Append-only journal of cleanup progress.
+
+Every line of a journal describes one event:
+
+    <service>.<resource> <state> <resource id>
+
+where state is one of DELETING (delete request is accepted), DELETED
+(deletion is confirmed), FAILED (resource is not deleted) or FINISHED (all
+resources of the resource manager are processed, resource id is "-").
+
+The latest state of a resource wins, so an interrupted cleanup can be resumed
+without sending delete requests twice and without listing resources of the
+already finished resource managers.
+
+A journal belongs to one cleanup call (the task, resource managers and the
+plugin superclass), and it is taken into account only if the cleanup is
+explicitly resumed; otherwise, the new call starts a new journal.
+"""
+
+import errno
+import hashlib
+import os
+import threading
+import time
+
+from rally.common import cfg
+from rally.common import logging
+
+
+CONF = cfg.CONF
+LOG = logging.getLogger(__name__)
+
+DELETING = "P"
+DELETED = "X"
+FAILED = "F"
+FINISHED = "E"
+
+STATES = (DELETING, DELETED, FAILED, FINISHED)
+
+# Journals which were not updated for this number of seconds are outdated,
+# the cloud could be changed a lot since that time
+JOURNAL_TTL = 24 * 60 * 60
+
+
+class Journal(object):
+    """Cleanup progress of one cleanup call."""
+
+    def __init__(self, path):
+        """Loads the journal.
+
+        :param path: path to the journal file. It is created on the first
+            record.
+        """
+        self.path = path
+        self._states = {}
+        self._finished = set()
+        self._file = None
+        self._truncated = False
+        # writing failed, so the journal is kept in memory only
+        self._broken = False
+        self._lock = threading.Lock()
+        self._load()
+
+    @classmethod
+    def for_cleanup(cls, task_id=None, names=None, admin_required=None,
+                    superclass=None, resume=False):
+        """Returns a journal for the cleanup or None if journals are disabled.
+
+        Arguments are the ones of rally_openstack.cleanup.manager.cleanup.
+
+        :param task_id: The UUID of task
+        :param names: names of resource managers
+        :param admin_required: whether admin resource managers are used
+        :param superclass: the plugin superclass to perform cleanup for
+        :param resume: whether to resume the interrupted cleanup from the
+            journal. Otherwise, the journal of previous call is discarded.
+        """
+        directory = CONF.openstack.cleanup_journal_dir
+        if not directory:
+            return None
+        if superclass is not None:
+            superclass = "%s.%s" % (superclass.__module__,
+                                    superclass.__name__)
+        key = "%s %s %s" % (sorted(names or []), admin_required, superclass)
+        path = os.path.join(
+            os.path.expanduser(directory),
+            "%s-%s.journal" % (task_id or "all",
+                               hashlib.sha1(key.encode("utf-8")).hexdigest()))
+        if not resume and os.path.exists(path):
+            os.remove(path)
+        return cls(path)
+
+    def _load(self):
+        try:
+            if time.time() - os.path.getmtime(self.path) > JOURNAL_TTL:
+                LOG.info("Ignoring outdated cleanup journal %s" % self.path)
+                os.remove(self.path)
+                return
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
+            return
+        with open(self.path) as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    # the process was killed while writing the last line
+                    self._truncated = True
+                    break
+                self._apply(line.rstrip("\n").split(" ", 2))
+        if self._finished or self._states:
+            LOG.info("Resuming cleanup from journal %s" % self.path)
+
+    def _apply(self, record):
+        if len(record) != 3 or record[1] not in STATES:
+            return
+        manager, state, resource_id = record
+        if state == FINISHED:
+            self._finished.add(manager)
+        else:
+            self._states.setdefault(manager, {})[resource_id] = state
+
+    def is_finished(self, manager):
+        """Whether all resources of the resource manager are processed.
+
+        :param manager: "<service>.<resource>" name of the resource manager
+        """
+        return manager in self._finished
+
+    def get_state(self, manager, resource_id):
+        """Returns the latest state of the resource or None if it is unknown.
+
+        :param manager: "<service>.<resource>" name of the resource manager
+        :param resource_id: ID of the resource
+        """
+        return self._states.get(manager, {}).get(str(resource_id))
+
+    def record(self, manager, state, resource_id="-"):
+        """Appends the new state of the resource to the journal.
+
+        Failures of writing are logged only, so the cleanup proceeds
+        without the journal.
+
+        :param manager: "<service>.<resource>" name of the resource manager
+        :param state: one of DELETING, DELETED, FAILED or FINISHED
+        :param resource_id: ID of the resource
+        """
+        record = (manager, state, str(resource_id))
+        with self._lock:
+            self._apply(record)
+            if self._broken:
+                return
+            try:
+                if self._file is None:
+                    directory = os.path.dirname(self.path)
+                    if directory and not os.path.isdir(directory):
+                        os.makedirs(directory)
+                    self._file = open(self.path, "a")
+                    if self._truncated:
+                        self._file.write("\n")
+                        self._truncated = False
+                self._file.write("%s\n" % " ".join(record))
+                self._file.flush()
+            except (IOError, OSError) as e:
+                self._broken = True
+                LOG.warning("Failed to write cleanup journal %s, the cleanup "
+                            "can not be resumed: %s" % (self.path, e))
+
+    def close(self, remove=False):
+        """Closes the journal.
+
+        :param remove: whether to remove the journal file, i.e. when the
+            cleanup is completed and there is nothing to resume
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if remove:
+                self._states = {}
+                self._finished = set()
+                if os.path.exists(self.path):
+                    os.remove(self.path)
@@ -13,23 +13,121 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import itertools
+import re
+import threading
 import time
 
-from rally.common import broker
+from rally.common import cfg
 from rally.common import logging
 from rally.common.plugin import discover
 from rally.common.plugin import plugin
 from rally.common import utils as rutils
+from rally.task import utils as task_utils
+import six
+
+from rally_openstack import broker
 from rally_openstack.cleanup import base
+from rally_openstack.cleanup import journal as cleanup_journal
 
 
+CONF = cfg.CONF
 LOG = logging.getLogger(__name__)
 
 
+# NOTE: Resources of different services do not depend on each other in most
+#   cases, so they can be cleaned up simultaneously. The exceptions are
+#   listed here: resources of a service from the key can be still in use by
+#   resources of services from the value, so they should be processed only
+#   when cleanup of the latter ones is finished. "*" means that all other
+#   services should be processed first.
+_CLEANUP_DEPENDENCIES = {
+    # servers can be spawned by orchestration services
+    "nova": ("magnum", "heat", "senlin"),
+    "ec2": ("magnum", "heat", "senlin", "nova"),
+    # ports are bound to servers and load balancers, floating ips are
+    # associated with them
+    "neutron": ("magnum", "heat", "senlin", "nova", "ec2", "octavia"),
+    "octavia": ("magnum", "heat", "senlin", "nova", "ec2"),
+    # volumes can be attached to servers
+    "cinder": ("magnum", "heat", "senlin", "nova", "ec2"),
+    # share servers are plugged into tenant networks
+    "manila": ("nova", "neutron"),
+    # everything else belongs to projects and users
+    "keystone": ("*",)
+}
+
+
+class NameMatcher(object):
+    """Checks that resource names were generated by the given classes.
+
+    It is an equivalent of rally.common.utils.name_matches_object with
+    exact=False, but name templates of all classes which use the default
+    matching logic are compiled only once into the single regular expression,
+    so every name is checked in one pass.
+    """
+
+    def __init__(self, resource_classes, task_id=None):
+        self.task_id = task_id
+        self._custom_classes = []
+        get_matcher = six.get_method_function
+        default_matcher = get_matcher(
+            rutils.RandomNameGeneratorMixin.name_matches_object)
+
+        patterns = []
+        unique_rng_options = set()
+        for cls in resource_classes:
+            key = (cls._get_resource_name_format(),
+                   cls._get_resource_name_allowed_characters())
+            if key in unique_rng_options:
+                continue
+            unique_rng_options.add(key)
+            if get_matcher(cls.name_matches_object) is not default_matcher:
+                self._custom_classes.append(cls)
+                continue
+            try:
+                patterns.append(self._get_pattern(cls, task_id))
+            except Exception:
+                # let the class report the issue while matching
+                self._custom_classes.append(cls)
+
+        self._regex = None
+        if patterns:
+            self._regex = re.compile("|".join("(?:%s)" % p for p in patterns))
+
+    @staticmethod
+    def _get_pattern(cls, task_id):
+        match = cls._resource_name_placeholder_re.match(
+            cls._get_resource_name_format())
+        parts = match.groupdict()
+        chars = re.escape(cls._get_resource_name_allowed_characters())
+        if task_id:
+            task_id_part = cls._generate_task_id_part(task_id,
+                                                      len(parts["task"]))
+        else:
+            task_id_part = "[%s]{%s}" % (chars, len(parts["task"]))
+        pattern = "%(prefix)s%(task_id)s%(sep)s[%(chars)s]{%(rand)s}%(suffix)s"
+        return pattern % {
+            "prefix": re.escape(parts["prefix"]),
+            "task_id": task_id_part,
+            "sep": re.escape(parts["sep"]),
+            "chars": chars,
+            "rand": len(parts["rand"]),
+            "suffix": re.escape(parts["suffix"])}
+
+    def match(self, name):
+        if self._regex is not None and self._regex.match(name):
+            return True
+        return any(cls.name_matches_object(name, task_id=self.task_id,
+                                           exact=False)
+                   for cls in self._custom_classes)
+
+
 class SeekAndDestroy(object):
 
     def __init__(self, manager_cls, admin, users, api_versions=None,
-                 resource_classes=None, task_id=None):
+                 resource_classes=None, task_id=None, all_tenants=False,
+                 journal=None):
         """Resource deletion class.
 
         This class contains method exterminate() that finds and deletes
@@ -42,6 +140,11 @@ class SeekAndDestroy(object):
         :param resource_classes: Resource classes to match resource names
                                  against
         :param task_id: The UUID of task to match resource names against
+        :param all_tenants: In case of missing users, look for resources of
+                            all tenants (if resource manager supports it)
+                            instead of admin's ones
+        :param journal: cleanup_journal.Journal object to record the progress
+                        to and to resume the interrupted cleanup from
         """
         self.manager_cls = manager_cls
         self.admin = admin
@@ -50,6 +153,36 @@ class SeekAndDestroy(object):
         self.resource_classes = resource_classes or [
             rutils.RandomNameGeneratorMixin]
         self.task_id = task_id
+        self.all_tenants = all_tenants
+        self._all_tenants_listed = False
+        self.stats = {"discovered": 0, "deleted": 0, "failed": 0}
+        self.errors = []
+        self._stats_lock = threading.Lock()
+        self._name_matcher = NameMatcher(self.resource_classes, task_id)
+        self._batch_polling = self._is_batch_polling_supported()
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self.journal = journal
+
+    def _is_batch_polling_supported(self):
+        """Checks that deletion of resources can be confirmed via list().
+
+        Resource managers which use the default is_deleted() method (get
+        resource by id and check its status) can be polled by listing all
+        the resources once per tenant instead of one request per resource.
+        """
+        if not CONF.openstack.cleanup_batch_polling:
+            return False
+        return (six.get_unbound_function(
+                getattr(self.manager_cls, "is_deleted", None))
+                is six.get_unbound_function(base.ResourceManager.is_deleted))
+
+    def _get_manager(self, admin, user, resource=None):
+        return self.manager_cls(
+            resource=resource,
+            admin=self._get_cached_client(admin),
+            user=self._get_cached_client(user),
+            tenant_uuid=user and user["tenant_id"])
 
     def _get_cached_client(self, user):
         """Simplifies initialization and caching OpenStack clients."""
@@ -58,7 +191,39 @@ class SeekAndDestroy(object):
         # NOTE(astudenov): Credential now supports caching by default
         return user["credential"].clients(api_info=self.api_versions)
 
-    def _delete_single_resource(self, resource):
+    def _get_manager_name(self):
+        return "%s.%s" % (self.manager_cls._service,
+                          self.manager_cls._resource)
+
+    def _record(self, state, resource):
+        """Saves the new state of the resource to the journal."""
+        if self.journal is not None:
+            self.journal.record(self._get_manager_name(), state,
+                                resource.id())
+
+    def _report(self, status, resource=None, message=None):
+        """Updates statistics of cleanup.
+
+        :param status: one of "discovered", "deleted" or "failed"
+        :param resource: instance of resource manager
+        :param message: a message to save as an error
+        """
+        if resource is not None and status in ("deleted", "failed"):
+            self._record(cleanup_journal.DELETED if status == "deleted"
+                         else cleanup_journal.FAILED, resource)
+        with self._stats_lock:
+            if status:
+                self.stats[status] += 1
+            if message:
+                source = self.manager_cls if resource is None else resource
+                error = {"resource_type": "%s.%s" % (source._service,
+                                                     source._resource),
+                         "message": message}
+                if resource is not None:
+                    error["resource_id"] = str(resource.id())
+                self.errors.append(error)
+
+    def _delete_single_resource(self, resource, wait=True):
         """Safe resource deletion with retries and timeouts.
 
         Send request to delete resource, in case of failures repeat it few
@@ -68,6 +233,8 @@ class SeekAndDestroy(object):
 
         :param resource: instance of resource manager initiated with resource
                          that should be deleted.
+        :param wait: whether to pull status of resource after deletion
+        :returns: False if delete request failed, True otherwise
         """
 
         msg_kw = {
@@ -91,30 +258,149 @@ class SeekAndDestroy(object):
                 LOG.exception(msg)
             else:
                 LOG.warning("%(msg)s Reason: %(e)s" % {"msg": msg, "e": e})
+            broker.report_error(e)
+            self._report("failed", resource, "%s Reason: %s" % (msg, e))
+            return False
         else:
-            started = time.time()
-            failures_count = 0
-            while time.time() - started < resource._timeout:
+            self._record(cleanup_journal.DELETING, resource)
+            if wait:
+                self._wait_for_single_resource(resource)
+            return True
+
+    def _wait_for_single_resource(self, resource):
+        """Pulls status of resource until it's deleted or timeout occurs.
+
+        :param resource: instance of resource manager initiated with resource
+                         that is being deleted.
+        """
+        started = time.time()
+        failures_count = 0
+        while time.time() - started < resource._timeout:
+            try:
+                if resource.is_deleted():
+                    self._report("deleted", resource)
+                    return
+            except Exception:
+                LOG.exception(
+                    "Seems like %s.%s.is_deleted(self) method is broken "
+                    "It shouldn't raise any exceptions."
+                    % (resource.__module__, type(resource).__name__))
+
+                # NOTE(boris-42): Avoid LOG spamming in case of bad
+                #                 is_deleted() method
+                failures_count += 1
+                if failures_count > resource._max_attempts:
+                    break
+
+            finally:
+                rutils.interruptable_sleep(resource._interval)
+
+        msg = ("Resource deletion failed, timeout occurred for "
+               "%(service)s.%(resource)s: %(uuid)s."
+               % {"service": resource._service,
+                  "resource": resource._resource,
+                  "uuid": resource.id()})
+        LOG.warning(msg)
+        self._report("failed", resource, msg)
+
+    def _add_pending_resource(self, admin, user, resource):
+        """Schedules confirmation of resource deletion."""
+        key = id(user) if user else None
+        with self._pending_lock:
+            if key not in self._pending:
+                self._pending[key] = (admin, user, {})
+            self._pending[key][2][resource.id()] = (resource, time.time())
+
+    def _wait_for_deletion(self):
+        """Confirms deletion of pending resources.
+
+        Instead of pulling status of each resource, all resources of one
+        tenant (or user in case of non-tenant resources) are listed once per
+        polling interval. Resources which are present in the list are still
+        being deleted. Resources which have DELETED status are deleted, the
+        same is true for the absent ones if the list of resource manager is
+        complete, otherwise they are checked with is_deleted() one by one.
+        """
+        failures = {}
+        while self._pending:
+            for key in list(self._pending):
+                admin, user, resources = self._pending[key]
+                manager = self._get_manager(admin, user)
                 try:
-                    if resource.is_deleted():
-                        return
-                except Exception as e:
+                    if user is None and self._all_tenants_listed:
+                        listed = itertools.chain.from_iterable(
+                            manager.list_all_tenants().values())
+                    else:
+                        listed = manager.list()
+                    existing = set(
+                        self._get_manager(admin, user, r).id()
+                        for r in listed
+                        if task_utils.get_status(r) not in ("DELETED",
+                                                            "DELETE_COMPLETE"))
+                except Exception:
                     LOG.exception(
-                        "Seems like %s.%s.is_deleted(self) method is broken "
+                        "Seems like %s.%s.list(self) method is broken. "
                         "It shouldn't raise any exceptions."
-                        % (resource.__module__, type(resource).__name__))
-
-                    # NOTE(boris-42): Avoid LOG spamming in case of bad
-                    #                 is_deleted() method
-                    failures_count += 1
-                    if failures_count > resource._max_attempts:
-                        break
-
-                finally:
-                    rutils.interruptable_sleep(resource._interval)
-
-            LOG.warning("Resource deletion failed, timeout occurred for "
-                        "%(service)s.%(resource)s: %(uuid)s." % msg_kw)
+                        % (manager.__module__, type(manager).__name__))
+
+                    # give up on listing after a few attempts and report
+                    # all the pending resources as failed ones
+                    failures[key] = failures.get(key, 0) + 1
+                    if failures[key] <= self.manager_cls._max_attempts:
+                        continue
+                    existing = set(resources)
+                    for uuid, (resource, started) in resources.items():
+                        resources[uuid] = (resource, 0)
+
+                for uuid, (resource, started) in list(resources.items()):
+                    if uuid not in existing and self._is_deleted(resource):
+                        resources.pop(uuid)
+                        self._report("deleted", resource)
+                    elif time.time() - started >= resource._timeout:
+                        resources.pop(uuid)
+                        msg = ("Resource deletion failed, timeout occurred "
+                               "for %(service)s.%(resource)s: %(uuid)s."
+                               % {"service": resource._service,
+                                  "resource": resource._resource,
+                                  "uuid": uuid})
+                        LOG.warning(msg)
+                        self._report("failed", resource, msg)
+                if not resources:
+                    self._pending.pop(key)
+
+            if self._pending:
+                rutils.interruptable_sleep(self.manager_cls._interval)
+
+    def _is_deleted(self, resource):
+        """Checks that the resource missing in the list is deleted."""
+        if self.manager_cls._complete_listing:
+            return True
+        try:
+            return resource.is_deleted()
+        except Exception:
+            LOG.exception(
+                "Seems like %s.%s.is_deleted(self) method is broken "
+                "It shouldn't raise any exceptions."
+                % (resource.__module__, type(resource).__name__))
+            return False
+
+    def _list_all_tenants(self, admin_client):
+        """Lists tenant resources of all tenants with one call if possible.
+
+        :returns: a dict with tenant ids as keys and lists of resources as
+            values or None if resources should be listed per tenant
+        """
+        if not (self.admin and self.manager_cls._tenant_resource):
+            return None
+        manager = self.manager_cls(admin=admin_client)
+        try:
+            return rutils.retry(3, manager.list_all_tenants)
+        except Exception:
+            LOG.exception(
+                "Seems like %s.%s.list_all_tenants(self) method is broken. "
+                "Falling back to listing resources per tenant."
+                % (manager.__module__, type(manager).__name__))
+            return None
 
     def _publisher(self, queue):
         """Publisher for deletion jobs.
@@ -126,60 +412,123 @@ class SeekAndDestroy(object):
         uuid that should be deleted.
 
         In case of tenant based resource, uuids are fetched only from one user
-        per tenant.
+        per tenant. If resource manager supports it, resources of all tenants
+        are listed only once using admin credential.
         """
         def _publish(admin, user, manager):
             try:
                 for raw_resource in rutils.retry(3, manager.list):
                     queue.append((admin, user, raw_resource))
-            except Exception:
+            except Exception as e:
                 LOG.exception(
                     "Seems like %s.%s.list(self) method is broken. "
                     "It shouldn't raise any exceptions."
                     % (manager.__module__, type(manager).__name__))
+                self._report(None, message="Failed to list resources: %s" % e)
 
         if self.admin and (not self.users
                            or self.manager_cls._perform_for_admin_only):
-            manager = self.manager_cls(
-                admin=self._get_cached_client(self.admin))
-            _publish(self.admin, None, manager)
+            admin_client = self._get_cached_client(self.admin)
+            all_tenants_resources = None
+            if self._is_whole_cloud():
+                all_tenants_resources = self._list_all_tenants(admin_client)
+            if all_tenants_resources is not None:
+                self._all_tenants_listed = True
+                for resources in all_tenants_resources.values():
+                    for raw_resource in resources:
+                        queue.append((self.admin, None, raw_resource))
+            else:
+                if (self._is_whole_cloud()
+                        and not self.manager_cls._admin_required):
+                    LOG.warning("Resources of %s can not be listed for all "
+                                "tenants, only the ones which are visible "
+                                "to admin are cleaned up."
+                                % self._get_manager_name())
+                manager = self.manager_cls(admin=admin_client)
+                _publish(self.admin, None, manager)
 
         else:
             visited_tenants = set()
             admin_client = self._get_cached_client(self.admin)
+            all_tenants_resources = None
+            if CONF.openstack.cleanup_admin_bulk_list:
+                all_tenants_resources = self._list_all_tenants(admin_client)
             for user in self.users:
                 if (self.manager_cls._tenant_resource
                    and user["tenant_id"] in visited_tenants):
                     continue
 
                 visited_tenants.add(user["tenant_id"])
+                if all_tenants_resources is not None:
+                    for raw_resource in all_tenants_resources.get(
+                            user["tenant_id"], []):
+                        queue.append((self.admin, user, raw_resource))
+                    continue
                 manager = self.manager_cls(
                     admin=admin_client,
                     user=self._get_cached_client(user),
                     tenant_uuid=user["tenant_id"])
                 _publish(self.admin, user, manager)
 
+    def _is_whole_cloud(self):
+        """Checks that resources of all tenants are looked for."""
+        return self.all_tenants and not self.users
+
     def _consumer(self, cache, args):
         """Method that consumes single deletion job."""
         admin, user, raw_resource = args
 
-        manager = self.manager_cls(
-            resource=raw_resource,
-            admin=self._get_cached_client(admin),
-            user=self._get_cached_client(user),
-            tenant_uuid=user and user["tenant_id"])
+        manager = self._get_manager(admin, user, raw_resource)
 
-        if (isinstance(manager.name(), base.NoName) or
-                rutils.name_matches_object(
-                    manager.name(), *self.resource_classes,
-                    task_id=self.task_id, exact=False)):
+        if isinstance(manager.name(), base.NoName):
+            # there is nothing to match against, so such resources are
+            # removed only if they belong to users created by Rally
+            matched = not self._is_whole_cloud()
+        else:
+            matched = self._name_matcher.match(manager.name())
+        if not matched:
+            broker.ignore_latency()
+            return
+
+        state = None
+        if self.journal is not None:
+            state = self.journal.get_state(self._get_manager_name(),
+                                           manager.id())
+        if state == cleanup_journal.DELETED:
+            # deletion is confirmed by the interrupted cleanup
+            broker.ignore_latency()
+            return
+        self._report("discovered")
+        if state == cleanup_journal.DELETING:
+            # delete request is sent by the interrupted cleanup, so only
+            # the deletion should be confirmed
+            if self._batch_polling:
+                self._add_pending_resource(admin, user, manager)
+            else:
+                self._wait_for_single_resource(manager)
+        elif not self._batch_polling:
             self._delete_single_resource(manager)
+        elif self._delete_single_resource(manager, wait=False):
+            self._add_pending_resource(admin, user, manager)
 
     def exterminate(self):
         """Delete all resources for passed users, admin and resource_mgr."""
 
+        if (self.journal is not None
+                and self.journal.is_finished(self._get_manager_name())):
+            LOG.debug("Cleanup of %s resources is already finished."
+                      % self._get_manager_name())
+            return
+
         broker.run(self._publisher, self._consumer,
-                   consumers_count=self.manager_cls._threads)
+                   consumers_count=self.manager_cls._threads,
+                   adaptive=CONF.openstack.cleanup_adaptive_threads)
+        if self._pending:
+            self._wait_for_deletion()
+
+        if self.journal is not None and not self.errors:
+            self.journal.record(self._get_manager_name(),
+                                cleanup_journal.FINISHED)
 
 
 def list_resource_names(admin_required=None):
@@ -239,15 +588,114 @@ def find_resource_managers(names=None, admin_required=None):
     return resource_managers
 
 
+def _get_family(manager_cls):
+    """Returns the family of resource manager.
+
+    Resource managers of one service form a family and are processed one
+    after another in the order of them.
+    """
+    return manager_cls._service
+
+
+def _is_reachable(dependencies, start, target):
+    """Checks that the target family is (indirectly) required by start."""
+    visited = set()
+    stack = [start]
+    while stack:
+        family = stack.pop()
+        if family == target:
+            return True
+        if family not in visited:
+            visited.add(family)
+            stack.extend(dependencies[family])
+    return False
+
+
+def _get_families_graph(resource_managers):
+    """Groups resource managers by families and finds dependencies of them.
+
+    :param resource_managers: resource managers sorted by order
+    :returns: a tuple with a list of (family, resource managers) pairs sorted
+        by order and a dict with sets of families which should be processed
+        before the family from the key
+    """
+    families = []
+    by_family = {}
+    for mgr in resource_managers:
+        family = _get_family(mgr)
+        if family not in by_family:
+            by_family[family] = []
+            families.append((family, by_family[family]))
+        by_family[family].append(mgr)
+
+    dependencies = dict((family, set()) for family, _mgrs in families)
+    for family, _mgrs in families:
+        required = _CLEANUP_DEPENDENCIES.get(family, ())
+        if "*" in required:
+            required = [f for f, _m in families if f != family]
+        for dependency in required:
+            if dependency not in by_family or dependency == family:
+                continue
+            if _is_reachable(dependencies, dependency, family):
+                # a cycle would deadlock the cleanup
+                LOG.warning("Cleanup dependency of %s on %s is ignored since "
+                            "%s already depends on %s."
+                            % (family, dependency, dependency, family))
+                continue
+            dependencies[family].add(dependency)
+    return families, dependencies
+
+
+def _run_families(families, dependencies, process, concurrency):
+    """Processes families of resource managers in parallel.
+
+    :param families: a list of (family, resource managers) pairs
+    :param dependencies: a dict with families which should be processed
+        before the family from the key
+    :param process: a function to call for each resource manager
+    :param concurrency: max number of families to process simultaneously
+    """
+    finished = dict((family, threading.Event()) for family, _m in families)
+    semaphore = threading.Semaphore(concurrency)
+
+    def _process_family(family, managers):
+        try:
+            for required in dependencies[family]:
+                finished[required].wait()
+            with semaphore:
+                for mgr in managers:
+                    process(mgr)
+        except Exception:
+            LOG.exception("Failed to cleanup resources of %s service(s)."
+                          % ", ".join(sorted(set(m._service
+                                                 for m in managers))))
+        finally:
+            finished[family].set()
+
+    threads = []
+    for family, managers in families:
+        thread = threading.Thread(target=_process_family,
+                                  args=(family, managers))
+        thread.daemon = True
+        thread.start()
+        threads.append(thread)
+
+    for thread in threads:
+        while thread.is_alive():
+            thread.join(1)
+
+
 def cleanup(names=None, admin_required=None, admin=None, users=None,
-            api_versions=None, superclass=plugin.Plugin, task_id=None):
+            api_versions=None, superclass=plugin.Plugin, task_id=None,
+            all_tenants=False, resume=False):
     """Generic cleaner.
 
     This method goes through all plugins. Filter those and left only plugins
     with _service from services or _resource from resources.
 
     Then goes through all passed users and using cleaners cleans all related
-    resources.
+    resources. Resource managers of independent service families are
+    processed simultaneously (see CONF.openstack.cleanup_families_concurrency).
 
     :param names: Use only resource managers that have names in this list.
                   There are in as _service or
@@ -269,6 +717,14 @@ def cleanup(names=None, admin_required=None, admin=None, users=None,
                        ``rally.task.scenario.Scenario`` to cleanup all
                        Scenario resources.
     :param task_id: The UUID of task
+    :param all_tenants: Look for resources of all tenants using admin in case
+                        of missing users
+    :param resume: Resume the interrupted (or not completed) cleanup with the
+                   same arguments from its journal. Otherwise, the journal of
+                   the previous call is discarded.
+    :returns: a dict with statistics of cleanup: the number of discovered,
+              deleted and failed resources in total and per resource
+              manager and the list of errors
     """
     if api_versions:
         LOG.warning("'api_version' argument of 'cleanup' method is deprecated"
@@ -280,11 +736,47 @@ def cleanup(names=None, admin_required=None, admin=None, users=None,
     if not resource_classes and issubclass(superclass,
                                            rutils.RandomNameGeneratorMixin):
         resource_classes.append(superclass)
-    for manager in find_resource_managers(names, admin_required):
+
+    result = {"discovered": 0, "deleted": 0, "failed": 0, "resources": {},
+              "errors": []}
+    result_lock = threading.Lock()
+
+    def _process(manager):
         LOG.debug("Cleaning up %(service)s %(resource)s objects"
                   % {"service": manager._service,
                      "resource": manager._resource})
-        SeekAndDestroy(manager, admin, users,
-                       api_versions=api_versions,
-                       resource_classes=resource_classes,
-                       task_id=task_id).exterminate()
+        destroyer = SeekAndDestroy(manager, admin, users,
+                                   api_versions=api_versions,
+                                   resource_classes=resource_classes,
+                                   task_id=task_id,
+                                   all_tenants=all_tenants,
+                                   journal=journal)
+        destroyer.exterminate()
+        with result_lock:
+            for key, value in destroyer.stats.items():
+                result[key] += value
+            if destroyer.stats["discovered"]:
+                name = "%s.%s" % (manager._service, manager._resource)
+                result["resources"][name] = destroyer.stats
+            result["errors"].extend(destroyer.errors)
+
+    resource_managers = find_resource_managers(names, admin_required)
+    concurrency = CONF.openstack.cleanup_families_concurrency
+    journal = cleanup_journal.Journal.for_cleanup(
+        task_id, names=names, admin_required=admin_required,
+        superclass=superclass, resume=resume)
+    completed = False
+    try:
+        if concurrency <= 1:
+            for manager in resource_managers:
+                _process(manager)
+        else:
+            families, dependencies = _get_families_graph(resource_managers)
+            _run_families(families, dependencies, _process, concurrency)
+        completed = True
+    finally:
+        if journal is not None:
+            # keep the journal to resume the cleanup if it is interrupted or
+            # some resources are not deleted
+            journal.close(remove=completed and not result["errors"])
+    return result
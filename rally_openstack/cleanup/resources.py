@@ -18,6 +18,7 @@ from rally.common import logging
 from rally.task import utils as task_utils
 
 from rally_openstack.cleanup import base
+from rally_openstack import osclients
 from rally_openstack.services.identity import identity
 from rally_openstack.services.image import glance_v2
 from rally_openstack.services.image import image
@@ -31,6 +32,13 @@ def get_order(start):
     return iter(range(start, start + 99))
 
 
+def group_by_tenant(resources, get_tenant_id):
+    result = {}
+    for r in resources:
+        result.setdefault(get_tenant_id(r), []).append(r)
+    return result
+
+
 class SynchronizedDeletion(object):
 
     def is_deleted(self):
@@ -91,7 +99,8 @@ class MagnumClusterTemplate(MagnumMixin):
 
 # HEAT
 
-@base.resource("heat", "stacks", order=100, tenant_resource=True)
+@base.resource("heat", "stacks", order=100, tenant_resource=True,
+               complete_listing=True)
 class HeatStack(base.ResourceManager):
     def name(self):
         return self.raw_resource.stack_name
@@ -139,12 +148,17 @@ _nova_order = get_order(200)
 
 
 @base.resource("nova", "servers", order=next(_nova_order),
-               tenant_resource=True)
+               tenant_resource=True, complete_listing=True)
 class NovaServer(base.ResourceManager):
     def list(self):
         """List all servers."""
         return self._manager().list(limit=-1)
 
+    def list_all_tenants(self):
+        servers = self.admin.nova().servers.list(
+            search_opts={"all_tenants": True}, limit=-1)
+        return group_by_tenant(servers, lambda s: s.tenant_id)
+
     def delete(self):
         if getattr(self.raw_resource, "OS-EXT-STS:locked", False):
             self.raw_resource.unlock()
@@ -244,14 +258,14 @@ class NeutronMixin(SynchronizedDeletion, base.ResourceManager):
     # Neutron has the best client ever, so we need to override everything
 
     def supports_extension(self, extension):
-        exts = self._manager().list_extensions().get("extensions", [])
-        if any(ext.get("alias") == extension for ext in exts):
-            return True
-        return False
+        return extension in osclients.NEUTRON_EXTENSIONS.get_aliases(
+            self._manager())
 
     def _manager(self):
-        client = self._admin_required and self.admin or self.user
-        return getattr(client, self._service)()
+        # NOTE: admin is used for listing resources of all tenants, so
+        #   there is no user in that case
+        client = (self._admin_required or not self.user) and self.admin
+        return getattr(client or self.user, self._service)()
 
     def id(self):
         return self.raw_resource["id"]
@@ -272,11 +286,14 @@ class NeutronMixin(SynchronizedDeletion, base.ResourceManager):
 
     def list(self):
         list_method = getattr(self._manager(), "list_%s" % self._plural_key)
+        if not self.tenant_uuid:
+            return list_method()[self._plural_key]
         result = list_method(tenant_id=self.tenant_uuid)[self._plural_key]
-        if self.tenant_uuid:
-            result = [r for r in result if r["tenant_id"] == self.tenant_uuid]
+        return [r for r in result if r["tenant_id"] == self.tenant_uuid]
 
-        return result
+    def list_all_tenants(self):
+        return group_by_tenant(
+            self.list(), lambda r: r.get("tenant_id", r.get("project_id")))
 
 
 class NeutronLbaasV1Mixin(NeutronMixin):
@@ -467,8 +484,9 @@ class NeutronPort(NeutronMixin):
     def _get_resources(self, resource):
         if resource not in self._cache:
             resources = getattr(self._manager(), "list_%s" % resource)()
-            self._cache[resource] = [r for r in resources[resource]
-                                     if r["tenant_id"] == self.tenant_uuid]
+            self._cache[resource] = [
+                r for r in resources[resource]
+                if not self.tenant_uuid or r["tenant_id"] == self.tenant_uuid]
         return self._cache[resource]
 
     def list(self):
@@ -576,7 +594,13 @@ class CinderVolumeType(base.ResourceManager):
 @base.resource("cinder", "volume_snapshots", order=next(_cinder_order),
                tenant_resource=True)
 class CinderVolumeSnapshot(base.ResourceManager):
-    pass
+
+    def list_all_tenants(self):
+        snapshots = self.admin.cinder().volume_snapshots.list(
+            search_opts={"all_tenants": True})
+        return group_by_tenant(
+            snapshots,
+            lambda s: getattr(s, "os-extended-snapshot-attributes:project_id"))
 
 
 @base.resource("cinder", "transfers", order=next(_cinder_order),
@@ -588,7 +612,12 @@ class CinderVolumeTransfer(base.ResourceManager):
 @base.resource("cinder", "volumes", order=next(_cinder_order),
                tenant_resource=True)
 class CinderVolume(base.ResourceManager):
-    pass
+
+    def list_all_tenants(self):
+        volumes = self.admin.cinder().volumes.list(
+            search_opts={"all_tenants": True})
+        return group_by_tenant(
+            volumes, lambda v: getattr(v, "os-vol-tenant-attr:tenant_id"))
 
 
 @base.resource("cinder", "image_volumes_cache", order=next(_cinder_order),
@@ -664,6 +693,12 @@ class GlanceImage(base.ResourceManager):
                                                owner=self.tenant_uuid))
         return images
 
+    def list_all_tenants(self):
+        client = self._client()
+        images = client.list_images() + client.list_images(
+            status="deactivated")
+        return group_by_tenant(images, lambda i: i.owner)
+
     def delete(self):
         client = self._client()
         if self.raw_resource.status == "deactivated":
@@ -1142,6 +1177,9 @@ class KeystoneEc2(SynchronizedDeletion, base.ResourceManager):
         return self.user.keystone.auth_ref.user_id
 
     def list(self):
+        if not self.user:
+            # credentials can be listed only per user
+            return []
         return self._manager().list_ec2credentials(self.user_id)
 
     def delete(self):
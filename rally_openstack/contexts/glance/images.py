@@ -11,13 +11,18 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import os
+import tempfile
 
 from rally.common import cfg
 from rally.common import logging
 from rally.common import utils as rutils
 from rally.common import validation
+from rally import exceptions
 from rally.task import context
+import requests
 
+from rally_openstack import broker
 from rally_openstack.cleanup import manager as resource_manager
 from rally_openstack import consts
 from rally_openstack import osclients
@@ -159,8 +164,18 @@ class ImageGenerator(context.Context):
         if "image_name" in self.config and images_per_tenant == 1:
             image_name = self.config["image_name"]
 
-        for user, tenant_id in rutils.iterate_per_tenants(
-                self.context["users"]):
+        tenants = list(rutils.iterate_per_tenants(self.context["users"]))
+        image_path = None
+        if tenants and self._should_download(image_url, tenants[0][0],
+                                             len(tenants) * images_per_tenant):
+            image_path = self._download_image(image_url)
+
+        def publish(queue):
+            for user, tenant_id in tenants:
+                queue.append((user, tenant_id))
+
+        def consume(cache, args):
+            user, tenant_id = args
             current_images = []
             clients = osclients.Clients(user["credential"])
             image_service = image.Image(
@@ -170,7 +185,7 @@ class ImageGenerator(context.Context):
                 image_obj = image_service.create_image(
                     image_name=image_name,
                     container_format=container_format,
-                    image_location=image_url,
+                    image_location=image_path or image_url,
                     disk_format=disk_format,
                     visibility=visibility,
                     min_disk=min_disk,
@@ -179,6 +194,48 @@ class ImageGenerator(context.Context):
 
             self.context["tenants"][tenant_id]["images"] = current_images
 
+        try:
+            broker.run(publish, consume,
+                       CONF.openstack.images_context_workers, reraise=True)
+        finally:
+            if image_path:
+                os.remove(image_path)
+
+    @staticmethod
+    def _should_download(image_url, user, uploads):
+        """Whether the image should be fetched to a local file in advance.
+
+        Glance V2 service downloads the data from URL for every created
+        image (Glance V1 is asked to copy it by the server side).
+        """
+        if uploads < 2 or not image_url:
+            return False
+        if os.path.isfile(os.path.expanduser(image_url)):
+            return False
+        clients = osclients.Clients(user["credential"])
+        return clients.glance.choose_version() == "2"
+
+    def _download_image(self, image_url):
+        LOG.debug("Downloading image from %s." % image_url)
+        fd, image_path = tempfile.mkstemp(prefix="rally-image-")
+        try:
+            with os.fdopen(fd, "wb") as image_file:
+                response = requests.get(image_url, stream=True)
+                try:
+                    if response.status_code != 200:
+                        raise exceptions.RallyException(
+                            "Failed to download image from %s. HTTP error "
+                            "code %d." % (image_url, response.status_code))
+                    for chunk in response.iter_content(
+                            chunk_size=1024 * 1024):
+                        image_file.write(chunk)
+                finally:
+                    response.close()
+        except Exception:
+            os.remove(image_path)
+            raise
+        return image_path
+
     def cleanup(self):
         if self.context.get("admin", {}):
             # NOTE(andreykurilin): Glance does not require the admin for
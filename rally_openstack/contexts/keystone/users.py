@@ -17,7 +17,6 @@ import collections
 import copy
 import uuid
 
-from rally.common import broker
 from rally.common import cfg
 from rally.common import logging
 from rally.common import utils as rutils
@@ -25,6 +24,7 @@ from rally.common import validation
 from rally import exceptions
 from rally.task import context
 
+from rally_openstack import broker
 from rally_openstack import consts
 from rally_openstack import credential
 from rally_openstack import osclients
@@ -180,17 +180,48 @@ class UserGenerator(context.Context):
             tenants.append(tenant_dict)
 
         # NOTE(msdubov): consume() will fill the tenants list in the closure.
-        broker.run(publish, consume, threads)
+        broker.run(publish, consume, threads,
+                   adaptive=CONF.openstack.users_context_adaptive_workers)
         tenants_dict = {}
         for t in tenants:
             tenants_dict[t["id"]] = t
 
         return tenants_dict
 
+    def _get_password(self):
+        if self.config.get("user_password") is None:
+            return str(uuid.uuid4())
+        return self.config["user_password"]
+
+    def _create_user(self, client, username, password, project_dom, user_dom,
+                     tenant_id, tenant_name):
+        default_role = cfg.CONF.openstack.keystone_default_role
+        user = client.create_user(username, password=password,
+                                  project_id=tenant_id,
+                                  domain_name=user_dom,
+                                  default_role=default_role)
+        user_credential = credential.OpenStackCredential(
+            auth_url=self.credential["auth_url"],
+            username=user.name,
+            password=password,
+            tenant_name=tenant_name,
+            permission=consts.EndpointPermission.USER,
+            project_domain_name=project_dom,
+            user_domain_name=user_dom,
+            endpoint_type=self.credential["endpoint_type"],
+            https_insecure=self.credential["https_insecure"],
+            https_cacert=self.credential["https_cacert"],
+            region_name=self.credential["region_name"],
+            profiler_hmac_key=self.credential["profiler_hmac_key"],
+            profiler_conn_str=self.credential["profiler_conn_str"],
+            api_info=self.credential["api_info"])
+        return {"id": user.id,
+                "credential": user_credential,
+                "tenant_id": tenant_id}
+
     def _create_users(self, threads):
         # NOTE(msdubov): This should be called after _create_tenants().
         users_per_tenant = self.config["users_per_tenant"]
-        default_role = cfg.CONF.openstack.keystone_default_role
 
         users = collections.deque()
 
@@ -198,10 +229,8 @@ class UserGenerator(context.Context):
             for tenant_id in self.context["tenants"]:
                 for user_id in range(users_per_tenant):
                     username = self.generate_random_name()
-                    password = (str(uuid.uuid4())
-                                if self.config.get("user_password") is None
-                                else self.config["user_password"])
-                    args = (username, password, self.config["project_domain"],
+                    args = (username, self._get_password(),
+                            self.config["project_domain"],
                             self.config["user_domain"], tenant_id)
                     queue.append(args)
 
@@ -211,34 +240,55 @@ class UserGenerator(context.Context):
                 clients = osclients.Clients(self.credential)
                 cache["client"] = identity.Identity(
                     clients, name_generator=self.generate_random_name)
-            client = cache["client"]
-            user = client.create_user(username, password=password,
-                                      project_id=tenant_id,
-                                      domain_name=user_dom,
-                                      default_role=default_role)
-            user_credential = credential.OpenStackCredential(
-                auth_url=self.credential["auth_url"],
-                username=user.name,
-                password=password,
-                tenant_name=self.context["tenants"][tenant_id]["name"],
-                permission=consts.EndpointPermission.USER,
-                project_domain_name=project_dom,
-                user_domain_name=user_dom,
-                endpoint_type=self.credential["endpoint_type"],
-                https_insecure=self.credential["https_insecure"],
-                https_cacert=self.credential["https_cacert"],
-                region_name=self.credential["region_name"],
-                profiler_hmac_key=self.credential["profiler_hmac_key"],
-                profiler_conn_str=self.credential["profiler_conn_str"],
-                api_info=self.credential["api_info"])
-            users.append({"id": user.id,
-                          "credential": user_credential,
-                          "tenant_id": tenant_id})
+            users.append(self._create_user(
+                cache["client"], username, password, project_dom, user_dom,
+                tenant_id, self.context["tenants"][tenant_id]["name"]))
 
         # NOTE(msdubov): consume() will fill the users list in the closure.
-        broker.run(publish, consume, threads)
+        broker.run(publish, consume, threads,
+                   adaptive=CONF.openstack.users_context_adaptive_workers)
         return list(users)
 
+    def _create_tenants_and_users(self, threads):
+        """Create tenants and users of every tenant right after it.
+
+        Unlike _create_tenants() followed by _create_users(), there is no
+        need to wait for the slowest tenant before creating users, and all
+        users of one tenant are created by the same identity client, so the
+        domain and the default role are looked up only once.
+        """
+        users_per_tenant = self.config["users_per_tenant"]
+        tenants = collections.deque()
+        users = collections.deque()
+
+        def publish(queue):
+            for i in range(self.config["tenants"]):
+                queue.append((self.config["project_domain"],
+                              self.config["user_domain"]))
+
+        def consume(cache, args):
+            project_dom, user_dom = args
+            if "client" not in cache:
+                clients = osclients.Clients(self.credential)
+                cache["client"] = identity.Identity(
+                    clients, name_generator=self.generate_random_name)
+            client = cache["client"]
+            tenant = client.create_project(domain_name=project_dom)
+            tenants.append({"id": tenant.id, "name": tenant.name,
+                            "users": []})
+            for i in range(users_per_tenant):
+                with logging.ExceptionLogger(
+                        LOG, "Failed to create a user of %s tenant"
+                             % tenant.id):
+                    users.append(self._create_user(
+                        client, self.generate_random_name(),
+                        self._get_password(), project_dom, user_dom,
+                        tenant.id, tenant.name))
+
+        broker.run(publish, consume, threads,
+                   adaptive=CONF.openstack.users_context_adaptive_workers)
+        return {t["id"]: t for t in tenants}, list(users)
+
     def _get_consumer_for_deletion(self, func_name):
         def consume(cache, resource_id):
             if "client" not in cache:
@@ -255,7 +305,8 @@ class UserGenerator(context.Context):
                 queue.append(tenant_id)
 
         broker.run(publish, self._get_consumer_for_deletion("delete_project"),
-                   threads)
+                   threads,
+                   adaptive=CONF.openstack.users_context_adaptive_workers)
         self.context["tenants"] = {}
 
     def _delete_users(self):
@@ -266,29 +317,47 @@ class UserGenerator(context.Context):
                 queue.append(user["id"])
 
         broker.run(publish, self._get_consumer_for_deletion("delete_user"),
-                   threads)
+                   threads,
+                   adaptive=CONF.openstack.users_context_adaptive_workers)
+        for user in self.context["users"]:
+            # tokens of deleted users should not be refreshed in background
+            osclients.SESSION_POOL.discard(user["credential"])
         self.context["users"] = []
 
     def create_users(self):
         """Create tenants and users, using the broker pattern."""
 
-        threads = min(self.config["resource_management_workers"],
-                      self.config["tenants"])
-
-        LOG.debug("Creating %(tenants)d tenants using %(threads)s threads"
-                  % {"tenants": self.config["tenants"], "threads": threads})
-        self.context["tenants"] = self._create_tenants(threads)
+        workers = self.config["resource_management_workers"]
+        users_num = self.config["users_per_tenant"] * self.config["tenants"]
+        threads = min(workers, self.config["tenants"])
+
+        if (CONF.openstack.users_context_pipelined
+                and self.config["tenants"] >= workers):
+            LOG.debug("Creating %(tenants)d tenants with %(users)d users "
+                      "using %(threads)s threads"
+                      % {"tenants": self.config["tenants"],
+                         "users": users_num, "threads": threads})
+            self.context["tenants"], self.context["users"] = (
+                self._create_tenants_and_users(threads))
+        else:
+            LOG.debug("Creating %(tenants)d tenants using %(threads)s threads"
+                      % {"tenants": self.config["tenants"],
+                         "threads": threads})
+            self.context["tenants"] = self._create_tenants(threads)
+            if len(self.context["tenants"]) == self.config["tenants"]:
+                threads = min(workers, users_num)
+                LOG.debug("Creating %(users)d users using %(threads)s "
+                          "threads" % {"users": users_num,
+                                       "threads": threads})
+                self.context["users"] = self._create_users(threads)
+            else:
+                self.context["users"] = []
 
         if len(self.context["tenants"]) < self.config["tenants"]:
             raise exceptions.ContextSetupFailure(
                 ctx_name=self.get_name(),
                 msg="Failed to create the requested number of tenants.")
 
-        users_num = self.config["users_per_tenant"] * self.config["tenants"]
-        threads = min(self.config["resource_management_workers"], users_num)
-        LOG.debug("Creating %(users)d users using %(threads)s threads"
-                  % {"users": users_num, "threads": threads})
-        self.context["users"] = self._create_users(threads)
         for user in self.context["users"]:
             self.context["tenants"][user["tenant_id"]]["users"].append(user)
 
@@ -301,15 +370,34 @@ class UserGenerator(context.Context):
         LOG.debug("Using existing users for OpenStack platform.")
         api_info = copy.deepcopy(self.env["platforms"]["openstack"].get(
             "api_info", {}))
+        credentials = []
         for user_credential in self.existing_users:
             user_credential = copy.deepcopy(user_credential)
             if "api_info" in user_credential:
                 api_info.update(user_credential["api_info"])
             user_credential["api_info"] = api_info
-            user_credential = credential.OpenStackCredential(**user_credential)
-            user_clients = osclients.Clients(user_credential)
-            user_id = user_clients.keystone.auth_ref.user_id
-            tenant_id = user_clients.keystone.auth_ref.project_id
+            credentials.append(
+                credential.OpenStackCredential(**user_credential))
+
+        # NOTE: the only reason to authenticate here is to learn ids of
+        #   users and their projects, so it is done in parallel. Tokens
+        #   stay in the shared sessions and are reused by scenarios.
+        auth_refs = {}
+
+        def publish(queue):
+            for i in range(len(credentials)):
+                queue.append(i)
+
+        def consume(cache, i):
+            auth_refs[i] = osclients.Clients(credentials[i]).keystone.auth_ref
+
+        threads = CONF.openstack.users_context_resource_management_workers
+        broker.run(publish, consume, min(threads, len(credentials)),
+                   adaptive=CONF.openstack.users_context_adaptive_workers,
+                   reraise=True)
+
+        for i, user_credential in enumerate(credentials):
+            tenant_id = auth_refs[i].project_id
 
             if tenant_id not in self.context["tenants"]:
                 self.context["tenants"][tenant_id] = {
@@ -319,11 +407,14 @@ class UserGenerator(context.Context):
 
             self.context["users"].append({
                 "credential": user_credential,
-                "id": user_id,
+                "id": auth_refs[i].user_id,
                 "tenant_id": tenant_id
             })
 
     def setup(self):
+        # the cloud could be reconfigured since the previous task
+        osclients.NEUTRON_EXTENSIONS.invalidate()
+
         self.context["users"] = []
         self.context["tenants"] = {}
         self.context["user_choice_method"] = self.config["user_choice_method"]
@@ -13,19 +13,22 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from rally.common import cfg
 from rally.common import logging
 from rally.common import utils
 from rally.common import validation
 from rally.task import context
 
+from rally_openstack import broker
 from rally_openstack import osclients
 from rally_openstack.wrappers import network
 
 
+CONF = cfg.CONF
 LOG = logging.getLogger(__name__)
 
 
-def _prepare_open_secgroup(credential, secgroup_name):
+def _prepare_open_secgroup(credential, secgroup_name, lookup=True):
     """Generate secgroup allowing all tcp/udp/icmp access.
 
     In order to run tests on instances it is necessary to have SSH access.
@@ -33,12 +36,17 @@ def _prepare_open_secgroup(credential, secgroup_name):
 
     :param credential: clients credential
     :param secgroup_name: security group name
+    :param lookup: whether to look for the existing security group with the
+        same name before creating a new one
 
     :returns: dict with security group details
     """
-    neutron = osclients.Clients(credential).neutron()
-    security_groups = neutron.list_security_groups()["security_groups"]
-    rally_open = [sg for sg in security_groups if sg["name"] == secgroup_name]
+    neutron = credential.clients().neutron()
+    rally_open = []
+    if lookup:
+        security_groups = neutron.list_security_groups()["security_groups"]
+        rally_open = [sg for sg in security_groups
+                      if sg["name"] == secgroup_name]
     if not rally_open:
         descr = "Allow ssh access to VMs created by Rally"
         rally_open = neutron.create_security_group(
@@ -101,9 +109,25 @@ class AllowSSH(context.Context):
             return
 
         secgroup_name = self.generate_random_name()
+        tenants_users = {}
         for user in self.context["users"]:
-            user["secgroup"] = _prepare_open_secgroup(user["credential"],
-                                                      secgroup_name)
+            tenants_users.setdefault(user["tenant_id"], []).append(user)
+
+        def publish(queue):
+            for users in tenants_users.values():
+                queue.append(users)
+
+        def consume(cache, users):
+            # the name is random, so there is no need to look for the
+            # security group among existing ones. It is created once and
+            # shared by all users of the tenant.
+            secgroup = _prepare_open_secgroup(users[0]["credential"],
+                                              secgroup_name, lookup=False)
+            for user in users:
+                user["secgroup"] = secgroup
+
+        broker.run(publish, consume, CONF.openstack.allow_ssh_context_workers,
+                   reraise=True)
 
     def cleanup(self):
         for user, tenant_id in utils.iterate_per_tenants(
@@ -13,16 +13,19 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from rally.common import cfg
 from rally.common import logging
 from rally.common import utils
 from rally.common import validation
 from rally.task import context
 
+from rally_openstack import broker
 from rally_openstack import consts
 from rally_openstack import osclients
 from rally_openstack.wrappers import network as network_wrapper
 
 
+CONF = cfg.CONF
 LOG = logging.getLogger(__name__)
 
 
@@ -96,20 +99,32 @@ class Network(context.Context):
         "dualstack": False
     }
 
-    def setup(self):
+    def _get_wrapper(self, cache):
         # NOTE(rkiran): Some clients are not thread-safe. Thus during
         #               multithreading/multiprocessing, it is likely the
         #               sockets are left open. This problem is eliminated by
-        #               creating a connection in setup and cleanup separately.
-        net_wrapper = network_wrapper.wrap(
-            osclients.Clients(self.context["admin"]["credential"]),
-            self, config=self.config)
+        #               creating a connection in every thread of setup and
+        #               cleanup separately.
+        if "wrapper" not in cache:
+            cache["wrapper"] = network_wrapper.wrap(
+                osclients.Clients(self.context["admin"]["credential"]),
+                self, config=self.config)
+        return cache["wrapper"]
+
+    def setup(self):
         kwargs = {}
         if self.config["dns_nameservers"] is not None:
             kwargs["dns_nameservers"] = self.config["dns_nameservers"]
-        for user, tenant_id in (utils.iterate_per_tenants(
-                self.context.get("users", []))):
-            self.context["tenants"][tenant_id]["networks"] = []
+
+        def publish(queue):
+            for user, tenant_id in (utils.iterate_per_tenants(
+                    self.context.get("users", []))):
+                queue.append(tenant_id)
+
+        def consume(cache, tenant_id):
+            net_wrapper = self._get_wrapper(cache)
+            networks = []
+            self.context["tenants"][tenant_id]["networks"] = networks
             for i in range(self.config["networks_per_tenant"]):
                 # NOTE(amaretskiy): router_create_args and subnets_num take
                 #                   effect for Neutron only.
@@ -121,15 +136,22 @@ class Network(context.Context):
                     network_create_args=network_create_args,
                     router_create_args=self.config["router"],
                     **kwargs)
-                self.context["tenants"][tenant_id]["networks"].append(network)
+                networks.append(network)
+
+        broker.run(publish, consume, CONF.openstack.network_context_workers,
+                   reraise=True)
 
     def cleanup(self):
-        net_wrapper = network_wrapper.wrap(
-            osclients.Clients(self.context["admin"]["credential"]),
-            self, config=self.config)
-        for tenant_id, tenant_ctx in self.context["tenants"].items():
-            for network in tenant_ctx.get("networks", []):
-                with logging.ExceptionLogger(
-                        LOG,
-                        "Failed to delete network for tenant %s" % tenant_id):
-                    net_wrapper.delete_network(network)
+        def publish(queue):
+            for tenant_id, tenant_ctx in self.context["tenants"].items():
+                if tenant_ctx.get("networks"):
+                    queue.append((tenant_id, tenant_ctx["networks"]))
+
+        def consume(cache, args):
+            tenant_id, networks = args
+            with logging.ExceptionLogger(
+                    LOG,
+                    "Failed to delete networks for tenant %s" % tenant_id):
+                self._get_wrapper(cache).delete_networks(networks)
+
+        broker.run(publish, consume, CONF.openstack.network_context_workers)
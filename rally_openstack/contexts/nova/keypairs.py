@@ -13,11 +13,17 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from rally.common import cfg
+from rally.common import logging
 from rally.common import validation
 from rally.task import context
 
+from rally_openstack import broker
 from rally_openstack.cleanup import manager as resource_manager
-from rally_openstack import osclients
+
+
+CONF = cfg.CONF
+LOG = logging.getLogger(__name__)
 
 
 @validation.add("required_platform", platform="openstack", users=True)
@@ -31,27 +37,42 @@ class Keypair(context.Context):
     CONFIG_SCHEMA = {"type": "object",
                      "additionalProperties": False}
 
+    # the number of attempts to pick a name which is not used yet
+    CREATE_ATTEMPTS = 3
+
     def _generate_keypair(self, credential):
-        nova_client = osclients.Clients(credential).nova()
-        # NOTE(hughsaunders): If keypair exists, it should re-generate name.
+        from novaclient import exceptions as nova_exc
 
-        keypairs = nova_client.keypairs.list()
-        keypair_names = [keypair.name for keypair in keypairs]
-        while True:
+        nova_client = credential.clients().nova()
+        # NOTE(hughsaunders): If keypair exists, it should re-generate name.
+        #   Random names are unique per task, so the keypair is created
+        #   without listing all existing keypairs of the user first.
+        for attempt in range(self.CREATE_ATTEMPTS):
             keypair_name = self.generate_random_name()
-            if keypair_name not in keypair_names:
+            try:
+                keypair = nova_client.keypairs.create(keypair_name)
                 break
+            except nova_exc.Conflict:
+                if attempt == self.CREATE_ATTEMPTS - 1:
+                    raise
+                LOG.debug("Keypair %s already exists." % keypair_name)
 
-        keypair = nova_client.keypairs.create(keypair_name)
         return {"private": keypair.private_key,
                 "public": keypair.public_key,
                 "name": keypair_name,
                 "id": keypair.id}
 
     def setup(self):
-        for user in self.context["users"]:
+        def publish(queue):
+            for user in self.context["users"]:
+                queue.append(user)
+
+        def consume(cache, user):
             user["keypair"] = self._generate_keypair(user["credential"])
 
+        broker.run(publish, consume, CONF.openstack.keypair_context_workers,
+                   reraise=True)
+
     def cleanup(self):
         resource_manager.cleanup(names=["nova.keypairs"],
                                  users=self.context.get("users", []),
@@ -12,16 +12,19 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from rally.common import cfg
 from rally.common import logging
 from rally.common import utils as rutils
 from rally.common import validation
 from rally.task import context
 
+from rally_openstack import broker
 from rally_openstack.cleanup import manager as resource_manager
 from rally_openstack.scenarios.nova import utils as nova_utils
 from rally_openstack import types
 
 
+CONF = cfg.CONF
 LOG = logging.getLogger(__name__)
 
 
@@ -105,8 +108,13 @@ class ServerGenerator(context.Context):
         flavor_id = types.Flavor(self.context).pre_process(
             resource_spec=flavor, config={})
 
-        for iter_, (user, tenant_id) in enumerate(rutils.iterate_per_tenants(
-                self.context["users"])):
+        def publish(queue):
+            for iter_, (user, tenant_id) in enumerate(
+                    rutils.iterate_per_tenants(self.context["users"])):
+                queue.append((iter_, user, tenant_id))
+
+        def consume(cache, args):
+            iter_, user, tenant_id = args
             LOG.debug("Booting servers for user tenant %s" % user["tenant_id"])
             tmp_context = {"user": user,
                            "tenant": self.context["tenants"][tenant_id],
@@ -122,10 +130,9 @@ class ServerGenerator(context.Context):
                          "flavor_id": flavor_id,
                          "servers_per_tenant": servers_per_tenant})
 
-            servers = nova_scenario._boot_servers(image_id, flavor_id,
-                                                  requests=servers_per_tenant,
-                                                  auto_assign_nic=auto_nic,
-                                                  **kwargs)
+            servers = nova_scenario._boot_servers(
+                image_id, flavor_id, requests=servers_per_tenant,
+                auto_assign_nic=auto_nic, **kwargs)
 
             current_servers = [server.id for server in servers]
 
@@ -134,6 +141,9 @@ class ServerGenerator(context.Context):
             self.context["tenants"][tenant_id][
                 "servers"] = current_servers
 
+        broker.run(publish, consume, CONF.openstack.servers_context_workers,
+                   reraise=True)
+
     def cleanup(self):
         resource_manager.cleanup(names=["nova.servers"],
                                  users=self.context.get("users", []),
@@ -13,10 +13,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+import time
+
+from rally.common import cfg
 from rally.common import logging
 from rally.common import validation
 from rally.task import context
 
+from rally_openstack import broker
 from rally_openstack import consts
 from rally_openstack.contexts.quotas import cinder_quotas
 from rally_openstack.contexts.quotas import designate_quotas
@@ -26,6 +31,7 @@ from rally_openstack.contexts.quotas import nova_quotas
 from rally_openstack import osclients
 
 
+CONF = cfg.CONF
 LOG = logging.getLogger(__name__)
 
 
@@ -52,53 +58,131 @@ class Quotas(context.Context):
         self.clients = osclients.Clients(
             self.context["admin"]["credential"])
 
-        self.manager = {
-            "nova": nova_quotas.NovaQuotas(self.clients),
-            "cinder": cinder_quotas.CinderQuotas(self.clients),
-            "manila": manila_quotas.ManilaQuotas(self.clients),
-            "designate": designate_quotas.DesignateQuotas(self.clients),
-            "neutron": neutron_quotas.NeutronQuotas(self.clients)
-        }
+        self.manager = self._create_managers(self.clients)
         self.original_quotas = []
 
+    @staticmethod
+    def _create_managers(clients):
+        return {
+            "nova": nova_quotas.NovaQuotas(clients),
+            "cinder": cinder_quotas.CinderQuotas(clients),
+            "manila": manila_quotas.ManilaQuotas(clients),
+            "designate": designate_quotas.DesignateQuotas(clients),
+            "neutron": neutron_quotas.NeutronQuotas(clients)
+        }
+
+    def _get_managers(self, cache):
+        # clients are not shared between threads, see the network context
+        if "managers" not in cache:
+            cache["managers"] = self._create_managers(osclients.Clients(
+                self.context["admin"]["credential"]))
+        return cache["managers"]
+
     def _service_has_quotas(self, service):
         return len(self.config.get(service, {})) > 0
 
+    def _run(self, action, jobs, func, reraise=False):
+        """Process quotas of tenants simultaneously.
+
+        Time spent on every service is saved as an atomic action.
+
+        :param action: a name of the action, e.g. "update"
+        :param jobs: a list of tuples with a service name, a tenant id and
+            extra arguments of func
+        :param func: a function to call with a quotas manager of the service
+            and items of the job
+        :param reraise: whether to raise the first error after processing
+            of all jobs
+        """
+        timings = {}
+        lock = threading.Lock()
+
+        def publish(queue):
+            for job in jobs:
+                queue.append(job)
+
+        def consume(cache, job):
+            service = job[0]
+            started_at = time.time()
+            failed = True
+            try:
+                func(self._get_managers(cache)[service], *job)
+                failed = False
+            finally:
+                finished_at = time.time()
+                with lock:
+                    timing = timings.setdefault(
+                        service, {"started_at": started_at,
+                                  "finished_at": finished_at,
+                                  "failed": False})
+                    timing["started_at"] = min(timing["started_at"],
+                                               started_at)
+                    timing["finished_at"] = max(timing["finished_at"],
+                                                finished_at)
+                    timing["failed"] = timing["failed"] or failed
+
+        try:
+            broker.run(publish, consume,
+                       CONF.openstack.quotas_context_workers,
+                       reraise=reraise)
+        finally:
+            for service in sorted(timings):
+                atomic_action = {"name": "%s.%s_quotas" % (service, action),
+                                 "children": [],
+                                 "started_at": timings[service]["started_at"],
+                                 "finished_at": timings[service][
+                                     "finished_at"]}
+                if timings[service]["failed"]:
+                    atomic_action["failed"] = True
+                self._atomic_actions.append(atomic_action)
+
     def setup(self):
+        def update(manager, service, tenant_id, quotas):
+            # NOTE(andreykurilin): in case of existing users it is
+            #   required to restore original quotas instead of reset
+            #   to default ones.
+            if "existing_users" in self.context:
+                self.original_quotas.append(
+                    (service, tenant_id, manager.get(tenant_id)))
+            manager.update(tenant_id, **quotas)
+
+        jobs = []
         for tenant_id in self.context["tenants"]:
             for service in self.manager:
                 if self._service_has_quotas(service):
-                    # NOTE(andreykurilin): in case of existing users it is
-                    #   required to restore original quotas instead of reset
-                    #   to default ones.
-                    if "existing_users" in self.context:
-                        self.original_quotas.append(
-                            (service, tenant_id,
-                             self.manager[service].get(tenant_id)))
-                    self.manager[service].update(tenant_id,
-                                                 **self.config[service])
+                    jobs.append((service, tenant_id, self.config[service]))
+
+        self._run("update", jobs, update, reraise=True)
 
     def _restore_quotas(self):
-        for service, tenant_id, quotas in self.original_quotas:
+        def restore(manager, service, tenant_id, quotas):
             try:
-                self.manager[service].update(tenant_id, **quotas)
+                manager.update(tenant_id, **quotas)
             except Exception as e:
                 LOG.warning("Failed to restore quotas for tenant %(tenant_id)s"
                             " in service %(service)s \n reason: %(exc)s" %
                             {"tenant_id": tenant_id, "service": service,
                              "exc": e})
 
+        self._run("restore", self.original_quotas, restore)
+
     def _delete_quotas(self):
+        def delete(manager, service, tenant_id):
+            try:
+                manager.delete(tenant_id)
+            except Exception as e:
+                LOG.warning(
+                    "Failed to remove quotas for tenant %(tenant)s "
+                    "in service %(service)s reason: %(e)s" %
+                    {"tenant": tenant_id, "service": service, "e": e})
+
+        jobs = []
         for service in self.manager:
             if self._service_has_quotas(service):
                 for tenant_id in self.context["tenants"]:
-                    try:
-                        self.manager[service].delete(tenant_id)
-                    except Exception as e:
-                        LOG.warning(
-                            "Failed to remove quotas for tenant %(tenant)s "
-                            "in service %(service)s reason: %(e)s" %
-                            {"tenant": tenant_id, "service": service, "e": e})
+                    jobs.append((service, tenant_id))
+
+        self._run("delete", jobs, delete)
 
     def cleanup(self):
         if self.original_quotas:
@@ -44,6 +44,9 @@ class SwiftObjectGenerator(swift_utils.SwiftObjectMixin, context.Context):
                 "type": "integer",
                 "minimum": 1
             },
+            "random_content": {
+                "type": "boolean"
+            },
             "resource_management_workers": {
                 "type": "integer",
                 "minimum": 1
@@ -56,6 +59,7 @@ class SwiftObjectGenerator(swift_utils.SwiftObjectMixin, context.Context):
         "containers_per_tenant": 1,
         "objects_per_container": 1,
         "object_size": 1024,
+        "random_content": False,
         "resource_management_workers": 30
     }
 
@@ -81,10 +85,9 @@ class SwiftObjectGenerator(swift_utils.SwiftObjectMixin, context.Context):
         objects_num = containers_num * objects_per_container
         LOG.debug("Creating %d objects using %d threads."
                   % (objects_num, threads))
-        objects_count = len(self._create_objects(self.context,
-                                                 objects_per_container,
-                                                 self.config["object_size"],
-                                                 threads))
+        objects_count = len(self._create_objects(
+            self.context, objects_per_container, self.config["object_size"],
+            threads, random_content=self.config["random_content"]))
         if objects_count != objects_num:
             raise exceptions.ContextSetupFailure(
                 ctx_name=self.get_name(),
@@ -13,8 +13,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import tempfile
-
 from rally.common import broker
 from rally.common import utils as rutils
 
@@ -60,7 +58,7 @@ class SwiftObjectMixin(object):
         return containers
 
     def _create_objects(self, context, objects_per_container, object_size,
-                        threads):
+                        threads, random_content=False):
         """Create objects and store results in Rally context.
 
         :param context: dict, Rally context environment
@@ -68,36 +66,33 @@ class SwiftObjectMixin(object):
                                       per container
         :param object_size: int, size of created swift objects in byte
         :param threads: int, number of threads to use for broker pattern
+        :param random_content: bool, whether to upload pseudo-random content
+                               instead of zeros
 
         :returns: list of tuples containing (account, container, object)
         """
         objects = []
+        payload = swift_utils.get_payload(object_size, random_content)
+
+        def publish(queue):
+            for tenant_id in context["tenants"]:
+                containers = context["tenants"][tenant_id]["containers"]
+                for container in containers:
+                    for i in range(objects_per_container):
+                        queue.append(container)
 
-        with tempfile.TemporaryFile() as dummy_file:
-            # set dummy file to specified object size
-            dummy_file.truncate(object_size)
-
-            def publish(queue):
-                for tenant_id in context["tenants"]:
-                    containers = context["tenants"][tenant_id]["containers"]
-                    for container in containers:
-                        for i in range(objects_per_container):
-                            queue.append(container)
-
-            def consume(cache, container):
-                user = container["user"]
-                if user["id"] not in cache:
-                    cache[user["id"]] = swift_utils.SwiftScenario(
-                        {"user": user, "task": context.get("task", {})})
-                dummy_file.seek(0)
-                object_name = cache[user["id"]]._upload_object(
-                    container["container"],
-                    dummy_file)[1]
-                container["objects"].append(object_name)
-                objects.append((user["tenant_id"], container["container"],
-                                object_name))
-
-            broker.run(publish, consume, threads)
+        def consume(cache, container):
+            user = container["user"]
+            if user["id"] not in cache:
+                cache[user["id"]] = swift_utils.SwiftScenario(
+                    {"user": user, "task": context.get("task", {})})
+            object_name = cache[user["id"]]._upload_payload(
+                container["container"], payload)[1]
+            container["objects"].append(object_name)
+            objects.append((user["tenant_id"], container["container"],
+                            object_name))
+
+        broker.run(publish, consume, threads)
 
         return objects
 
@@ -14,7 +14,12 @@
 #    under the License.
 
 import abc
+import collections
+import functools
 import os
+import threading
+import time
+import weakref
 
 from rally.common import cfg
 from rally.common import logging
@@ -75,6 +80,258 @@ class AuthenticationFailed(exceptions.AuthenticationFailed):
         return self._helpful_trace
 
 
+def _will_expire_soon(auth_ref):
+    """Checks whether the token should be refreshed proactively."""
+    margin = CONF.openstack.keystone_token_refresh_margin
+    if margin <= 0 or auth_ref is None:
+        return False
+    return auth_ref.will_expire_soon(stale_duration=margin)
+
+
+def _get_credential_key(credential):
+    """Returns hashable identity of the credential for SessionPool keys."""
+    return (credential.auth_url,
+            credential.username,
+            credential.password,
+            credential.tenant_name,
+            credential.domain_name,
+            credential.user_domain_name,
+            credential.project_domain_name,
+            credential.https_insecure,
+            credential.https_cacert,
+            credential.https_cert)
+
+
+class SessionPool(object):
+    """Process-wide pool of keystone sessions.
+
+    Keystone sessions (with their HTTP connection pools) and identity plugins
+    (with their tokens) are shared by all OSClient instances which use the
+    same credential, so a new Clients object doesn't issue a new token.
+
+    Tokens of pooled sessions are refreshed in background a bit before the
+    expiry (see CONF.openstack.keystone_token_refresh_margin), so long
+    running workloads do not meet a burst of 401 responses followed by
+    re-authentication of all the runner threads at once.
+
+    The size of the pool is limited by
+    CONF.openstack.keystone_session_pool_size, the least recently used
+    sessions are dropped first.
+    """
+
+    # The maximum interval between checks of tokens expiry, seconds
+    REFRESH_INTERVAL = 30
+
+    def __init__(self):
+        self._sessions = collections.OrderedDict()
+        self._creation_locks = {}
+        self._lock = threading.Lock()
+        self._refresh_locks = weakref.WeakKeyDictionary()
+        self._refresher = None
+
+    def get(self, key, create):
+        """Returns the pooled value or creates it.
+
+        :param key: hashable identity of the credential (see
+            `_get_credential_key`) followed by the keystone API version
+        :param create: a function to create the value if it is not pooled
+        """
+        size = CONF.openstack.keystone_session_pool_size
+        if size <= 0:
+            return create()
+        with self._lock:
+            if key in self._sessions:
+                value = self._sessions.pop(key)
+                self._sessions[key] = value
+                return value
+            creation_lock = self._creation_locks.setdefault(
+                key, threading.Lock())
+        # NOTE: only one thread authenticates a credential, others wait for
+        #   the result instead of issuing their own tokens
+        with creation_lock:
+            with self._lock:
+                if key in self._sessions:
+                    return self._sessions[key]
+            try:
+                value = create()
+            except Exception:
+                with self._lock:
+                    self._creation_locks.pop(key, None)
+                raise
+            with self._lock:
+                self._sessions[key] = value
+                self._creation_locks.pop(key, None)
+                while len(self._sessions) > size:
+                    self._sessions.popitem(last=False)
+                self._start_refresher()
+        return value
+
+    def clear(self):
+        """Drops all pooled sessions."""
+        with self._lock:
+            self._sessions.clear()
+
+    def discard(self, credential):
+        """Drops pooled sessions of the credential.
+
+        It should be called when the user is deleted, so its token is not
+        refreshed anymore.
+
+        :param credential: rally_openstack.credential.OpenStackCredential
+        """
+        prefix = _get_credential_key(credential)
+        with self._lock:
+            for key in list(self._sessions):
+                if key[:-1] == prefix:
+                    del self._sessions[key]
+
+    def _get_refresh_lock(self, identity_plugin):
+        with self._lock:
+            if identity_plugin not in self._refresh_locks:
+                self._refresh_locks[identity_plugin] = threading.Lock()
+            return self._refresh_locks[identity_plugin]
+
+    def refresh(self, session, identity_plugin):
+        """Returns the token of the plugin refreshing it if it expires soon.
+
+        :param session: keystoneauth1 session
+        :param identity_plugin: keystoneauth1 identity plugin
+        """
+        auth_ref = getattr(identity_plugin, "auth_ref", None)
+        if auth_ref is not None and not _will_expire_soon(auth_ref):
+            return identity_plugin.get_access(session)
+        # NOTE: many threads can notice the missing or expiring token at
+        #   once, but only the first one should authenticate. Different
+        #   credentials are authenticated simultaneously.
+        with self._get_refresh_lock(identity_plugin):
+            auth_ref = identity_plugin.get_access(session)
+            if _will_expire_soon(auth_ref):
+                LOG.debug("Refreshing keystone token which expires at %s."
+                          % auth_ref.expires)
+                identity_plugin.invalidate()
+                auth_ref = identity_plugin.get_access(session)
+        return auth_ref
+
+    def _start_refresher(self):
+        margin = CONF.openstack.keystone_token_refresh_margin
+        if margin <= 0 or (self._refresher and self._refresher.is_alive()):
+            return
+        self._refresher = threading.Thread(
+            target=self._refresh_tokens,
+            args=(min(self.REFRESH_INTERVAL, margin / 2.0),))
+        self._refresher.daemon = True
+        self._refresher.start()
+
+    def _refresh_tokens(self, interval):
+        while True:
+            time.sleep(interval)
+            with self._lock:
+                sessions = list(self._sessions.values())
+                if not sessions:
+                    self._refresher = None
+                    return
+            for session, identity_plugin in sessions:
+                # sessions which were never used to authenticate do not
+                # need refreshing
+                auth_ref = getattr(identity_plugin, "auth_ref", None)
+                try:
+                    if _will_expire_soon(auth_ref):
+                        self.refresh(session, identity_plugin)
+                except Exception as e:
+                    LOG.warning("Failed to refresh keystone token: %s" % e)
+
+
+SESSION_POOL = SessionPool()
+
+
+class EndpointIndex(object):
+    """Resolved endpoints of service catalogs.
+
+    ServiceCatalog.url_for() scans the whole catalog on every call. Resolved
+    URLs are indexed by (service_type, region_name, interface) per catalog
+    object, i.e. per token, which is shared by all clients of the credential
+    (see SessionPool). The index is dropped together with the catalog.
+    """
+
+    def __init__(self):
+        self._indexes = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def url_for(self, catalog, service_type, region_name=None,
+                interface=None):
+        """Returns URL of the endpoint.
+
+        :param catalog: keystoneauth1 service catalog
+        :param service_type: type of the service
+        :param region_name: name of the region
+        :param interface: type of the endpoint (public, internal, admin)
+        """
+        key = (service_type, region_name, interface)
+        with self._lock:
+            index = self._indexes.setdefault(catalog, {})
+            if key in index:
+                return index[key]
+        kw = {"service_type": service_type, "region_name": region_name}
+        if interface:
+            kw["interface"] = interface
+        url = catalog.url_for(**kw)
+        with self._lock:
+            index[key] = url
+        return url
+
+
+ENDPOINT_INDEX = EndpointIndex()
+
+
+class NeutronExtensions(object):
+    """Aliases of Neutron extensions.
+
+    Extensions do not depend on a project, so they are listed once per
+    Neutron endpoint and shared by scenarios, network wrappers, cleanup and
+    validators. The cache is kept until invalidate() is called, which
+    users@openstack context does at the beginning of every task.
+    """
+
+    def __init__(self):
+        self._aliases = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_endpoint(client):
+        httpclient = getattr(client, "httpclient", None)
+        return getattr(httpclient, "endpoint_override", None)
+
+    def get_aliases(self, client):
+        """Returns a set of aliases of enabled extensions.
+
+        :param client: neutronclient.v2_0.client.Client instance
+        """
+        endpoint = self._get_endpoint(client)
+        with self._lock:
+            aliases = self._aliases.get(endpoint) if endpoint else None
+        if aliases is None:
+            extensions = client.list_extensions().get("extensions", [])
+            aliases = frozenset(ext.get("alias") for ext in extensions)
+            if endpoint:
+                with self._lock:
+                    self._aliases[endpoint] = aliases
+        return aliases
+
+    def invalidate(self, client=None):
+        """Drops extensions of the client endpoint or of all endpoints.
+
+        :param client: neutronclient.v2_0.client.Client instance
+        """
+        with self._lock:
+            if client is None:
+                self._aliases.clear()
+            else:
+                self._aliases.pop(self._get_endpoint(client), None)
+
+
+NEUTRON_EXTENSIONS = NeutronExtensions()
+
+
 def configure(name, default_version=None, default_service_type=None,
               supported_versions=None):
     """OpenStack client class wrapper.
@@ -192,12 +449,11 @@ class OSClient(plugin.Plugin):
                                         self.cache)
 
     def _get_endpoint(self, service_type=None):
-        kw = {"service_type": self.choose_service_type(service_type),
-              "region_name": self.credential.region_name}
-        if self.credential.endpoint_type:
-            kw["interface"] = self.credential.endpoint_type
-        api_url = self.keystone.service_catalog.url_for(**kw)
-        return api_url
+        return ENDPOINT_INDEX.url_for(
+            self.keystone.service_catalog,
+            service_type=self.choose_service_type(service_type),
+            region_name=self.credential.region_name,
+            interface=self.credential.endpoint_type)
 
     def _get_auth_info(self, user_key="username",
                        password_key="password",
@@ -240,8 +496,14 @@ class OSClient(plugin.Plugin):
         key = "{0}{1}{2}".format(self.get_name(),
                                  str(args) if args else "",
                                  str(kwargs) if kwargs else "")
-        if key not in self.cache:
+        auth_refs = self.cache.get("clients_auth_refs", {})
+        if key not in self.cache or _will_expire_soon(auth_refs.get(key)):
             self.cache[key] = self.create_client(*args, **kwargs)
+            # NOTE: clients which are initialized with a token (not with a
+            #   session) have to be re-created before the token expires
+            auth_ref = self.cache.get("keystone_auth_ref")
+            if auth_ref is not None:
+                self.cache.setdefault("clients_auth_refs", {})[key] = auth_ref
         return self.cache[key]
 
     @classmethod
@@ -268,9 +530,11 @@ class Keystone(OSClient):
     @property
     def auth_ref(self):
         try:
-            if "keystone_auth_ref" not in self.cache:
+            auth_ref = self.cache.get("keystone_auth_ref")
+            if auth_ref is None or _will_expire_soon(auth_ref):
                 sess, plugin = self.get_session()
-                self.cache["keystone_auth_ref"] = plugin.get_access(sess)
+                self.cache["keystone_auth_ref"] = SESSION_POOL.refresh(
+                    sess, plugin)
         except Exception as original_e:
             e = AuthenticationFailed(
                 error=original_e,
@@ -291,50 +555,59 @@ class Keystone(OSClient):
     def get_session(self, version=None):
         key = "keystone_session_and_plugin_%s" % version
         if key not in self.cache:
-            from keystoneauth1 import discover
-            from keystoneauth1 import identity
-            from keystoneauth1 import session
-
-            version = self.choose_version(version)
-            auth_url = self.credential.auth_url
-            if version is not None:
-                auth_url = self._remove_url_version()
-
-            password_args = {
-                "auth_url": auth_url,
-                "username": self.credential.username,
-                "password": self.credential.password,
-                "tenant_name": self.credential.tenant_name
-            }
-
-            if version is None:
-                # NOTE(rvasilets): If version not specified than we discover
-                # available version with the smallest number. To be able to
-                # discover versions we need session
-                temp_session = session.Session(
-                    verify=(self.credential.https_cacert or
-                            not self.credential.https_insecure),
-                    cert=self.credential.https_cert,
-                    timeout=CONF.openstack_client_http_timeout)
-                version = str(discover.Discover(
-                    temp_session,
-                    password_args["auth_url"]).version_data()[0]["version"][0])
-
-            if "v2.0" not in password_args["auth_url"] and version != "2":
-                password_args.update({
-                    "user_domain_name": self.credential.user_domain_name,
-                    "domain_name": self.credential.domain_name,
-                    "project_domain_name": self.credential.project_domain_name
-                })
-            identity_plugin = identity.Password(**password_args)
-            sess = session.Session(
-                auth=identity_plugin,
+            self.cache[key] = SESSION_POOL.get(
+                self._get_session_pool_key(version),
+                functools.partial(self._create_session, version))
+        return self.cache[key]
+
+    def _get_session_pool_key(self, version=None):
+        return (_get_credential_key(self.credential)
+                + (self.choose_version(version),))
+
+    def _create_session(self, version=None):
+        from keystoneauth1 import discover
+        from keystoneauth1 import identity
+        from keystoneauth1 import session
+
+        version = self.choose_version(version)
+        auth_url = self.credential.auth_url
+        if version is not None:
+            auth_url = self._remove_url_version()
+
+        password_args = {
+            "auth_url": auth_url,
+            "username": self.credential.username,
+            "password": self.credential.password,
+            "tenant_name": self.credential.tenant_name
+        }
+
+        if version is None:
+            # NOTE(rvasilets): If version not specified than we discover
+            # available version with the smallest number. To be able to
+            # discover versions we need session
+            temp_session = session.Session(
                 verify=(self.credential.https_cacert or
                         not self.credential.https_insecure),
                 cert=self.credential.https_cert,
                 timeout=CONF.openstack_client_http_timeout)
-            self.cache[key] = (sess, identity_plugin)
-        return self.cache[key]
+            version = str(discover.Discover(
+                temp_session,
+                password_args["auth_url"]).version_data()[0]["version"][0])
+
+        if "v2.0" not in password_args["auth_url"] and version != "2":
+            password_args.update({
+                "user_domain_name": self.credential.user_domain_name,
+                "domain_name": self.credential.domain_name,
+                "project_domain_name": self.credential.project_domain_name
+            })
+        identity_plugin = identity.Password(**password_args)
+        sess = session.Session(
+            auth=identity_plugin,
+            verify=(self.credential.https_cacert or
+                    not self.credential.https_insecure),
+            cert=self.credential.https_cert,
+            timeout=CONF.openstack_client_http_timeout)
+        return sess, identity_plugin
 
     def _remove_url_version(self):
         """Remove any version from the auth_url.
@@ -19,6 +19,9 @@ import traceback
 from rally.common import cfg
 from rally.common import logging
 from rally.env import platform
+
+from rally_openstack.cleanup import manager
+from rally_openstack import credential
 from rally_openstack import osclients
 
 
@@ -157,14 +160,40 @@ class OpenStack(platform.Platform):
         pass
 
     def cleanup(self, task_uuid=None):
-        return {
-            "message": "Coming soon!",
-            "discovered": 0,
-            "deleted": 0,
-            "failed": 0,
-            "resources": {},
-            "errors": []
-        }
+        """Remove resources created by Rally from the whole cloud.
+
+        All resource managers are used with admin credential to discover
+        resources of all tenants which names match Rally's name patterns.
+        Resources without names are not touched, and resources of managers
+        which can not list all tenants at once are looked for only among
+        the ones visible to admin. If journals are enabled (see
+        CONF.openstack.cleanup_journal_dir), the interrupted cleanup is
+        resumed.
+
+        :param task_uuid: remove only resources of the specified task
+        """
+        if not (self.platform_data or {}).get("admin"):
+            return {
+                "message": "Skipped. Admin credential is required to "
+                           "cleanup the whole cloud.",
+                "discovered": 0,
+                "deleted": 0,
+                "failed": 0,
+                "resources": {},
+                "errors": []
+            }
+
+        admin_cred = copy.deepcopy(self.platform_data["admin"])
+        api_info = copy.deepcopy(self.platform_data.get("api_info", {}))
+        api_info.update(admin_cred.get("api_info", {}))
+        admin_cred["api_info"] = api_info
+        admin = {"credential": credential.OpenStackCredential(**admin_cred)}
+
+        result = manager.cleanup(names=manager.list_resource_names(),
+                                 admin=admin, users=[], task_id=task_uuid,
+                                 all_tenants=True, resume=True)
+        result["message"] = "Failed" if result["failed"] else "Succeeded"
+        return result
 
     def check_health(self):
         """Check whatever platform is alive."""
@@ -107,6 +107,44 @@ class OpenStackScenario(scenario.Scenario):
 
         return client(version) if version is not None else client()
 
+    def assertIn(self, member, container, err_msg=None):
+        """Check that the member is in the container.
+
+        The base implementation renders the whole container into the message
+        before the check, here it is done only if the check fails. err_msg
+        can be a function without arguments which returns the message, so
+        formatting of it can be deferred as well.
+        """
+        if member not in container:
+            if callable(err_msg):
+                err_msg = err_msg()
+            super(OpenStackScenario, self).assertIn(member, container,
+                                                    err_msg=err_msg)
+
+    @staticmethod
+    def _iterate_pages(list_page, page_size):
+        """Yield resources listed page by page.
+
+        The next page is requested only when the previous one is consumed,
+        so a caller which looks for a specific resource can stop early.
+        Listing stops as well if the marker does not advance, i.e. if the
+        API ignores it and returns the same page again.
+
+        :param list_page: a function which accepts marker and limit
+            arguments and returns a list of resources with id attribute
+        :param page_size: the number of resources to request at once
+        """
+        marker = None
+        while True:
+            page = list_page(marker=marker, limit=page_size)
+            if marker is not None and page and page[-1].id == marker:
+                break
+            for resource in page:
+                yield resource
+            if len(page) < page_size:
+                break
+            marker = page[-1].id
+
     def _init_profiler(self, context):
         """Inits the profiler."""
         if not CONF.openstack.enable_profiler:
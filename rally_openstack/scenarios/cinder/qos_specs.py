@@ -42,10 +42,11 @@ class CreateAndListQos(cinder_utils.CinderBasic):
         qos = self.admin_cinder.create_qos(specs)
 
         pool_list = self.admin_cinder.list_qos()
-        msg = ("Qos not included into list of available qos\n"
-               "created qos:{}\n"
-               "Pool of qos:{}").format(qos, pool_list)
-        self.assertIn(qos, pool_list, err_msg=msg)
+        self.assertIn(
+            qos, pool_list,
+            err_msg=lambda: ("Qos not included into list of available qos\n"
+                             "created qos:{}\n"
+                             "Pool of qos:{}").format(qos, pool_list))
 
 
 @validation.add("required_services", services=[consts.Service.CINDER])
@@ -118,12 +118,13 @@ class CreateAndListVolumeTypes(cinder_utils.CinderBasic):
             is_public=is_public)
 
         pool_list = self.admin_cinder.list_types()
-        msg = ("type not included into list of available types "
-               "created type: {}\n"
-               "pool of types: {}\n").format(volume_type, pool_list)
         self.assertIn(volume_type.id,
                       [vtype.id for vtype in pool_list],
-                      err_msg=msg)
+                      err_msg=lambda: ("type not included into list of "
+                                       "available types "
+                                       "created type: {}\n"
+                                       "pool of types: {}\n").format(
+                          volume_type, pool_list))
 
 
 @validation.add("required_params", params=[("create_specs", "provider")])
@@ -43,7 +43,8 @@ LOG = logging.getLogger(__name__)
                     platform="openstack")
 class CreateAndListVolume(cinder_utils.CinderBasic):
 
-    def run(self, size, detailed=True, image=None, **kwargs):
+    def run(self, size, detailed=True, image=None, list_page_size=None,
+            **kwargs):
         """Create a volume and list all volumes.
 
         Measure the "cinder volume-list" command performance.
@@ -61,13 +62,37 @@ class CreateAndListVolume(cinder_utils.CinderBasic):
         :param detailed: determines whether the volume listing should contain
                          detailed information about all of them
         :param image: image to be used to create volume
+        :param list_page_size: if specified, volumes are listed by pages of
+                               this size until the created volume is found
+                               instead of listing all of them. It is not
+                               supported by Cinder V1 API
         :param kwargs: optional args to create a volume
         """
+        version = str(self.cinder.version)
+        if list_page_size and version == "1":
+            raise exceptions.InvalidArgumentsException(
+                "list_page_size is not supported by Cinder V1 API, since it "
+                "ignores markers of pages.")
         if image:
             kwargs["imageRef"] = image
 
-        self.cinder.create_volume(size, **kwargs)
-        self.cinder.list_volumes(detailed)
+        volume = self.cinder.create_volume(size, **kwargs)
+        if not list_page_size:
+            self.cinder.list_volumes(detailed)
+            return
+
+        # NOTE: all pages are listed within one atomic action, so results
+        #       are comparable with the ones of listing all volumes at once
+        client = self.clients("cinder", version)
+        with atomic.ActionTimer(self, "cinder_v%s.list_volumes" % version):
+            volumes = self._iterate_pages(
+                lambda marker, limit: client.volumes.list(
+                    detailed, marker=marker, limit=limit),
+                list_page_size)
+            found = any(v.id == volume.id for v in volumes)
+        self.assertTrue(
+            found, err_msg="Volume %s not included into list of available "
+                           "volumes" % volume.id)
 
 
 @types.convert(image={"type": "glance_image"})
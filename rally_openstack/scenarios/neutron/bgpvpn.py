@@ -284,11 +284,14 @@ class CreateAndListNetworksAssocs(utils.NeutronScenario):
             bgpvpn)["network_associations"]
 
         network_id = network["id"]
-        msg = ("Network not included into list of associated networks\n"
-               "Network created: {}\n"
-               "List of associations: {}").format(network, net_assocs)
         list_networks = [net_assoc["network_id"] for net_assoc in net_assocs]
-        self.assertIn(network_id, list_networks, err_msg=msg)
+        self.assertIn(
+            network_id, list_networks,
+            err_msg=lambda: ("Network not included into list of associated "
+                             "networks\n"
+                             "Network created: {}\n"
+                             "List of associations: {}").format(network,
+                                                                net_assocs))
 
 
 @validation.add("enum", param_name="bgpvpn_type", values=["l2", "l3"],
@@ -338,9 +341,11 @@ class CreateAndListRoutersAssocs(utils.NeutronScenario):
             bgpvpn)["router_associations"]
 
         router_id = router["id"]
-        msg = ("Router not included into list of associated routers\n"
-               "Router created: {}\n"
-               "List of associations: {}").format(router, router_assocs)
-
         list_routers = [r_assoc["router_id"] for r_assoc in router_assocs]
-        self.assertIn(router_id, list_routers, err_msg=msg)
+        self.assertIn(
+            router_id, list_routers,
+            err_msg=lambda: ("Router not included into list of associated "
+                             "routers\n"
+                             "Router created: {}\n"
+                             "List of associations: {}").format(router,
+                                                                router_assocs))
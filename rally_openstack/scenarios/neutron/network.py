@@ -36,7 +36,7 @@ LOG = logging.getLogger(__name__)
                     platform="openstack")
 class CreateAndListNetworks(utils.NeutronScenario):
 
-    def run(self, network_create_args=None):
+    def run(self, network_create_args=None, list_page_size=None):
         """Create a network and then list all networks.
 
         Measure the "neutron net-list" command performance.
@@ -48,9 +48,20 @@ class CreateAndListNetworks(utils.NeutronScenario):
         the number of networks owned by users.
 
         :param network_create_args: dict, POST /v2.0/networks request options
+        :param list_page_size: if specified, networks are listed by pages of
+                               this size until the created network is found
+                               instead of listing all of them
         """
-        self._create_network(network_create_args or {})
-        self._list_networks()
+        network = self._create_network(network_create_args or {})
+        if not list_page_size:
+            self._list_networks()
+            return
+
+        network_id = network["network"]["id"]
+        self.assertTrue(
+            self._find_listed_network(network_id, page_size=list_page_size),
+            err_msg="Network %s not included into list of available "
+                    "networks" % network_id)
 
 
 @validation.add("required_services",
@@ -22,6 +22,7 @@ from rally import exceptions
 from rally.task import atomic
 from rally.task import utils
 
+from rally_openstack import osclients
 from rally_openstack import scenario
 from rally_openstack.wrappers import network as network_wrapper
 
@@ -64,9 +65,8 @@ class NeutronScenario(scenario.OpenStackScenario):
 
         Without this extension, we can't pass the enable_snat parameter.
         """
-        return any(
-            e["alias"] == "ext-gw-mode"
-            for e in self.clients("neutron").list_extensions()["extensions"])
+        return "ext-gw-mode" in osclients.NEUTRON_EXTENSIONS.get_aliases(
+            self.clients("neutron"))
 
     @atomic.action_timer("neutron.create_network")
     def _create_network(self, network_create_args):
@@ -87,6 +87,23 @@ class NeutronScenario(scenario.OpenStackScenario):
         """
         return self.clients("neutron").list_networks(**kwargs)["networks"]
 
+    @atomic.action_timer("neutron.list_networks")
+    def _find_listed_network(self, network_id, page_size=100, **kwargs):
+        """List networks page by page until the given one is found.
+
+        :param network_id: ID of the network to look for
+        :param page_size: the number of networks to request at once
+        :param kwargs: network list options
+        :returns: the listed network or None if it is not found
+        """
+        pages = self.clients("neutron").list_networks(
+            retrieve_all=False, limit=page_size, **kwargs)
+        for page in pages:
+            for network in page["networks"]:
+                if network["id"] == network_id:
+                    return network
+        return None
+
     @atomic.action_timer("neutron.list_agents")
     def _list_agents(self, **kwargs):
         """Fetches agents.
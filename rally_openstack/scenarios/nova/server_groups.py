@@ -59,11 +59,13 @@ class CreateAndListServerGroups(utils.NovaScenario):
         self.assertTrue(server_group, err_msg=msg)
 
         server_groups_list = self._list_server_groups(all_projects)
-        msg = ("Server Group not included into list of server groups\n"
-               "Created server group: {}\n"
-               "list of server groups: {}").format(server_group,
-                                                   server_groups_list)
-        self.assertIn(server_group, server_groups_list, err_msg=msg)
+        self.assertIn(
+            server_group, server_groups_list,
+            err_msg=lambda: ("Server Group not included into list of server "
+                             "groups\n"
+                             "Created server group: {}\n"
+                             "list of server groups: {}").format(
+                server_group, server_groups_list))
 
 
 @validation.add("required_services", services=[consts.Service.NOVA])
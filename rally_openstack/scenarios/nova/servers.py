@@ -44,7 +44,8 @@ LOG = logging.getLogger(__name__)
                     platform="openstack")
 class BootAndListServer(utils.NovaScenario):
 
-    def run(self, image, flavor, detailed=True, **kwargs):
+    def run(self, image, flavor, detailed=True, list_page_size=None,
+            **kwargs):
         """Boot a server from an image and then list all servers.
 
         Measure the "nova list" command performance.
@@ -59,17 +60,30 @@ class BootAndListServer(utils.NovaScenario):
         :param flavor: flavor to be used to boot an instance
         :param detailed: True if the server listing should contain
                          detailed information about all of them
+        :param list_page_size: if specified, servers are listed by pages of
+                               this size until the booted server is found
+                               instead of listing all of them
         :param kwargs: Optional additional arguments for server creation
         """
         server = self._boot_server(image, flavor, **kwargs)
         msg = ("Servers isn't created")
         self.assertTrue(server, err_msg=msg)
 
+        if list_page_size:
+            listed = self._find_listed_server(server.id, detailed,
+                                              page_size=list_page_size)
+            self.assertTrue(
+                listed, err_msg="Server %s not included into list of "
+                                "available servers" % server.id)
+            return
+
         pool_list = self._list_servers(detailed)
-        msg = ("Server not included into list of available servers\n"
-               "Booted server: {}\n"
-               "Pool of servers: {}").format(server, pool_list)
-        self.assertIn(server, pool_list, err_msg=msg)
+        self.assertIn(
+            server, pool_list,
+            err_msg=lambda: ("Server not included into list of available "
+                             "servers\n"
+                             "Booted server: {}\n"
+                             "Pool of servers: {}").format(server, pool_list))
 
 
 @validation.add("required_services", services=[consts.Service.NOVA])
@@ -536,10 +550,12 @@ class BootServerAttachVolumeAndListAttachments(utils.NovaScenario,
         list_attachments = self._list_attachments(server.id)
 
         for attachment in attachments:
-            msg = ("attachment not included into list of available "
-                   "attachments\n attachment: {}\n"
-                   "list attachments: {}").format(attachment, list_attachments)
-            self.assertIn(attachment, list_attachments, err_msg=msg)
+            self.assertIn(
+                attachment, list_attachments,
+                err_msg=lambda: ("attachment not included into list of "
+                                 "available attachments\n attachment: {}\n"
+                                 "list attachments: {}").format(
+                    attachment, list_attachments))
 
 
 @types.convert(image={"type": "glance_image"},
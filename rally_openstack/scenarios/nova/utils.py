@@ -13,16 +13,21 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import time
 
 from rally.common import cfg
 from rally.common import logging
 from rally import exceptions
 from rally.task import atomic
 from rally.task import utils
+import six
 
+from rally_openstack import broker
+from rally_openstack import osclients
 from rally_openstack import scenario
 from rally_openstack.scenarios.cinder import utils as cinder_utils
 from rally_openstack.services.image import image as image_service
+from rally_openstack import waiter
 
 
 CONF = cfg.CONF
@@ -37,6 +42,25 @@ class NovaScenario(scenario.OpenStackScenario):
         """Returns user servers list."""
         return self.clients("nova").servers.list(detailed)
 
+    @atomic.action_timer("nova.list_servers")
+    def _find_listed_server(self, server_id, detailed=True, page_size=100):
+        """List servers page by page until the given one is found.
+
+        :param server_id: ID of the server to look for
+        :param detailed: True if the server listing should contain
+                         detailed information
+        :param page_size: the number of servers to request at once
+        :returns: the listed server or None if it is not found
+        """
+        servers = self._iterate_pages(
+            lambda marker, limit: self.clients("nova").servers.list(
+                detailed, marker=marker, limit=limit),
+            page_size)
+        for server in servers:
+            if server.id == server_id:
+                return server
+        return None
+
     def _pick_random_nic(self):
         """Choose one network from existing ones."""
         ctxt = self.context
@@ -394,30 +418,94 @@ class NovaScenario(scenario.OpenStackScenario):
                 check_interval=CONF.openstack.nova_server_delete_poll_interval
             )
 
+    def _get_nova_client(self, cache):
+        # NOTE: novaclient is not thread-safe, so every thread which sends
+        #       requests of _boot_servers() and _delete_servers() uses its
+        #       own client (see the network context as well).
+        if "nova" not in cache:
+            cache["nova"] = osclients.Clients(
+                self._clients.credential).nova()
+        return cache["nova"]
+
     def _delete_servers(self, servers, force=False):
         """Delete multiple servers.
 
+        Delete requests are sent simultaneously and the time it takes to
+        delete each server is recorded as a separate atomic action.
+
         :param servers: A list of servers to delete
         :param force: If True, force_delete will be used instead of delete.
         """
-        atomic_name = ("nova.%sdelete_servers") % (force and "force_" or "")
-        with atomic.ActionTimer(self, atomic_name):
-            for server in servers:
+        prefix = force and "force_" or ""
+        timer = atomic.ActionTimer(self, "nova.%sdelete_servers" % prefix)
+        with timer:
+            started = {}
+            finished = {}
+
+            def publish(queue):
+                for server in servers:
+                    queue.append(server)
+
+            def consume(cache, server):
+                nova = self._get_nova_client(cache)
+                started[server.id] = time.time()
                 if force:
-                    server.force_delete()
+                    nova.servers.force_delete(server)
                 else:
-                    server.delete()
-
-            for server in servers:
-                utils.wait_for_status(
-                    server,
+                    nova.servers.delete(server)
+
+            broker.run(
+                publish, consume,
+                consumers_count=CONF.openstack.nova_servers_requests_workers,
+                reraise=True)
+            try:
+                self._wait_for_servers(
+                    servers,
                     ready_statuses=["deleted"],
+                    failure_statuses=["error"],
                     check_deletion=True,
-                    update_resource=utils.get_from_manager(),
                     timeout=CONF.openstack.nova_server_delete_timeout,
                     check_interval=(
-                        CONF.openstack.nova_server_delete_poll_interval)
-                )
+                        CONF.openstack.nova_server_delete_poll_interval),
+                    search_opts=self._get_changes_since_filter(servers),
+                    on_ready=lambda server_id, server: finished.setdefault(
+                        server_id, time.time()))
+            finally:
+                self._add_servers_atomic_actions(
+                    timer, "nova.%sdelete_server" % prefix, started, finished)
+
+    @staticmethod
+    def _get_changes_since_filter(servers):
+        """Return a filter to list only the given servers and newer ones.
+
+        Deleted servers are listed with "DELETED" status if changes-since
+        filter is used. The filter is based on update time of the servers
+        reported by Nova, so it does not depend on the local clock.
+
+        :param servers: servers fetched with details
+        :returns: search options for servers.list() or None if update time
+            of some servers is unknown
+        """
+        updated = [getattr(server, "updated", None) for server in servers]
+        if updated and all(isinstance(u, six.string_types) for u in updated):
+            return {"changes-since": min(updated)}
+        return None
+
+    def _add_servers_atomic_actions(self, timer, name, started, finished):
+        """Record time spent on each server as a child of the atomic action.
+
+        :param timer: atomic.ActionTimer of the whole operation
+        :param name: the name of atomic actions of separate servers
+        :param started: a dict of times when requests for servers were sent
+        :param finished: a dict of times when servers became ready
+        """
+        children = timer.atomic_action["children"]
+        for server_id, started_at in started.items():
+            if server_id in finished:
+                children.append({"name": name,
+                                 "children": [],
+                                 "started_at": started_at,
+                                 "finished_at": finished[server_id]})
 
     @atomic.action_timer("nova.create_server_group")
     def _create_server_group(self, **kwargs):
@@ -557,13 +645,13 @@ class NovaScenario(scenario.OpenStackScenario):
         """
         self.clients("nova").keypairs.delete(keypair_name)
 
-    @atomic.action_timer("nova.boot_servers")
     def _boot_servers(self, image_id, flavor_id, requests, instances_amount=1,
                       auto_assign_nic=False, **kwargs):
         """Boot multiple servers.
 
         Returns when all the servers are actually booted and are in the
-        "Active" state.
+        "Active" state. Boot requests are sent simultaneously and the time it
+        takes to boot each server is recorded as a separate atomic action.
 
         :param image_id: ID of the image to be used for server creation
         :param flavor_id: ID of the flavor to be used for server creation
@@ -579,28 +667,98 @@ class NovaScenario(scenario.OpenStackScenario):
             if nic:
                 kwargs["nics"] = nic
 
-        name_prefix = self.generate_random_name()
-        for i in range(requests):
-            self.clients("nova").servers.create("%s_%d" % (name_prefix, i),
-                                                image_id, flavor_id,
-                                                min_count=instances_amount,
-                                                max_count=instances_amount,
-                                                **kwargs)
-        # NOTE(msdubov): Nova python client returns only one server even when
-        #                min_count > 1, so we have to rediscover all the
-        #                created servers manually.
-        servers = [s for s in self.clients("nova").servers.list()
-                   if s.name.startswith(name_prefix)]
-        self.sleep_between(CONF.openstack.nova_server_boot_prepoll_delay)
-        servers = [utils.wait_for_status(
-            server,
-            ready_statuses=["ACTIVE"],
-            update_resource=utils.
-            get_from_manager(),
-            timeout=CONF.openstack.nova_server_boot_timeout,
-            check_interval=CONF.openstack.nova_server_boot_poll_interval
-        ) for server in servers]
-        return servers
+        timer = atomic.ActionTimer(self, "nova.boot_servers")
+        with timer:
+            name_prefix = self.generate_random_name()
+            requests_started = {}
+
+            def publish(queue):
+                for i in range(requests):
+                    queue.append(i)
+
+            def consume(cache, i):
+                nova = self._get_nova_client(cache)
+                requests_started[i] = time.time()
+                nova.servers.create(
+                    "%s_%d" % (name_prefix, i), image_id, flavor_id,
+                    min_count=instances_amount, max_count=instances_amount,
+                    **kwargs)
+
+            broker.run(
+                publish, consume,
+                consumers_count=CONF.openstack.nova_servers_requests_workers,
+                reraise=True)
+            # NOTE(msdubov): Nova python client returns only one server even
+            #                when min_count > 1, so we have to rediscover all
+            #                the created servers manually.
+            search_opts = {"name": "^%s_" % name_prefix}
+            servers = [s for s in self.clients("nova").servers.list(
+                       search_opts=search_opts, limit=-1)
+                       if s.name.startswith(name_prefix)]
+
+            # several instances of one request are named as
+            # "<name>-<number>", so the request is found by the name
+            started = {}
+            for server in servers:
+                request = server.name[len(name_prefix) + 1:].split("-")[0]
+                if request.isdigit() and int(request) in requests_started:
+                    started[server.id] = requests_started[int(request)]
+                else:
+                    started[server.id] = min(requests_started.values())
+            finished = {}
+
+            self.sleep_between(CONF.openstack.nova_server_boot_prepoll_delay)
+            try:
+                return self._wait_for_servers(
+                    servers, ready_statuses=["ACTIVE"],
+                    timeout=CONF.openstack.nova_server_boot_timeout,
+                    check_interval=(
+                        CONF.openstack.nova_server_boot_poll_interval),
+                    search_opts=search_opts,
+                    on_ready=lambda server_id, server: finished.setdefault(
+                        server_id, time.time()))
+            finally:
+                self._add_servers_atomic_actions(
+                    timer, "nova.boot_server", started, finished)
+
+    def _wait_for_servers(self, servers, ready_statuses,
+                          failure_statuses=("ERROR",), timeout=60,
+                          check_interval=1, check_deletion=False,
+                          search_opts=None, on_ready=None):
+        """Wait for several servers to become ready.
+
+        Unlike calling utils.wait_for_status for each server, servers are
+        refreshed with one list call per check which is shared with other
+        iterations waiting for servers of the same project (and with the
+        same search options).
+
+        :param servers: servers to wait for
+        :param ready_statuses: statuses of ready servers
+        :param failure_statuses: statuses of failed servers
+        :param timeout: time to wait for all servers (in seconds)
+        :param check_interval: interval between checks (in seconds)
+        :param check_deletion: whether to wait for deletion of servers
+        :param search_opts: filters of the list call, they have to match
+            all the servers
+        :param on_ready: a function called with an id and a refreshed server
+            as soon as the server is ready
+
+        :returns: refreshed servers in the same order
+        """
+        key = waiter.make_key("nova.servers", self._clients.credential)
+        if search_opts:
+            key += (tuple(sorted(search_opts.items())),)
+        return waiter.wait_for_statuses(
+            servers,
+            ready_statuses=ready_statuses,
+            failure_statuses=failure_statuses,
+            list_resources=lambda: self.clients("nova").servers.list(
+                detailed=True, search_opts=search_opts, limit=-1),
+            key=key,
+            timeout=timeout,
+            check_interval=check_interval,
+            check_deletion=check_deletion,
+            on_ready=on_ready)
 
     @atomic.action_timer("nova.associate_floating_ip")
     def _associate_floating_ip(self, server, address, fixed_address=None):
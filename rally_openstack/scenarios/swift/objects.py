@@ -13,8 +13,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import tempfile
-
 from rally.task import validation
 
 from rally_openstack import consts
@@ -33,21 +31,20 @@ from rally_openstack.scenarios.swift import utils
     platform="openstack")
 class CreateContainerAndObjectThenListObjects(utils.SwiftScenario):
 
-    def run(self, objects_per_container=1, object_size=1024, **kwargs):
+    def run(self, objects_per_container=1, object_size=1024,
+            random_content=False, **kwargs):
         """Create container and objects then list all objects.
 
         :param objects_per_container: int, number of objects to upload
         :param object_size: int, temporary local object size
+        :param random_content: bool, upload pseudo-random content instead of
+                               zeros
         :param kwargs: dict, optional parameters to create container
         """
-
-        with tempfile.TemporaryFile() as dummy_file:
-            # set dummy file to specified object size
-            dummy_file.truncate(object_size)
-            container_name = self._create_container(**kwargs)
-            for i in range(objects_per_container):
-                dummy_file.seek(0)
-                self._upload_object(container_name, dummy_file)
+        payload = utils.get_payload(object_size, random_content)
+        container_name = self._create_container(**kwargs)
+        for i in range(objects_per_container):
+            self._upload_payload(container_name, payload)
         self._list_objects(container_name)
 
 
@@ -59,24 +56,22 @@ class CreateContainerAndObjectThenListObjects(utils.SwiftScenario):
     platform="openstack")
 class CreateContainerAndObjectThenDeleteAll(utils.SwiftScenario):
 
-    def run(self, objects_per_container=1, object_size=1024, **kwargs):
+    def run(self, objects_per_container=1, object_size=1024,
+            random_content=False, **kwargs):
         """Create container and objects then delete everything created.
 
         :param objects_per_container: int, number of objects to upload
         :param object_size: int, temporary local object size
+        :param random_content: bool, upload pseudo-random content instead of
+                               zeros
         :param kwargs: dict, optional parameters to create container
         """
-        container_name = None
+        payload = utils.get_payload(object_size, random_content)
         objects_list = []
-        with tempfile.TemporaryFile() as dummy_file:
-            # set dummy file to specified object size
-            dummy_file.truncate(object_size)
-            container_name = self._create_container(**kwargs)
-            for i in range(objects_per_container):
-                dummy_file.seek(0)
-                object_name = self._upload_object(container_name,
-                                                  dummy_file)[1]
-                objects_list.append(object_name)
+        container_name = self._create_container(**kwargs)
+        for i in range(objects_per_container):
+            object_name = self._upload_payload(container_name, payload)[1]
+            objects_list.append(object_name)
 
         for object_name in objects_list:
             self._delete_object(container_name, object_name)
@@ -91,24 +86,22 @@ class CreateContainerAndObjectThenDeleteAll(utils.SwiftScenario):
     platform="openstack")
 class CreateContainerAndObjectThenDownloadObject(utils.SwiftScenario):
 
-    def run(self, objects_per_container=1, object_size=1024, **kwargs):
+    def run(self, objects_per_container=1, object_size=1024,
+            random_content=False, **kwargs):
         """Create container and objects then download all objects.
 
         :param objects_per_container: int, number of objects to upload
         :param object_size: int, temporary local object size
+        :param random_content: bool, upload pseudo-random content instead of
+                               zeros
         :param kwargs: dict, optional parameters to create container
         """
-        container_name = None
+        payload = utils.get_payload(object_size, random_content)
         objects_list = []
-        with tempfile.TemporaryFile() as dummy_file:
-            # set dummy file to specified object size
-            dummy_file.truncate(object_size)
-            container_name = self._create_container(**kwargs)
-            for i in range(objects_per_container):
-                dummy_file.seek(0)
-                object_name = self._upload_object(container_name,
-                                                  dummy_file)[1]
-                objects_list.append(object_name)
+        container_name = self._create_container(**kwargs)
+        for i in range(objects_per_container):
+            object_name = self._upload_payload(container_name, payload)[1]
+            objects_list.append(object_name)
 
         for object_name in objects_list:
             self._download_object(container_name, object_name)
@@ -13,11 +13,136 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import binascii
+import collections
+import itertools
+import mmap
+import random
+import threading
+
 from rally.task import atomic
 
 from rally_openstack import scenario
 
 
+# the number of payloads of different sizes kept in memory
+PAYLOADS_CACHE_SIZE = 4
+# random content is generated by blocks of this size, in bytes
+RANDOM_BLOCK_SIZE = 1024 * 1024
+
+_payloads = collections.OrderedDict()
+_payloads_lock = threading.Lock()
+
+
+def _allocate(size):
+    """Return a zero-filled writable buffer of the given size."""
+    try:
+        # pages of anonymous mapping are not allocated until written
+        return memoryview(mmap.mmap(-1, size))
+    except (TypeError, ValueError, EnvironmentError):
+        # empty mappings are not allowed and py27 mmap objects do not
+        # support memoryview
+        return memoryview(bytearray(size))
+
+
+def _fill_random(view, seed):
+    """Fill the buffer with deterministic pseudo-random bytes."""
+    rnd = random.Random(seed)
+    for start in range(0, len(view), RANDOM_BLOCK_SIZE):
+        size = min(RANDOM_BLOCK_SIZE, len(view) - start)
+        view[start:start + size] = binascii.unhexlify(
+            "%0*x" % (size * 2, rnd.getrandbits(size * 8)))
+
+
+class PayloadReader(object):
+    """File-like reader of an object payload.
+
+    Every upload gets its own reader, so simultaneous uploads do not share
+    a position, and read() returns slices of the shared buffer instead of
+    copies.
+    """
+
+    def __init__(self, view):
+        self._view = view
+        self._pos = 0
+
+    def __len__(self):
+        return len(self._view)
+
+    def read(self, size=-1):
+        end = len(self._view)
+        if size is not None and size >= 0:
+            end = min(self._pos + size, end)
+        chunk = self._view[self._pos:end]
+        self._pos = end
+        return chunk
+
+    def seek(self, offset, whence=0):
+        if whence == 1:
+            offset += self._pos
+        elif whence == 2:
+            offset += len(self._view)
+        self._pos = max(0, min(offset, len(self._view)))
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+
+class ObjectPayload(object):
+    """Content of uploaded objects which is allocated once.
+
+    Zeros are served from an anonymous memory mapping, so they do not take
+    memory at all. Pseudo-random content is generated from a fixed seed and
+    every next reader starts at the next offset of a slightly bigger buffer,
+    so objects differ from each other for deduplication and compression.
+    """
+
+    # the number of different offsets of random content
+    SHIFTS = 4096
+
+    def __init__(self, size, random_content=False, seed=0):
+        """Allocate the payload.
+
+        :param size: int, size of objects in bytes
+        :param random_content: bool, whether to use pseudo-random content
+                               instead of zeros
+        :param seed: seed of pseudo-random content
+        """
+        self.size = size
+        self.random_content = random_content
+        if random_content:
+            self._buffer = _allocate(size + self.SHIFTS - 1)
+            _fill_random(self._buffer, seed)
+        else:
+            self._buffer = _allocate(size)
+        self._readers = itertools.count()
+
+    def reader(self):
+        """Return a new reader of the payload."""
+        offset = 0
+        if self.random_content:
+            offset = next(self._readers) % self.SHIFTS
+        return PayloadReader(self._buffer[offset:offset + self.size])
+
+
+def get_payload(size, random_content=False):
+    """Return a payload shared by all uploads of objects of the same size.
+
+    :param size: int, size of objects in bytes
+    :param random_content: bool, whether to use pseudo-random content
+    """
+    key = (size, random_content)
+    with _payloads_lock:
+        payload = _payloads.pop(key, None)
+        if payload is None:
+            payload = ObjectPayload(size, random_content=random_content)
+        _payloads[key] = payload
+        while len(_payloads) > PAYLOADS_CACHE_SIZE:
+            _payloads.popitem(last=False)
+    return payload
+
+
 class SwiftScenario(scenario.OpenStackScenario):
     """Base class for Swift scenarios with basic atomic actions."""
 
@@ -75,6 +200,18 @@ class SwiftScenario(scenario.OpenStackScenario):
                                                    full_listing=full_listing,
                                                    **kwargs)
 
+    def _upload_payload(self, container_name, payload, **kwargs):
+        """Upload a new object with the given payload.
+
+        :param container_name: str, name of the container to upload object to
+        :param payload: ObjectPayload instance
+        :param kwargs: dict, other optional parameters to put_object
+
+        :returns: tuple, (etag and object name)
+        """
+        return self._upload_object(container_name, payload.reader(),
+                                   content_length=payload.size, **kwargs)
+
     @atomic.action_timer("swift.upload_object")
     def _upload_object(self, container_name, content, **kwargs):
         """Upload content to a given container.
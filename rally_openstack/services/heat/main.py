@@ -14,7 +14,8 @@
 from rally.common import cfg
 from rally.common import utils as common_utils
 from rally.task import atomic
-from rally.task import utils
+
+from rally_openstack import waiter
 
 CONF = cfg.CONF
 
@@ -48,14 +49,19 @@ class Stack(common_utils.RandomNameGeneratorMixin):
             self.files[name] = open(path).read()
 
     def _wait(self, ready_statuses, failure_statuses):
-        self.stack = utils.wait_for_status(
+        heat = self.scenario.clients("heat")
+        waiter.wait_for_status(
             self.stack,
             check_interval=CONF.openstack.heat_stack_create_poll_interval,
             timeout=CONF.openstack.heat_stack_create_timeout,
             ready_statuses=ready_statuses,
             failure_statuses=failure_statuses,
-            update_resource=utils.get_from_manager(),
+            list_resources=heat.stacks.list,
+            key=waiter.make_key("heat.stacks",
+                                self.scenario._clients.credential)
         )
+        # listed stacks do not include outputs
+        self.stack = heat.stacks.get(self.stack_id)
 
     def create(self):
         with atomic.ActionTimer(self.scenario, "heat.create"):
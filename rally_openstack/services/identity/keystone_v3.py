@@ -27,6 +27,10 @@ LOG = logging.getLogger(__name__)
 @service.service("keystone", service_type="identity", version="3")
 class KeystoneV3Service(service.Service, keystone_common.KeystoneMixin):
 
+    def __init__(self, *args, **kwargs):
+        super(KeystoneV3Service, self).__init__(*args, **kwargs)
+        self._lookup_cache = {}
+
     def _get_domain_id(self, domain_name_or_id):
         from keystoneclient import exceptions as kc_exceptions
 
@@ -97,7 +101,8 @@ class KeystoneV3Service(service.Service, keystone_common.KeystoneMixin):
         :param enabled: whether the user is enabled.
         :param default_role: user's default role
         """
-        domain_id = self._get_domain_id(domain_name)
+        domain_id = self._get_cached("domain", domain_name,
+                                     self._get_domain_id)
         username = username or self.generate_random_name()
         user = self._clients.keystone("3").users.create(
             name=username, password=password, default_project=project_id,
@@ -105,24 +110,42 @@ class KeystoneV3Service(service.Service, keystone_common.KeystoneMixin):
 
         if project_id:
             # we can't setup role without project_id
-            roles = self.list_roles()
-            for role in roles:
-                if default_role == role.name.lower():
-                    self.add_role(role_id=role.id,
-                                  user_id=user.id,
-                                  project_id=project_id)
-                    return user
-            for role in roles:
-                if default_role == role.name.lower().strip("_"):
-                    self.add_role(role_id=role.id,
-                                  user_id=user.id,
-                                  project_id=project_id)
-                    return user
+            role = self._get_cached("role", default_role, self._find_role)
+            if role is not None:
+                self.add_role(role_id=role.id,
+                              user_id=user.id,
+                              project_id=project_id)
+                return user
 
             LOG.warning("Unable to set %s role to created user." %
                         default_role)
         return user
 
+    def _get_cached(self, kind, name, find):
+        """Returns a domain id or a role found by its name.
+
+        Users are created in a few domains with the same default role, so
+        the lookups are done once per service instance instead of doing them
+        for every created user. Missing objects are not cached.
+        """
+        key = (kind, name)
+        if key not in self._lookup_cache:
+            found = find(name)
+            if found is None:
+                return None
+            self._lookup_cache[key] = found
+        return self._lookup_cache[key]
+
+    def _find_role(self, role_name):
+        roles = self.list_roles()
+        for role in roles:
+            if role_name == role.name.lower():
+                return role
+        for role in roles:
+            if role_name == role.name.lower().strip("_"):
+                return role
+        return None
+
     @atomic.action_timer("keystone_v3.create_users")
     def create_users(self, project_id, number_of_users, user_create_args=None):
         """Create specified amount of users.
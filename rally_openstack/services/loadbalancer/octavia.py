@@ -19,6 +19,8 @@ from rally.task import atomic
 from rally.task import service
 from rally.task import utils
 
+from rally_openstack import waiter
+
 CONF = cfg.CONF
 
 LOG = logging.getLogger(__name__)
@@ -249,7 +251,8 @@ class Octavia(service.Service):
             update_resource=self.update_pool_resource,
             timeout=CONF.openstack.octavia_create_loadbalancer_timeout,
             check_interval=(
-                CONF.openstack.octavia_create_loadbalancer_poll_interval)
+                CONF.openstack.octavia_create_loadbalancer_poll_interval),
+            get_resource=lambda lb: self.load_balancer_show(lb["id"])
         )
         return pool
 
@@ -618,12 +621,17 @@ class Octavia(service.Service):
 
     @atomic.action_timer("octavia.wait_for_loadbalancers")
     def wait_for_loadbalancer_prov_status(self, lb, prov_status="ACTIVE"):
-        return utils.wait_for_status(
+        octavia = self._clients.octavia()
+        return waiter.wait_for_status(
             lb,
             ready_statuses=[prov_status],
             status_attr="provisioning_status",
-            update_resource=lambda lb: self.load_balancer_show(lb["id"]),
+            list_resources=lambda: octavia.load_balancer_list()[
+                "loadbalancers"],
+            key=waiter.make_key("octavia.loadbalancers",
+                                self._clients.credential),
             timeout=CONF.openstack.octavia_create_loadbalancer_timeout,
             check_interval=(
-                CONF.openstack.octavia_create_loadbalancer_poll_interval)
+                CONF.openstack.octavia_create_loadbalancer_poll_interval),
+            get_resource=lambda lb: self.load_balancer_show(lb["id"])
         )
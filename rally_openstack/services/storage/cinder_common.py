@@ -20,6 +20,7 @@ from rally.task import utils as bench_utils
 
 from rally_openstack.services.image import image
 from rally_openstack.services.storage import block
+from rally_openstack import waiter
 
 
 CONF = block.CONF
@@ -49,13 +50,23 @@ class CinderMixin(object):
             raise exceptions.GetResourceFailure(resource=resource, err=e)
         return res
 
-    def _wait_available_volume(self, volume):
-        return bench_utils.wait_for_status(
-            volume,
+    def _wait_available_volume(self, resource, resources="volumes"):
+        """Wait for a volume, a snapshot or a backup to become available.
+
+        :param resource: the resource to wait for
+        :param resources: the name of the client manager of the resource,
+            i.e. "volumes", "volume_snapshots" or "backups"
+        """
+        return waiter.wait_for_status(
+            resource,
             ready_statuses=["available"],
-            update_resource=self._update_resource,
+            list_resources=lambda: getattr(
+                self._get_client(), resources).list(detailed=True),
+            key=waiter.make_key("cinder.%s" % resources,
+                                self._clients.credential),
             timeout=CONF.openstack.cinder_volume_create_timeout,
-            check_interval=CONF.openstack.cinder_volume_create_poll_interval
+            check_interval=CONF.openstack.cinder_volume_create_poll_interval,
+            get_resource=self._update_resource
         )
 
     def get_volume(self, volume_id):
@@ -129,7 +129,8 @@ class CinderV1Service(service.Service, cinder_common.CinderMixin):
                                                               **kwargs)
         rutils.interruptable_sleep(
             CONF.openstack.cinder_volume_create_prepoll_delay)
-        snapshot = self._wait_available_volume(snapshot)
+        snapshot = self._wait_available_volume(
+            snapshot, "volume_snapshots")
         return snapshot
 
     @atomic.action_timer("cinder_v1.create_backup")
@@ -146,7 +147,7 @@ class CinderV1Service(service.Service, cinder_common.CinderMixin):
                   "description": description,
                   "container": container}
         backup = self._get_client().backups.create(volume_id, **kwargs)
-        return self._wait_available_volume(backup)
+        return self._wait_available_volume(backup, "backups")
 
     @atomic.action_timer("cinder_v1.create_volume_type")
     def create_volume_type(self, name=None):
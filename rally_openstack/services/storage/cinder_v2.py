@@ -135,7 +135,8 @@ class CinderV2Service(service.Service, cinder_common.CinderMixin):
                                                               **kwargs)
         rutils.interruptable_sleep(
             CONF.openstack.cinder_volume_create_prepoll_delay)
-        snapshot = self._wait_available_volume(snapshot)
+        snapshot = self._wait_available_volume(
+            snapshot, "volume_snapshots")
         return snapshot
 
     @atomic.action_timer("cinder_v2.create_backup")
@@ -161,7 +162,7 @@ class CinderV2Service(service.Service, cinder_common.CinderMixin):
                   "force": force,
                   "snapshot_id": snapshot_id}
         backup = self._get_client().backups.create(volume_id, **kwargs)
-        return self._wait_available_volume(backup)
+        return self._wait_available_volume(backup, "backups")
 
     @atomic.action_timer("cinder_v2.create_volume_type")
     def create_volume_type(self, name=None, description=None, is_public=True):
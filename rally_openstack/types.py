@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import bisect
 import copy
 import operator
 import re
@@ -33,6 +34,120 @@ LOG = logging.getLogger(__name__)
 
 configure = plugin.configure
 
+# The key of the validation context (and of the global cache of resource
+# types) which holds results of lookups of cloud resources
+LOOKUP_CACHE = "openstack_lookup_cache"
+
+
+def get_lookup_cache(context):
+    """Return the cache of resource lookups bound to the validation context.
+
+    A single validation context is used for all workloads of the task, so
+    validators and resource types which use this cache list images, flavors,
+    etc only once per project of the cloud.
+    """
+    return context.setdefault(LOOKUP_CACHE, {})
+
+
+def cached_lookup(cache, credential, name, method, *args, **kwargs):
+    """Call a lookup method once per user and project of the credential.
+
+    :param cache: a dict to store results in (see `get_lookup_cache`)
+    :param credential: a credential the method is called with
+    :param name: a name of the lookup, e.g. "images" or "flavor"
+    :param method: a callable which performs the lookup
+    :param args: positional arguments of the method
+    :param kwargs: keyword arguments of the method
+    :returns: the result of the method
+    """
+    key = (credential.auth_url, credential.region_name,
+           credential.username, credential.user_domain_name,
+           credential.tenant_name, credential.project_domain_name,
+           name, args, frozenset(kwargs.items()))
+    if key not in cache:
+        cache[key] = method(*args, **kwargs)
+    return cache[key]
+
+
+# characters which mean themselves in a regexp
+_LITERAL_CHARS = frozenset("-_ ,:;=@%&~/'\"!<>")
+
+
+def _literal_prefix(pattern):
+    """Return the prefix which all names matching the regexp start with.
+
+    Only patterns anchored at the beginning of a string are supported, an
+    empty string is returned for the rest of them.
+    """
+    if not pattern.startswith("^") or "|" in pattern or "(?" in pattern:
+        return ""
+    prefix = []
+    pos = 1
+    while pos < len(pattern):
+        char = pattern[pos]
+        if char == "\\":
+            if pos + 1 == len(pattern) or pattern[pos + 1].isalnum():
+                # a special sequence like \d or \w
+                break
+            char = pattern[pos + 1]
+            pos += 2
+        elif char.isalnum() or char in _LITERAL_CHARS:
+            pos += 1
+        else:
+            break
+        prefix.append(char)
+    if pos < len(pattern) and pattern[pos] in "?*{":
+        # the last character is optional
+        prefix = prefix[:-1]
+    return "".join(prefix)
+
+
+class ResourceIndex(object):
+    """Resources indexed by their names.
+
+    Exact names are looked up in a dict and regexps anchored at the
+    beginning of names are checked only against names with the same
+    literal prefix, which are found with binary search.
+    """
+
+    def __init__(self, resources):
+        self.resources = list(resources)
+        self._by_name = {}
+        for resource in self.resources:
+            self._by_name.setdefault(resource.name, []).append(resource)
+        self._sorted_names = sorted((resource.name or "", pos)
+                                    for pos, resource
+                                    in enumerate(self.resources))
+
+    def __iter__(self):
+        return iter(self.resources)
+
+    def __len__(self):
+        return len(self.resources)
+
+    def get_by_name(self, name):
+        """Return resources with the exact name."""
+        return self._by_name.get(name, [])
+
+    def search(self, pattern):
+        """Return resources which names match the compiled regexp.
+
+        Resources are returned in the original order.
+        """
+        prefix = _literal_prefix(pattern.pattern)
+        if prefix:
+            positions = []
+            i = bisect.bisect_left(self._sorted_names, (prefix,))
+            while (i < len(self._sorted_names)
+                   and self._sorted_names[i][0].startswith(prefix)):
+                positions.append(self._sorted_names[i][1])
+                i += 1
+            positions.sort()
+        else:
+            positions = range(len(self.resources))
+        return [self.resources[pos] for pos in positions
+                if pattern.search(self.resources[pos].name or "")]
+
 
 class OpenStackResourceType(types.ResourceType):
     """A base class for OpenStack ResourceTypes plugins with help-methods"""
@@ -48,12 +163,35 @@ class OpenStackResourceType(types.ResourceType):
             self._cache = self._global_cache[self.get_name()]
 
         self._clients = None
+        self._credential = None
         if self._context.get("admin"):
-            self._clients = osclients.Clients(
-                self._context["admin"]["credential"])
+            self._credential = self._context["admin"]["credential"]
         elif self._context.get("users"):
-            self._clients = osclients.Clients(
-                self._context["users"][0]["credential"])
+            self._credential = self._context["users"][0]["credential"]
+        if self._credential:
+            self._clients = osclients.Clients(self._credential)
+
+    def _list_resources(self, name, method, **kwargs):
+        """List resources with caching results in the global cache.
+
+        The global cache may be shared by the whole task validation (see
+        `get_lookup_cache`), so the cloud is asked once per project.
+        """
+        lookup_cache = self._global_cache.setdefault(LOOKUP_CACHE, {})
+        return cached_lookup(lookup_cache, self._credential, name, method,
+                             **kwargs)
+
+    def _index_resources(self, name, method, **kwargs):
+        """The same as `_list_resources`, but returns ResourceIndex.
+
+        The index is cached as well, so it is built once per listing.
+        """
+        lookup_cache = self._global_cache.setdefault(LOOKUP_CACHE, {})
+        return cached_lookup(
+            lookup_cache, self._credential, "%s_index" % name,
+            lambda **kw: ResourceIndex(
+                self._list_resources(name, method, **kw)),
+            **kwargs)
 
     def _find_resource(self, resource_spec, resources):
         """Return the resource whose name matches the pattern.
@@ -72,16 +210,19 @@ class OpenStackResourceType(types.ResourceType):
             * regexp - a regexp of resource name to match. If several resources
               match and value of *accurate* key is False (default behaviour),
               the latest resource will be returned.
-        :param resources: iterable containing all resources
+        :param resources: iterable containing all resources or
+            ResourceIndex of them
         :raises InvalidScenarioArgument: if the pattern does
             not match anything.
 
         :returns: resource object mapped to `name` or `regex`
         """
+        if not isinstance(resources, ResourceIndex):
+            resources = ResourceIndex(resources)
+
         if "name" in resource_spec:
             # In a case of pattern string exactly matches resource name
-            matching_exact = [resource for resource in resources
-                              if resource.name == resource_spec["name"]]
+            matching_exact = resources.get_by_name(resource_spec["name"])
             if len(matching_exact) == 1:
                 return matching_exact[0]
             elif len(matching_exact) > 1:
@@ -110,8 +251,7 @@ class OpenStackResourceType(types.ResourceType):
                     "resource_spec": resource_spec})
 
         pattern = re.compile(patternstr)
-        matching = [resource for resource in resources
-                    if re.search(pattern, resource.name or "")]
+        matching = resources.search(pattern)
         if not matching:
             raise exceptions.InvalidScenarioArgument(
                 "%(typename)s with pattern '%(pattern)s' not found" % {
@@ -166,7 +306,8 @@ class Flavor(DeprecatedBehaviourMixin, OpenStackResourceType):
             novaclient = self._clients.nova()
             resource_id = types._id_from_name(
                 resource_config=resource_spec,
-                resources=novaclient.flavors.list(),
+                resources=self._list_resources("flavors",
+                                               novaclient.flavors.list),
                 typename="flavor")
         return resource_id
 
@@ -182,7 +323,8 @@ class EC2Flavor(DeprecatedBehaviourMixin, OpenStackResourceType):
             novaclient = self._clients.nova()
             resource_name = types._name_from_id(
                 resource_config=resource_spec,
-                resources=novaclient.flavors.list(),
+                resources=self._list_resources("flavors",
+                                               novaclient.flavors.list),
                 typename="flavor")
         return resource_name
 
@@ -196,15 +338,15 @@ class GlanceImage(DeprecatedBehaviourMixin, OpenStackResourceType):
         list_kwargs = resource_spec.get("list_kwargs", {})
 
         if not resource_id:
-            cache_id = hash(frozenset(list_kwargs.items()))
-            if cache_id not in self._cache:
-                glance = image.Image(self._clients)
-                self._cache[cache_id] = glance.list_images(**list_kwargs)
-            images = self._cache[cache_id]
+            images = self._index_resources("images", self._list_images,
+                                           **list_kwargs)
             resource = self._find_resource(resource_spec, images)
             return resource.id
         return resource_id
 
+    def _list_images(self, **kwargs):
+        return image.Image(self._clients).list_images(**kwargs)
+
 
 @plugin.configure(name="glance_image_args")
 class GlanceImageArguments(DeprecatedBehaviourMixin, OpenStackResourceType):
@@ -254,7 +396,8 @@ class VolumeType(DeprecatedBehaviourMixin, OpenStackResourceType):
             cinder = block.BlockStorage(self._clients)
             resource_id = types._id_from_name(
                 resource_config=resource_spec,
-                resources=cinder.list_types(),
+                resources=self._list_resources("volume_types",
+                                               cinder.list_types),
                 typename="volume_type")
         return resource_id
 
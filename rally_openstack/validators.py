@@ -30,6 +30,7 @@ import rally_openstack
 from rally_openstack import consts
 from rally_openstack.contexts.keystone import roles
 from rally_openstack.contexts.nova import flavors as flavors_ctx
+from rally_openstack import osclients
 from rally_openstack import types as openstack_types
 
 
@@ -137,12 +138,17 @@ class ImageExistsValidator(validation.Validator):
             if image_ctx_name == image_args.get("name") or (
                     "regex" in image_args and match):
                 return
+        cache = openstack_types.get_lookup_cache(context)
         try:
             for user in context["users"]:
+                credential = user["credential"]
                 image_processor = openstack_types.GlanceImage(
-                    context={"admin": {"credential": user["credential"]}})
+                    context={"admin": {"credential": credential}},
+                    cache=cache)
                 image_id = image_processor.pre_process(image_args, config={})
-                user["credential"].clients().glance().images.get(image_id)
+                openstack_types.cached_lookup(
+                    cache, credential, "image",
+                    credential.clients().glance().images.get, image_id)
         except (glance_exc.HTTPNotFound, exceptions.InvalidScenarioArgument):
             self.fail("Image '%s' not found" % image_args)
 
@@ -210,8 +216,7 @@ class RequiredNeutronExtensionsValidator(validation.Validator):
     @with_roles_ctx()
     def validate(self, context, config, plugin_cls, plugin_cfg):
         clients = context["users"][0]["credential"].clients()
-        extensions = clients.neutron().list_extensions()["extensions"]
-        aliases = [x["alias"] for x in extensions]
+        aliases = osclients.NEUTRON_EXTENSIONS.get_aliases(clients.neutron())
         for extension in self.req_ext:
             if extension not in aliases:
                 self.fail("Neutron extension %s is not configured" % extension)
@@ -243,18 +248,22 @@ class FlavorExistsValidator(validation.Validator):
         flavor.id = "<context flavor: %s>" % flavor.name
         return flavor
 
-    def _get_validated_flavor(self, config, clients, param_name):
+    def _get_validated_flavor(self, config, clients, param_name, cache=None):
 
         from novaclient import exceptions as nova_exc
 
         flavor_value = config.get("args", {}).get(param_name)
         if not flavor_value:
             self.fail("Parameter %s is not specified." % param_name)
+        cache = cache if cache is not None else {}
         try:
             flavor_processor = openstack_types.Flavor(
-                context={"admin": {"credential": clients.credential}})
+                context={"admin": {"credential": clients.credential}},
+                cache=cache)
             flavor_id = flavor_processor.pre_process(flavor_value, config={})
-            flavor = clients.nova().flavors.get(flavor=flavor_id)
+            flavor = openstack_types.cached_lookup(
+                cache, clients.credential, "flavor",
+                clients.nova().flavors.get, flavor=flavor_id)
             return flavor
         except (nova_exc.NotFound, exceptions.InvalidScenarioArgument):
             try:
@@ -268,9 +277,9 @@ class FlavorExistsValidator(validation.Validator):
         # flavors do not depend on user or tenant, so checking for one user
         # should be enough
         clients = context["users"][0]["credential"].clients()
-        self._get_validated_flavor(config=config,
-                                   clients=clients,
-                                   param_name=self.param_name)
+        self._get_validated_flavor(
+            config=config, clients=clients, param_name=self.param_name,
+            cache=openstack_types.get_lookup_cache(context))
 
 
 @validation.add("required_platform", platform="openstack", users=True)
@@ -297,7 +306,7 @@ class ImageValidOnFlavorValidator(FlavorExistsValidator):
         self.fail_on_404_image = fail_on_404_image
         self.validate_disk = validate_disk
 
-    def _get_validated_image(self, config, clients, param_name):
+    def _get_validated_image(self, config, clients, param_name, cache=None):
 
         from glanceclient import exc as glance_exc
 
@@ -322,11 +331,15 @@ class ImageValidOnFlavorValidator(FlavorExistsValidator):
                     "min_disk": image_context.get("min_disk", 0)
                 }
                 return image
+        cache = cache if cache is not None else {}
         try:
             image_processor = openstack_types.GlanceImage(
-                context={"admin": {"credential": clients.credential}})
+                context={"admin": {"credential": clients.credential}},
+                cache=cache)
             image_id = image_processor.pre_process(image_args, config={})
-            image = clients.glance().images.get(image_id)
+            image = openstack_types.cached_lookup(
+                cache, clients.credential, "image",
+                clients.glance().images.get, image_id)
             if hasattr(image, "to_dict"):
                 # NOTE(stpierre): Glance v1 images are objects that can be
                 # converted to dicts; Glance v2 images are already
@@ -345,17 +358,19 @@ class ImageValidOnFlavorValidator(FlavorExistsValidator):
     @with_roles_ctx()
     def validate(self, context, config, plugin_cls, plugin_cfg):
 
+        cache = openstack_types.get_lookup_cache(context)
         flavor = None
         for user in context["users"]:
             clients = user["credential"].clients()
 
             if not flavor:
                 flavor = self._get_validated_flavor(
-                    config, clients, self.param_name)
+                    config, clients, self.param_name, cache=cache)
 
             try:
                 image = self._get_validated_image(config, clients,
-                                                  self.image_name)
+                                                  self.image_name,
+                                                  cache=cache)
             except validation.ValidationError:
                 if not self.fail_on_404_image:
                     return
@@ -0,0 +1,250 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Waiting for statuses of resources with shared list calls.
+
+``rally.task.utils.wait_for_status`` fetches every resource separately each
+check interval, so simultaneous iterations of a workload issue as many GET
+requests as there are resources in progress. Here, all waits with the same
+key (i.e. servers of the same project) are served by one list call per check
+interval: the first waiter which needs fresh data lists resources and the
+rest of the waiters reuse the result.
+"""
+
+import collections
+import threading
+import time
+
+from rally.common import logging
+from rally import exceptions
+from rally.task import utils
+
+
+LOG = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_groups = {}
+
+
+def make_key(kind, credential):
+    """Return a key of waits for resources of the same project.
+
+    :param kind: a kind of resources, e.g. "nova.servers"
+    :param credential: a credential the resources are listed with
+    """
+    return (kind, credential.auth_url, credential.region_name,
+            credential.tenant_name)
+
+
+def _get_id(resource, id_attr):
+    if isinstance(resource, dict):
+        return resource[id_attr]
+    return getattr(resource, id_attr)
+
+
+class _Group(object):
+    """Waits which share list calls."""
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.waiters = 0
+        # the number of started list calls, it is used as an id of the call
+        self.polls_started = 0
+        self.polling = False
+        # the results of the latest finished list call
+        self.poll_id = 0
+        self.polled_at = None
+        self.resources = {}
+        self.error = None
+
+    def next_poll_id(self):
+        """Return the id of the next list call."""
+        with self.cond:
+            return self.polls_started + 1
+
+    def get_resources(self, min_poll_id, list_resources, id_attr,
+                      check_interval, deadline):
+        """Return resources listed by a call with id >= min_poll_id.
+
+        The resources are listed by the current thread if there is no list
+        call in progress and check_interval has passed since the last one.
+
+        :returns: a tuple with the id of the list call and a dict of
+            resources by ids or None if the deadline is reached
+        """
+        with self.cond:
+            while self.poll_id < min_poll_id:
+                now = time.time()
+                if now >= deadline:
+                    return None
+                if not self.polling:
+                    next_poll = (self.polled_at or 0) + check_interval
+                    if now >= next_poll:
+                        break
+                    wait = next_poll - now
+                else:
+                    wait = check_interval
+                self.cond.wait(min(wait, deadline - now))
+            else:
+                if self.error is not None:
+                    raise self.error
+                return self.poll_id, self.resources
+            self.polling = True
+            self.polls_started += 1
+            poll_id = self.polls_started
+
+        resources = {}
+        error = None
+        try:
+            for resource in list_resources():
+                resources[_get_id(resource, id_attr)] = resource
+        except Exception as e:
+            error = e
+        finally:
+            with self.cond:
+                self.polling = False
+                self.poll_id = poll_id
+                self.polled_at = time.time()
+                self.resources = resources
+                self.error = error
+                self.cond.notify_all()
+        if error is not None:
+            raise error
+        return poll_id, resources
+
+
+def _join(key):
+    with _lock:
+        if key not in _groups:
+            _groups[key] = _Group()
+        group = _groups[key]
+        group.waiters += 1
+        return group
+
+
+def _leave(key, group):
+    with _lock:
+        group.waiters -= 1
+        if not group.waiters:
+            _groups.pop(key, None)
+
+
+def wait_for_statuses(resources, ready_statuses, list_resources, key,
+                      failure_statuses=("error",), status_attr="status",
+                      timeout=60, check_interval=1, check_deletion=False,
+                      id_attr="id", on_ready=None, get_resource=None):
+    """Wait for resources to reach one of ready statuses.
+
+    :param resources: resources (objects or dicts) to wait for
+    :param ready_statuses: statuses of ready resources
+    :param list_resources: a function without arguments which lists
+        resources including the awaited ones
+    :param key: a hashable object which identifies the listing. Waits with
+        the same key share list calls, so list_resources of all of them
+        should return the same resources (see `make_key`)
+    :param failure_statuses: statuses of failed resources
+    :param status_attr: the name of the status attribute of resources
+    :param timeout: time to wait for all resources (in seconds)
+    :param check_interval: interval between list calls (in seconds)
+    :param check_deletion: whether resources which are missing in the list
+        are ready (the case of waiting for deletion)
+    :param id_attr: the name of the id attribute of resources
+    :param on_ready: a function which is called with an id and a refreshed
+        resource (None in case of deleted one) as soon as the resource is
+        found ready
+    :param get_resource: a function which fetches one resource and raises
+        GetResourceNotFound if it does not exist. It is called for awaited
+        resources which are missing in the list, i.e. if list_resources
+        returns only the first page of resources
+
+    :returns: refreshed resources in the original order (None in case of
+        deleted ones)
+    """
+    ready_statuses = set(s.upper() for s in ready_statuses)
+    failure_statuses = set(s.upper() for s in failure_statuses or [])
+    pending = collections.OrderedDict(
+        (_get_id(resource, id_attr), resource) for resource in resources)
+    ready = {}
+
+    start = time.time()
+    group_key = (key, id_attr)
+    group = _join(group_key)
+    try:
+        # resources could be created right now, so only list calls which
+        # are started after this moment are taken into account
+        min_poll_id = group.next_poll_id()
+        while pending:
+            result = group.get_resources(
+                min_poll_id, list_resources, id_attr=id_attr,
+                check_interval=check_interval, deadline=start + timeout)
+            if result is not None:
+                poll_id, current = result
+                for resource_id, resource in list(pending.items()):
+                    if resource_id in current:
+                        resource = current[resource_id]
+                    elif get_resource:
+                        try:
+                            resource = get_resource(resource)
+                        except exceptions.GetResourceNotFound:
+                            resource = None
+                    else:
+                        resource = None
+                    if resource is None:
+                        if check_deletion:
+                            ready[resource_id] = None
+                            del pending[resource_id]
+                            if on_ready:
+                                on_ready(resource_id, None)
+                            continue
+                        raise exceptions.GetResourceNotFound(
+                            resource=pending[resource_id])
+                    status = utils.get_status(resource, status_attr)
+                    if status in ready_statuses:
+                        ready[resource_id] = resource
+                        del pending[resource_id]
+                        if on_ready:
+                            on_ready(resource_id, resource)
+                        continue
+                    pending[resource_id] = resource
+                    if status in failure_statuses:
+                        raise exceptions.GetResourceErrorStatus(
+                            resource=resource, status=status,
+                            fault="Status in failure list %s"
+                                  % str(failure_statuses))
+                if not pending:
+                    break
+                min_poll_id = poll_id + 1
+
+            if result is None or time.time() - start > timeout:
+                resource_id, resource = next(iter(pending.items()))
+                raise exceptions.TimeoutException(
+                    desired_status="('%s')" % "', '".join(ready_statuses),
+                    resource_name=getattr(resource, "name", repr(resource)),
+                    resource_type=resource.__class__.__name__,
+                    resource_id=resource_id,
+                    resource_status=utils.get_status(resource, status_attr),
+                    timeout=timeout)
+    finally:
+        _leave(group_key, group)
+
+    return [ready[_get_id(resource, id_attr)] for resource in resources]
+
+
+def wait_for_status(resource, ready_statuses, list_resources, key, **kwargs):
+    """Wait for a resource to reach one of ready statuses.
+
+    It is the same as `wait_for_statuses`, but for one resource.
+    """
+    return wait_for_statuses([resource], ready_statuses, list_resources, key,
+                             **kwargs)[0]
@@ -25,6 +25,7 @@ from rally.common import utils
 from rally import exceptions
 
 from rally_openstack import consts
+from rally_openstack import osclients
 
 
 LOG = logging.getLogger(__name__)
@@ -126,6 +127,10 @@ class NeutronWrapper(NetworkWrapper):
     LB_METHOD = "ROUND_ROBIN"
     LB_PROTOCOL = "HTTP"
 
+    def __init__(self, *args, **kwargs):
+        super(NeutronWrapper, self).__init__(*args, **kwargs)
+        self._bulk_supported = True
+
     @property
     def external_networks(self):
         return self.client.list_networks(**{
@@ -137,8 +142,8 @@ class NeutronWrapper(NetworkWrapper):
 
         Without this extension, we can't pass the enable_snat parameter.
         """
-        return any(e["alias"] == "ext-gw-mode"
-                   for e in self.client.list_extensions()["extensions"])
+        return "ext-gw-mode" in osclients.NEUTRON_EXTENSIONS.get_aliases(
+            self.client)
 
     def get_network(self, net_id=None, name=None):
         net = None
@@ -237,29 +242,29 @@ class NeutronWrapper(NetworkWrapper):
 
         dualstack = kwargs.get("dualstack", False)
 
-        subnets = []
+        subnets_args = []
         subnets_num = kwargs.get("subnets_num", 0)
         ip_versions = itertools.cycle(
             [self.SUBNET_IP_VERSION, self.SUBNET_IPV6_VERSION]
             if dualstack else [self.SUBNET_IP_VERSION])
         for i in range(subnets_num):
             ip_version = next(ip_versions)
-            subnet_args = {
-                "subnet": {
-                    "tenant_id": tenant_id,
-                    "network_id": network["id"],
-                    "name": self.owner.generate_random_name(),
-                    "ip_version": ip_version,
-                    "cidr": self._generate_cidr(ip_version),
-                    "enable_dhcp": True,
-                    "dns_nameservers": (
-                        kwargs.get("dns_nameservers", ["8.8.8.8", "8.8.4.4"])
-                        if ip_version == 4
-                        else kwargs.get("dns_nameservers",
-                                        ["dead:beaf::1", "dead:beaf::2"]))
-                }
-            }
-            subnet = self.client.create_subnet(subnet_args)["subnet"]
+            subnets_args.append({
+                "tenant_id": tenant_id,
+                "network_id": network["id"],
+                "name": self.owner.generate_random_name(),
+                "ip_version": ip_version,
+                "cidr": self._generate_cidr(ip_version),
+                "enable_dhcp": True,
+                "dns_nameservers": (
+                    kwargs.get("dns_nameservers", ["8.8.8.8", "8.8.4.4"])
+                    if ip_version == 4
+                    else kwargs.get("dns_nameservers",
+                                    ["dead:beaf::1", "dead:beaf::2"]))
+            })
+
+        subnets = []
+        for subnet in self._create_bulk("subnet", subnets_args):
             subnets.append(subnet["id"])
 
             if router:
@@ -281,12 +286,20 @@ class NeutronWrapper(NetworkWrapper):
         """
         self.client.delete_pool(pool_id)
 
-    def delete_network(self, network):
+    def delete_network(self, network, ports=None, subnets=None):
+        """Delete network with its router, ports and subnets.
 
+        :param network: network dict returned by create_network()
+        :param ports: ports of the network. They are listed if not specified
+        :param subnets: subnets of the network. They are listed if not
+            specified
+        """
         if network["router_id"]:
             self.client.remove_gateway_router(network["router_id"])
 
-        for port in self.client.list_ports(network_id=network["id"])["ports"]:
+        if ports is None:
+            ports = self.client.list_ports(network_id=network["id"])["ports"]
+        for port in ports:
             if port["device_owner"] in (
                     "network:router_interface",
                     "network:router_interface_distributed",
@@ -310,8 +323,10 @@ class NeutronWrapper(NetworkWrapper):
                     # port is auto-removed
                     pass
 
-        for subnet in self.client.list_subnets(
-                network_id=network["id"])["subnets"]:
+        if subnets is None:
+            subnets = self.client.list_subnets(
+                network_id=network["id"])["subnets"]
+        for subnet in subnets:
             self._delete_subnet(subnet["id"])
 
         responce = self.client.delete_network(network["id"])
@@ -321,6 +336,35 @@ class NeutronWrapper(NetworkWrapper):
 
         return responce
 
+    def delete_networks(self, networks):
+        """Delete several networks.
+
+        Ports and subnets of all networks are listed at once instead of
+        listing them for every network.
+
+        Failures are logged and do not stop deletion of other networks.
+
+        :param networks: list of network dicts returned by create_network()
+        """
+        if not networks:
+            return
+        network_ids = [network["id"] for network in networks]
+        ports = {}
+        for port in self.client.list_ports(
+                network_id=network_ids)["ports"]:
+            ports.setdefault(port["network_id"], []).append(port)
+        subnets = {}
+        for subnet in self.client.list_subnets(
+                network_id=network_ids)["subnets"]:
+            subnets.setdefault(subnet["network_id"], []).append(subnet)
+
+        for network in networks:
+            with logging.ExceptionLogger(
+                    LOG, "Failed to delete network %s" % network["id"]):
+                self.delete_network(network,
+                                    ports=ports.get(network["id"], []),
+                                    subnets=subnets.get(network["id"], []))
+
     def _delete_subnet(self, subnet_id):
         self.client.delete_subnet(subnet_id)
 
@@ -338,6 +382,48 @@ class NeutronWrapper(NetworkWrapper):
         kwargs["name"] = self.owner.generate_random_name()
         return self.client.create_port({"port": kwargs})["port"]
 
+    def _create_bulk(self, resource, resources_args):
+        """Create several resources of one type with one request.
+
+        Neutron accepts a list of resources in POST requests, but some
+        deployments do not support it. In such case resources are created
+        one by one and further bulk requests are not sent. Any other error
+        of the bulk request is raised as is.
+
+        :param resource: name of the resource, i.e. "subnet"
+        :param resources_args: list of POST request bodies of resources
+        :returns: list of created resources in the same order
+        """
+        create = getattr(self.client, "create_%s" % resource)
+        if len(resources_args) > 1 and self._bulk_supported:
+            try:
+                return create({"%ss" % resource: resources_args})[
+                    "%ss" % resource]
+            except neutron_exceptions.NeutronClientException as e:
+                if not self._is_bulk_unsupported(e):
+                    raise
+                LOG.debug("Failed to create %(num)s %(resource)ss with one "
+                          "request, falling back to one request per "
+                          "%(resource)s: %(error)s"
+                          % {"num": len(resources_args),
+                             "resource": resource, "error": e})
+                self._bulk_supported = False
+        return [create({resource: args})[resource]
+                for args in resources_args]
+
+    @staticmethod
+    def _is_bulk_unsupported(error):
+        """Check whether the error means that bulk requests are unsupported.
+
+        Neutron responds with 400 and "Bulk operation not supported" if bulk
+        is disabled by "allow_bulk" option, endpoints which are not aware of
+        bulk requests at all respond with 404 or 501.
+        """
+        if error.status_code in (404, 501):
+            return True
+        return (error.status_code == 400
+                and "bulk" in six.text_type(error).lower())
+
     def create_floating_ip(self, ext_network=None,
                            tenant_id=None, port_id=None, **kwargs):
         """Create Neutron floating IP.
@@ -395,8 +481,7 @@ class NeutronWrapper(NetworkWrapper):
         :returns: result tuple
         :rtype: (bool, string)
         """
-        extensions = self.client.list_extensions().get("extensions", [])
-        if any(ext.get("alias") == extension for ext in extensions):
+        if extension in osclients.NEUTRON_EXTENSIONS.get_aliases(self.client):
             return True, ""
 
         return False, "Neutron driver does not support %s" % extension
@@ -0,0 +1,98 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+"""Compare name matching approaches used for filtering cleanup resources."""
+
+
+import argparse
+import random
+import string
+import sys
+import time
+import uuid
+
+from rally.common.plugin import discover
+from rally.common import utils as rutils
+from rally import plugins
+
+
+def generate_names(count, task_id, matching_ratio, name_format):
+    """Generate synthetic names of leftover resources."""
+
+    class NameGenerator(rutils.RandomNameGeneratorMixin):
+        RESOURCE_NAME_FORMAT = name_format
+
+    rally_name = NameGenerator()
+    rally_name.task = {"uuid": task_id}
+    other_task = NameGenerator()
+    other_task.task = {"uuid": str(uuid.uuid4())}
+    chars = string.ascii_lowercase + string.digits
+
+    names = []
+    for i in range(count):
+        kind = random.random()
+        if kind < matching_ratio:
+            names.append(rally_name.generate_random_name())
+        elif kind < (matching_ratio + 1) / 2:
+            names.append(other_task.generate_random_name())
+        else:
+            names.append("".join(random.choice(chars) for _c in range(16)))
+    return names
+
+
+def measure(func, names):
+    started = time.time()
+    matched = sum(1 for name in names if func(name))
+    return time.time() - started, matched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--names", type=int, default=20000,
+                        help="number of synthetic resource names")
+    parser.add_argument("--matching-ratio", type=float, default=0.3,
+                        help="ratio of names which belong to the task")
+    args = parser.parse_args()
+
+    plugins.load()
+    from rally_openstack.cleanup import manager
+    from rally_openstack import scenario
+
+    task_id = str(uuid.uuid4())
+    classes = [cls for cls in discover.itersubclasses(
+        scenario.OpenStackScenario)
+        if issubclass(cls, rutils.RandomNameGeneratorMixin)]
+    names = generate_names(args.names, task_id, args.matching_ratio,
+                           scenario.OpenStackScenario.RESOURCE_NAME_FORMAT)
+
+    def name_matches_object(name):
+        return rutils.name_matches_object(name, *classes, task_id=task_id,
+                                          exact=False)
+
+    started = time.time()
+    name_matcher = manager.NameMatcher(classes, task_id=task_id)
+    compile_time = time.time() - started
+
+    print("Classes: %s, names: %s" % (len(classes), len(names)))
+    for title, func in (("name_matches_object", name_matches_object),
+                        ("NameMatcher.match", name_matcher.match)):
+        duration, matched = measure(func, names)
+        print("%-20s %8.3f sec (%.2f usec per name), matched: %s"
+              % (title, duration, duration * 10 ** 6 / len(names), matched))
+    print("NameMatcher compilation: %.3f sec" % compile_time)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
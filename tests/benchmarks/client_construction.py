@@ -0,0 +1,144 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure the cost of constructing OpenStack clients per iteration."""
+
+import argparse
+import sys
+import time
+
+from keystoneauth1 import access
+from keystoneauth1 import fixture
+from keystoneauth1 import session
+from rally import plugins
+
+
+# client name -> service type of its endpoint
+CLIENTS = {
+    "nova": "compute",
+    "glance": "image",
+    "cinder": "volumev2",
+    "neutron": "network",
+    "heat": "orchestration",
+    "designate": "dns",
+    "manila": "share",
+    "swift": "object-store",
+}
+
+
+def make_auth_ref(services, regions):
+    """Make a token with a big service catalog."""
+    token = fixture.V3Token()
+    service_types = list(CLIENTS.values())
+    service_types.extend("extra-service-%s" % i
+                         for i in range(max(services - len(CLIENTS), 0)))
+    for service_type in service_types:
+        service = token.add_service(service_type)
+        for region in range(regions):
+            region_name = "Region%s" % region
+            service.add_standard_endpoints(
+                public="http://public.%s/%s" % (region_name, service_type),
+                internal="http://internal.%s/%s" % (region_name,
+                                                    service_type),
+                admin="http://admin.%s/%s" % (region_name, service_type),
+                region=region_name)
+    return access.create(body=token)
+
+
+class FakeIdentityPlugin(object):
+    """Identity plugin which always returns the same token."""
+
+    def __init__(self, auth_ref):
+        self.auth_ref = auth_ref
+        self._user_domain_name = "Default"
+
+    def get_access(self, sess):
+        return self.auth_ref
+
+    def invalidate(self):
+        pass
+
+
+class CatalogScan(object):
+    """Resolves endpoints without index, i.e. scans the catalog each time."""
+
+    def url_for(self, catalog, service_type, region_name=None,
+                interface=None):
+        kw = {"service_type": service_type, "region_name": region_name}
+        if interface:
+            kw["interface"] = interface
+        return catalog.url_for(**kw)
+
+
+def measure(osclients, credential, clients, iterations):
+    started = time.time()
+    for i in range(iterations):
+        # NOTE: scenarios create new Clients object every iteration
+        os_clients = osclients.Clients(credential)
+        for name in clients:
+            getattr(os_clients, name)()
+    return time.time() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200,
+                        help="number of iterations")
+    parser.add_argument("--services", type=int, default=30,
+                        help="number of services in the catalog")
+    parser.add_argument("--regions", type=int, default=3,
+                        help="number of regions in the catalog")
+    args = parser.parse_args()
+
+    plugins.load()
+    from rally_openstack import credential as oscred
+    from rally_openstack import osclients
+
+    credential = oscred.OpenStackCredential(
+        "http://keystone/v3", "user", "pass", tenant_name="project",
+        region_name="Region%s" % (args.regions - 1),
+        endpoint_type="internal",
+        api_info={"keystone": {"version": "3"},
+                  "designate": {"version": "2"}})
+    keystone = osclients.Keystone(credential)
+    auth_ref = make_auth_ref(args.services, args.regions)
+    # NOTE: pre-populate the pool of sessions to avoid authentication
+    osclients.SESSION_POOL.get(
+        keystone._get_session_pool_key(),
+        lambda: (session.Session(), FakeIdentityPlugin(auth_ref)))
+
+    clients = []
+    for name in sorted(CLIENTS):
+        try:
+            getattr(osclients.Clients(credential), name)()
+        except Exception as e:
+            print("Skipping %s client: %s" % (name, e))
+        else:
+            clients.append(name)
+
+    print("Clients: %s, services in catalog: %s, regions: %s, "
+          "iterations: %s" % (len(clients), args.services, args.regions,
+                              args.iterations))
+    endpoint_index = osclients.ENDPOINT_INDEX
+    for title, resolver in (("catalog scan", CatalogScan()),
+                            ("endpoint index", endpoint_index)):
+        osclients.ENDPOINT_INDEX = resolver
+        duration = measure(osclients, credential, clients, args.iterations)
+        print("%-15s %8.3f sec (%.2f msec per iteration)"
+              % (title, duration, duration * 1000 / args.iterations))
+    osclients.ENDPOINT_INDEX = endpoint_index
+
+
+if __name__ == "__main__":
+    sys.exit(main())
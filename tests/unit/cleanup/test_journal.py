@@ -0,0 +1,181 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import shutil
+import tempfile
+import time
+
+import mock
+
+from rally_openstack.cleanup import journal
+from tests.unit import test
+
+
+BASE = "rally_openstack.cleanup.journal"
+
+
+class JournalTestCase(test.TestCase):
+
+    def setUp(self):
+        super(JournalTestCase, self).setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.path = os.path.join(self.tmp_dir, "subdir", "task.journal")
+
+    def _read(self):
+        with open(self.path) as f:
+            return f.read()
+
+    @mock.patch("%s.CONF" % BASE)
+    def test_for_cleanup(self, mock_conf):
+        mock_conf.openstack.cleanup_journal_dir = self.tmp_dir
+        path = journal.Journal.for_cleanup(
+            "uuid", names=["nova", "cinder"], admin_required=False,
+            superclass=JournalTestCase).path
+        self.assertEqual(self.tmp_dir, os.path.dirname(path))
+        self.assertTrue(os.path.basename(path).startswith("uuid-"))
+        self.assertTrue(path.endswith(".journal"))
+        self.assertEqual(path, journal.Journal.for_cleanup(
+            "uuid", names=["cinder", "nova"], admin_required=False,
+            superclass=JournalTestCase).path)
+        self.assertTrue(os.path.basename(
+            journal.Journal.for_cleanup().path).startswith("all-"))
+
+        # every cleanup call of the task has its own journal
+        other_calls = [
+            {"names": ["nova"], "admin_required": False,
+             "superclass": JournalTestCase},
+            {"names": ["nova", "cinder"], "admin_required": True,
+             "superclass": JournalTestCase},
+            {"names": ["nova", "cinder"], "admin_required": False,
+             "superclass": test.TestCase}]
+        for kwargs in other_calls:
+            self.assertNotEqual(
+                path, journal.Journal.for_cleanup("uuid", **kwargs).path)
+
+        mock_conf.openstack.cleanup_journal_dir = ""
+        self.assertIsNone(journal.Journal.for_cleanup("uuid"))
+
+    @mock.patch("%s.CONF" % BASE)
+    def test_for_cleanup_resume(self, mock_conf):
+        mock_conf.openstack.cleanup_journal_dir = self.tmp_dir
+        j = journal.Journal.for_cleanup("uuid", names=["nova"])
+        j.record("nova.servers", journal.DELETED, "id1")
+        j.record("nova.servers", journal.FINISHED)
+        j.close()
+
+        j = journal.Journal.for_cleanup("uuid", names=["nova"], resume=True)
+        self.assertTrue(j.is_finished("nova.servers"))
+        self.assertEqual(journal.DELETED, j.get_state("nova.servers", "id1"))
+        j.close()
+
+        # the journal of the previous call is not used by the new one
+        j = journal.Journal.for_cleanup("uuid", names=["nova"])
+        self.assertFalse(j.is_finished("nova.servers"))
+        self.assertIsNone(j.get_state("nova.servers", "id1"))
+        self.assertFalse(os.path.exists(j.path))
+
+    def test_record(self):
+        j = journal.Journal(self.path)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertIsNone(j.get_state("nova.servers", "id1"))
+
+        j.record("nova.servers", journal.DELETING, "id1")
+        j.record("nova.servers", journal.DELETING, "id2")
+        j.record("nova.servers", journal.DELETED, "id1")
+        j.record("nova.servers", journal.FINISHED)
+
+        self.assertEqual(journal.DELETED, j.get_state("nova.servers", "id1"))
+        self.assertEqual(journal.DELETING, j.get_state("nova.servers", "id2"))
+        self.assertIsNone(j.get_state("cinder.volumes", "id1"))
+        self.assertTrue(j.is_finished("nova.servers"))
+        self.assertFalse(j.is_finished("cinder.volumes"))
+        self.assertEqual("nova.servers P id1\n"
+                         "nova.servers P id2\n"
+                         "nova.servers X id1\n"
+                         "nova.servers E -\n", self._read())
+        j.close()
+
+    @mock.patch("%s.LOG" % BASE)
+    @mock.patch("%s.open" % BASE, create=True)
+    def test_record_write_fails(self, mock_open, mock_log):
+        mock_open.side_effect = IOError("Permission denied")
+        j = journal.Journal(self.path)
+
+        j.record("nova.servers", journal.DELETING, "id1")
+        j.record("nova.servers", journal.DELETED, "id1")
+
+        self.assertEqual(journal.DELETED, j.get_state("nova.servers", "id1"))
+        mock_open.assert_called_once_with(self.path, "a")
+        self.assertEqual(1, mock_log.warning.call_count)
+        j.close()
+
+    def test_resume(self):
+        j = journal.Journal(self.path)
+        j.record("nova.servers", journal.DELETING, "id1")
+        j.record("nova.servers", journal.FAILED, "id2")
+        j.record("nova.servers", journal.FINISHED)
+        j.record("cinder.volumes", journal.DELETED, "id 3")
+        j.close()
+
+        j = journal.Journal(self.path)
+        self.assertEqual(journal.DELETING, j.get_state("nova.servers", "id1"))
+        self.assertEqual(journal.FAILED, j.get_state("nova.servers", "id2"))
+        self.assertEqual(journal.DELETED,
+                         j.get_state("cinder.volumes", "id 3"))
+        self.assertTrue(j.is_finished("nova.servers"))
+        self.assertFalse(j.is_finished("cinder.volumes"))
+
+        j.record("cinder.volumes", journal.DELETED, "id4")
+        j.close()
+        self.assertEqual(5, len(self._read().splitlines()))
+
+    def test_resume_truncated(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w") as f:
+            f.write("nova.servers P id1\n"
+                    "broken line\n"
+                    "nova.servers X i")
+
+        j = journal.Journal(self.path)
+        self.assertEqual(journal.DELETING, j.get_state("nova.servers", "id1"))
+
+        j.record("nova.servers", journal.DELETED, "id1")
+        j.close()
+        j = journal.Journal(self.path)
+        self.assertEqual(journal.DELETED, j.get_state("nova.servers", "id1"))
+
+    def test_outdated(self):
+        j = journal.Journal(self.path)
+        j.record("nova.servers", journal.FINISHED)
+        j.close()
+        outdated = time.time() - journal.JOURNAL_TTL - 1
+        os.utime(self.path, (outdated, outdated))
+
+        j = journal.Journal(self.path)
+        self.assertFalse(j.is_finished("nova.servers"))
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_close(self):
+        j = journal.Journal(self.path)
+        j.close(remove=True)
+
+        j.record("nova.servers", journal.DELETING, "id1")
+        j.close()
+        self.assertTrue(os.path.exists(self.path))
+
+        j.close(remove=True)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertIsNone(j.get_state("nova.servers", "id1"))
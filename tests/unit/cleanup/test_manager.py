@@ -13,10 +13,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import ddt
 import mock
 
+from rally.common.plugin import plugin
 from rally.common import utils
 from rally_openstack.cleanup import base
+from rally_openstack.cleanup import journal as cleanup_journal
 from rally_openstack.cleanup import manager
 from tests.unit import test
 
@@ -63,6 +66,23 @@ class SeekAndDestroyTestCase(test.TestCase):
         # NOTE(boris-42): No logs and no exceptions means no bugs!
         self.assertEqual(0, mock_log.call_count)
 
+    @mock.patch("%s.broker.report_error" % BASE)
+    @mock.patch("%s.LOG" % BASE)
+    def test__delete_single_resource_fails(self, mock_log,
+                                           mock_report_error):
+        mock_resource = mock.MagicMock(_max_attempts=2, _timeout=10,
+                                       _interval=0)
+        error = Exception("Service Unavailable")
+        mock_resource.delete.side_effect = error
+
+        destroyer = manager.SeekAndDestroy(None, None, None)
+        self.assertFalse(destroyer._delete_single_resource(mock_resource))
+
+        self.assertEqual(2, mock_resource.delete.call_count)
+        self.assertFalse(mock_resource.is_deleted.called)
+        mock_report_error.assert_called_once_with(error)
+        self.assertEqual(1, destroyer.stats["failed"])
+
     @mock.patch("%s.LOG" % BASE)
     def test__delete_single_resource_timeout(self, mock_log):
 
@@ -140,6 +160,7 @@ class SeekAndDestroyTestCase(test.TestCase):
                                   Exception, Exception, [4, 5]],
                                  _perform_for_admin_only=False,
                                  _tenant_resource=True)
+        mock_mgr.return_value.list_all_tenants.return_value = None
 
         admin = mock.MagicMock()
         users = [{"tenant_id": 1, "id": 1}, {"tenant_id": 2, "id": 2}]
@@ -169,6 +190,75 @@ class SeekAndDestroyTestCase(test.TestCase):
         expected_queue += [(admin, users[1], x) for x in range(4, 6)]
         self.assertEqual(expected_queue, queue)
 
+    @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
+    def test__publisher_all_tenants(self, mock__get_cached_client):
+        mock_mgr = self._manager(None, _perform_for_admin_only=False,
+                                 _tenant_resource=True)
+        mock_mgr.return_value.list_all_tenants.return_value = {
+            1: ["r1", "r2"], 3: ["r3"]}
+
+        admin = mock.MagicMock()
+        users = [{"tenant_id": 1, "id": 1}, {"tenant_id": 1, "id": 2},
+                 {"tenant_id": 2, "id": 3}]
+        publish = manager.SeekAndDestroy(mock_mgr, admin, users)._publisher
+
+        queue = []
+        publish(queue)
+
+        mock_mgr.assert_called_once_with(
+            admin=mock__get_cached_client.return_value)
+        self.assertFalse(mock_mgr.return_value.list.called)
+        self.assertEqual([(admin, users[0], "r1"), (admin, users[0], "r2")],
+                         queue)
+
+    @mock.patch("%s.LOG" % BASE)
+    @mock.patch("%s.SeekAndDestroy._list_all_tenants" % BASE,
+                return_value=None)
+    @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
+    def test__publisher_whole_cloud_without_all_tenants(
+            self, mock__get_cached_client, mock__list_all_tenants, mock_log):
+        mock_mgr = self._manager([["r1"]], _perform_for_admin_only=False,
+                                 _tenant_resource=True,
+                                 _admin_required=False,
+                                 _service="cinder", _resource="backups")
+        admin = mock.MagicMock()
+        publish = manager.SeekAndDestroy(mock_mgr, admin, None,
+                                         all_tenants=True)._publisher
+
+        queue = []
+        publish(queue)
+
+        self.assertEqual([(admin, None, "r1")], queue)
+        mock_log.warning.assert_called_once_with(
+            "Resources of cinder.backups can not be listed for all tenants, "
+            "only the ones which are visible to admin are cleaned up.")
+
+    @mock.patch("%s.LOG" % BASE)
+    @mock.patch("%s.CONF" % BASE)
+    def test__list_all_tenants(self, mock_conf, mock_log):
+        mock_conf.openstack.cleanup_admin_bulk_list = True
+        mock_mgr = mock.MagicMock(_tenant_resource=True)
+        mock_mgr.return_value.list_all_tenants.side_effect = [
+            {"t": ["r"]}, Exception, Exception, Exception]
+
+        destroyer = manager.SeekAndDestroy(mock_mgr, "admin", None)
+        self.assertEqual({"t": ["r"]}, destroyer._list_all_tenants("client"))
+        mock_mgr.assert_called_once_with(admin="client")
+
+        # broken list_all_tenants
+        self.assertIsNone(destroyer._list_all_tenants("client"))
+        self.assertTrue(mock_log.exception.called)
+
+        # not a tenant resource
+        mock_mgr._tenant_resource = False
+        self.assertIsNone(destroyer._list_all_tenants("client"))
+
+        # no admin
+        mock_mgr._tenant_resource = True
+        destroyer.admin = None
+        self.assertIsNone(destroyer._list_all_tenants("client"))
+        self.assertEqual(4, mock_mgr.return_value.list_all_tenants.call_count)
+
     @mock.patch("%s.LOG" % BASE)
     @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
     def test__gen_publisher_tenant_resource(self, mock__get_cached_client,
@@ -209,21 +299,22 @@ class SeekAndDestroyTestCase(test.TestCase):
         self.assertTrue(mock_log.warning.mock_called)
         self.assertTrue(mock_log.exception.mock_called)
 
-    @mock.patch("rally.common.utils.name_matches_object")
+    @mock.patch("%s.NameMatcher" % BASE)
     @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
     @mock.patch("%s.SeekAndDestroy._delete_single_resource" % BASE)
     def test__consumer(self, mock__delete_single_resource,
                        mock__get_cached_client,
-                       mock_name_matches_object):
+                       mock_name_matcher):
         mock_mgr = mock.MagicMock(__name__="Test")
         resource_classes = [mock.Mock()]
         task_id = "task_id"
-        mock_name_matches_object.return_value = True
+        mock_name_matcher.return_value.match.return_value = True
 
         consumer = manager.SeekAndDestroy(
             mock_mgr, None, None,
             resource_classes=resource_classes,
             task_id=task_id)._consumer
+        mock_name_matcher.assert_called_once_with(resource_classes, task_id)
 
         admin = mock.MagicMock()
         user1 = {"id": "a", "tenant_id": "uuid1"}
@@ -245,7 +336,6 @@ class SeekAndDestroyTestCase(test.TestCase):
         mock_mgr.reset_mock()
         mock__get_cached_client.reset_mock()
         mock__delete_single_resource.reset_mock()
-        mock_name_matches_object.reset_mock()
 
         consumer(cache, (admin, None, "res2"))
         mock_mgr.assert_called_once_with(
@@ -261,39 +351,315 @@ class SeekAndDestroyTestCase(test.TestCase):
         mock__delete_single_resource.assert_called_once_with(
             mock_mgr.return_value)
 
-    @mock.patch("rally.common.utils.name_matches_object")
+    @mock.patch("%s.broker.ignore_latency" % BASE)
+    @mock.patch("%s.NameMatcher.match" % BASE)
     @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
     @mock.patch("%s.SeekAndDestroy._delete_single_resource" % BASE)
     def test__consumer_with_noname_resource(self, mock__delete_single_resource,
                                             mock__get_cached_client,
-                                            mock_name_matches_object):
+                                            mock_name_matcher_match,
+                                            mock_ignore_latency):
         mock_mgr = mock.MagicMock(__name__="Test")
         mock_mgr.return_value.name.return_value = True
         task_id = "task_id"
-        mock_name_matches_object.return_value = False
+        mock_name_matcher_match.return_value = False
 
         consumer = manager.SeekAndDestroy(mock_mgr, None, None,
                                           task_id=task_id)._consumer
 
         consumer(None, (None, None, "res"))
         self.assertFalse(mock__delete_single_resource.called)
+        # skipping of a resource makes no API calls
+        mock_ignore_latency.assert_called_once_with()
 
         mock_mgr.return_value.name.return_value = base.NoName("foo")
         consumer(None, (None, None, "res"))
         mock__delete_single_resource.assert_called_once_with(
             mock_mgr.return_value)
 
+        # there are no users to whom NoName resources belong
+        mock__delete_single_resource.reset_mock()
+        consumer = manager.SeekAndDestroy(mock_mgr, "admin", None,
+                                          task_id=task_id,
+                                          all_tenants=True)._consumer
+        consumer(None, (None, None, "res"))
+        self.assertFalse(mock__delete_single_resource.called)
+
+    @mock.patch("%s.CONF" % BASE)
+    def test__is_batch_polling_supported(self, mock_conf):
+        mock_conf.openstack.cleanup_batch_polling = True
+
+        class Default(base.ResourceManager):
+            pass
+
+        class Custom(base.ResourceManager):
+            def is_deleted(self):
+                return True
+
+        self.assertTrue(manager.SeekAndDestroy(
+            Default, None, None)._is_batch_polling_supported())
+        self.assertFalse(manager.SeekAndDestroy(
+            Custom, None, None)._is_batch_polling_supported())
+
+        mock_conf.openstack.cleanup_batch_polling = False
+        self.assertFalse(manager.SeekAndDestroy(
+            Default, None, None)._is_batch_polling_supported())
+
+    @mock.patch("%s.NameMatcher.match" % BASE, return_value=True)
+    @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
+    @mock.patch("%s.SeekAndDestroy._delete_single_resource" % BASE)
+    def test__consumer_with_batch_polling(self, mock__delete_single_resource,
+                                          mock__get_cached_client,
+                                          mock_name_matcher_match):
+        mock_mgr = mock.MagicMock(__name__="Test")
+        mock_mgr.return_value.id.return_value = "res_id"
+        mock__delete_single_resource.side_effect = [True, False]
+        user = {"id": "a", "tenant_id": "uuid1"}
+
+        destroyer = manager.SeekAndDestroy(mock_mgr, None, None)
+        destroyer._batch_polling = True
+
+        destroyer._consumer(None, ("admin", user, "res"))
+        destroyer._consumer(None, ("admin", user, "res2"))
+
+        mock__delete_single_resource.assert_has_calls(
+            [mock.call(mock_mgr.return_value, wait=False)] * 2)
+        self.assertEqual(
+            {id(user): ("admin", user,
+                        {"res_id": (mock_mgr.return_value, mock.ANY)})},
+            destroyer._pending)
+
+    @mock.patch("%s.NameMatcher.match" % BASE, return_value=True)
+    @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
+    @mock.patch("%s.SeekAndDestroy._wait_for_single_resource" % BASE)
+    @mock.patch("%s.SeekAndDestroy._delete_single_resource" % BASE)
+    def test__consumer_with_journal(self, mock__delete_single_resource,
+                                    mock__wait_for_single_resource,
+                                    mock__get_cached_client,
+                                    mock_name_matcher_match):
+        mock_mgr = mock.MagicMock(_service="nova", _resource="servers")
+        mock_mgr.side_effect = lambda resource, **kw: mock.Mock(
+            id=mock.Mock(return_value=resource))
+        journal = mock.Mock()
+        journal.get_state.side_effect = lambda name, res_id: {
+            "deleted": cleanup_journal.DELETED,
+            "deleting": cleanup_journal.DELETING}.get(res_id)
+
+        destroyer = manager.SeekAndDestroy(mock_mgr, None, None,
+                                           journal=journal)
+        destroyer._batch_polling = False
+        for res in ("deleted", "deleting", "new"):
+            destroyer._consumer(None, (None, None, res))
+
+        journal.get_state.assert_has_calls(
+            [mock.call("nova.servers", "deleted"),
+             mock.call("nova.servers", "deleting"),
+             mock.call("nova.servers", "new")])
+        self.assertEqual(2, destroyer.stats["discovered"])
+        self.assertEqual(1, mock__wait_for_single_resource.call_count)
+        self.assertEqual(
+            "deleting", mock__wait_for_single_resource.call_args[0][0].id())
+        self.assertEqual(1, mock__delete_single_resource.call_count)
+        self.assertEqual(
+            "new", mock__delete_single_resource.call_args[0][0].id())
+
+        # deletion is confirmed via batch polling
+        destroyer._batch_polling = True
+        destroyer._consumer(None, (None, None, "deleting"))
+        self.assertEqual(["deleting"], list(destroyer._pending[None][2]))
+        self.assertEqual(1, mock__wait_for_single_resource.call_count)
+        self.assertEqual(1, mock__delete_single_resource.call_count)
+
+    @mock.patch("%s.LOG" % BASE)
+    def test__delete_single_resource_with_journal(self, mock_log):
+        mock_resource = mock.MagicMock(_max_attempts=1, _timeout=10,
+                                       _interval=0)
+        mock_resource.id.return_value = "res_id"
+        mock_resource.is_deleted.return_value = True
+        journal = mock.Mock()
+        destroyer = manager.SeekAndDestroy(
+            mock.Mock(_service="nova", _resource="servers"), None, None,
+            journal=journal)
+
+        destroyer._delete_single_resource(mock_resource)
+
+        journal.record.assert_has_calls([
+            mock.call("nova.servers", cleanup_journal.DELETING, "res_id"),
+            mock.call("nova.servers", cleanup_journal.DELETED, "res_id")])
+
+        journal.record.reset_mock()
+        mock_resource.delete.side_effect = Exception
+        destroyer._delete_single_resource(mock_resource)
+        journal.record.assert_called_once_with(
+            "nova.servers", cleanup_journal.FAILED, "res_id")
+
     @mock.patch("%s.broker.run" % BASE)
-    def test_exterminate(self, mock_broker_run):
+    def test_exterminate_with_journal(self, mock_broker_run):
+        journal = mock.Mock()
+        journal.is_finished.return_value = True
+        cleaner = manager.SeekAndDestroy(
+            mock.Mock(_service="nova", _resource="servers"), None, None,
+            journal=journal)
+
+        cleaner.exterminate()
+        journal.is_finished.assert_called_once_with("nova.servers")
+        self.assertFalse(mock_broker_run.called)
+
+        journal.is_finished.return_value = False
+        cleaner.exterminate()
+        self.assertTrue(mock_broker_run.called)
+        journal.record.assert_called_once_with("nova.servers",
+                                               cleanup_journal.FINISHED)
+
+        # there are errors, so cleanup should be resumed next time
+        journal.record.reset_mock()
+        cleaner.errors.append({"message": "Timeout"})
+        cleaner.exterminate()
+        self.assertFalse(journal.record.called)
+
+    @mock.patch("%s.LOG" % BASE)
+    @mock.patch("%s.rutils.interruptable_sleep" % BASE)
+    @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
+    def test__wait_for_deletion(self, mock__get_cached_client,
+                                mock_interruptable_sleep, mock_log):
+        res = [mock.Mock(id="id%s" % i, status="ACTIVE") for i in range(4)]
+        res[3].status = "DELETED"
+        listed = [Exception(), res, res[1:], []]
+
+        class Resource(base.ResourceManager):
+            _max_attempts = 1
+            _interval = 1
+            _timeout = 100
+            _complete_listing = True
+
+            def list(self):
+                result = listed.pop(0)
+                if isinstance(result, Exception):
+                    raise result
+                return result
+
+        user = {"id": "a", "tenant_id": "uuid1"}
+        destroyer = manager.SeekAndDestroy(Resource, "admin", [user])
+        for r in res[:3]:
+            destroyer._add_pending_resource(
+                "admin", user, Resource(resource=r))
+        _, _, pending = destroyer._pending[id(user)]
+        pending["id2"] = (pending["id2"][0], 0)
+
+        destroyer._wait_for_deletion()
+
+        self.assertEqual({}, destroyer._pending)
+        self.assertEqual([], listed)
+        self.assertEqual(3, mock_interruptable_sleep.call_count)
+        self.assertEqual(1, mock_log.exception.call_count)
+        # timeout for res[2]
+        self.assertEqual(1, mock_log.warning.call_count)
+
+    @mock.patch("%s.LOG" % BASE)
+    @mock.patch("%s.rutils.interruptable_sleep" % BASE)
+    @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
+    def test__wait_for_deletion_incomplete_listing(
+            self, mock__get_cached_client, mock_interruptable_sleep,
+            mock_log):
+        res = [mock.Mock(id="id%s" % i, status="ACTIVE") for i in range(3)]
+        deleted = {"id0": [True], "id1": [False, True],
+                   "id2": [Exception(), True]}
+
+        class Resource(base.ResourceManager):
+            _max_attempts = 1
+            _interval = 1
+            _timeout = 100
+
+            def list(self):
+                # the list is paginated, so nothing is returned
+                return []
+
+            def is_deleted(self):
+                result = deleted[self.id()].pop(0)
+                if isinstance(result, Exception):
+                    raise result
+                return result
+
+        destroyer = manager.SeekAndDestroy(Resource, "admin", None)
+        for r in res:
+            destroyer._add_pending_resource(
+                "admin", None, Resource(resource=r))
+
+        destroyer._wait_for_deletion()
+
+        self.assertEqual({}, destroyer._pending)
+        self.assertEqual({"id0": [], "id1": [], "id2": []}, deleted)
+        self.assertEqual(3, destroyer.stats["deleted"])
+        self.assertEqual(1, mock_interruptable_sleep.call_count)
+        self.assertEqual(1, mock_log.exception.call_count)
+
+    @mock.patch("%s.broker.run" % BASE)
+    def test_exterminate_with_pending_resources(self, mock_broker_run):
+        manager_cls = mock.MagicMock(_threads=5)
+        cleaner = manager.SeekAndDestroy(manager_cls, None, None)
+        cleaner._wait_for_deletion = mock.Mock()
+
+        cleaner.exterminate()
+        self.assertFalse(cleaner._wait_for_deletion.called)
+
+        mock_broker_run.side_effect = (
+            lambda *a, **kw: cleaner._pending.update({None: "foo"}))
+        cleaner.exterminate()
+        cleaner._wait_for_deletion.assert_called_once_with()
+
+    @mock.patch("%s.CONF" % BASE)
+    @mock.patch("%s.broker.run" % BASE)
+    def test_exterminate(self, mock_broker_run, mock_conf):
         manager_cls = mock.MagicMock(_threads=5)
         cleaner = manager.SeekAndDestroy(manager_cls, None, None)
         cleaner._publisher = mock.Mock()
         cleaner._consumer = mock.Mock()
         cleaner.exterminate()
 
-        mock_broker_run.assert_called_once_with(cleaner._publisher,
-                                                cleaner._consumer,
-                                                consumers_count=5)
+        mock_broker_run.assert_called_once_with(
+            cleaner._publisher, cleaner._consumer, consumers_count=5,
+            adaptive=mock_conf.openstack.cleanup_adaptive_threads)
+
+
+@ddt.ddt
+class NameMatcherTestCase(test.TestCase):
+
+    class Default(utils.RandomNameGeneratorMixin):
+        pass
+
+    class CustomFormat(utils.RandomNameGeneratorMixin):
+        RESOURCE_NAME_FORMAT = "s_rally_XXXXXX_XXXXXX"
+
+    class CustomChars(utils.RandomNameGeneratorMixin):
+        RESOURCE_NAME_FORMAT = "r.a.l.l.y_XXXX_XXXX"
+        RESOURCE_NAME_ALLOWED_CHARACTERS = "abc"
+
+    Custom = utils.make_name_matcher("foo", "bar")
+
+    TASK_ID = "f2a8b1e0-2b4a-4e27-9c37-cd07b8ba0b6c"
+
+    @ddt.data("rally_f2a8b1e0_abcdefgh", "rally_f2a8b1e0_abcdefgh-1",
+              "rally_00000000_abcdefgh", "rally_f2a8b1e0_abcdefg",
+              "s_rally_f2a8b1_abcdef", "s_rally_f2a8b1_ab",
+              "s_rally_xxxxxx_abc", "r.a.l.l.y_f2a8_abca",
+              "r.a.l.l.y_f2a8_abcd", "rXaXlXlXy_f2a8_abca",
+              "foo", "foo2", "bar", "", "my_server")
+    def test_match(self, name):
+        classes = [self.Default, self.CustomFormat, self.CustomChars,
+                   self.Custom, self.Default]
+        for task_id in (self.TASK_ID, None):
+            matcher = manager.NameMatcher(classes, task_id=task_id)
+            self.assertEqual(
+                utils.name_matches_object(name, *classes, task_id=task_id,
+                                          exact=False),
+                matcher.match(name))
+
+    def test_init(self):
+        matcher = manager.NameMatcher(
+            [self.Default, self.Custom, self.Default, self.CustomFormat],
+            task_id=self.TASK_ID)
+        self.assertEqual([self.Custom], matcher._custom_classes)
+        self.assertEqual(2, matcher._regex.pattern.count("(?:"))
 
 
 class ResourceManagerTestCase(test.TestCase):
@@ -364,7 +730,8 @@ class ResourceManagerTestCase(test.TestCase):
     @mock.patch("rally.common.plugin.discover.itersubclasses")
     @mock.patch("%s.SeekAndDestroy" % BASE)
     @mock.patch("%s.find_resource_managers" % BASE,
-                return_value=[mock.MagicMock(), mock.MagicMock()])
+                return_value=[mock.MagicMock(_order=1, _service="a"),
+                              mock.MagicMock(_order=2, _service="b")])
     def test_cleanup(self, mock_find_resource_managers, mock_seek_and_destroy,
                      mock_itersubclasses):
         class A(utils.RandomNameGeneratorMixin):
@@ -374,6 +741,9 @@ class ResourceManagerTestCase(test.TestCase):
             pass
 
         mock_itersubclasses.return_value = [A, B]
+        mock_seek_and_destroy.return_value.stats = {
+            "discovered": 0, "deleted": 0, "failed": 0}
+        mock_seek_and_destroy.return_value.errors = []
 
         manager.cleanup(names=["a", "b"], admin_required=True,
                         admin="admin", users=["user"],
@@ -385,18 +755,21 @@ class ResourceManagerTestCase(test.TestCase):
         mock_seek_and_destroy.assert_has_calls([
             mock.call(mock_find_resource_managers.return_value[0], "admin",
                       ["user"], api_versions=None,
-                      resource_classes=[A], task_id="task_id"),
+                      resource_classes=[A], task_id="task_id",
+                      all_tenants=False, journal=mock.ANY),
             mock.call().exterminate(),
             mock.call(mock_find_resource_managers.return_value[1], "admin",
                       ["user"], api_versions=None,
-                      resource_classes=[A], task_id="task_id"),
+                      resource_classes=[A], task_id="task_id",
+                      all_tenants=False, journal=mock.ANY),
             mock.call().exterminate()
         ])
 
     @mock.patch("rally.common.plugin.discover.itersubclasses")
     @mock.patch("%s.SeekAndDestroy" % BASE)
     @mock.patch("%s.find_resource_managers" % BASE,
-                return_value=[mock.MagicMock(), mock.MagicMock()])
+                return_value=[mock.MagicMock(_order=1, _service="a"),
+                              mock.MagicMock(_order=2, _service="b")])
     def test_cleanup_with_api_versions(self,
                                        mock_find_resource_managers,
                                        mock_seek_and_destroy,
@@ -410,6 +783,9 @@ class ResourceManagerTestCase(test.TestCase):
         mock_itersubclasses.return_value = [A, B]
 
         api_versions = {"cinder": {"version": "1", "service_type": "volume"}}
+        mock_seek_and_destroy.return_value.stats = {
+            "discovered": 0, "deleted": 0, "failed": 0}
+        mock_seek_and_destroy.return_value.errors = []
         manager.cleanup(names=["a", "b"], admin_required=True,
                         admin="admin", users=["user"],
                         api_versions=api_versions,
@@ -421,10 +797,144 @@ class ResourceManagerTestCase(test.TestCase):
         mock_seek_and_destroy.assert_has_calls([
             mock.call(mock_find_resource_managers.return_value[0], "admin",
                       ["user"], api_versions=api_versions,
-                      resource_classes=[A], task_id="task_id"),
+                      resource_classes=[A], task_id="task_id",
+                      all_tenants=False, journal=mock.ANY),
             mock.call().exterminate(),
             mock.call(mock_find_resource_managers.return_value[1], "admin",
                       ["user"], api_versions=api_versions,
-                      resource_classes=[A], task_id="task_id"),
+                      resource_classes=[A], task_id="task_id",
+                      all_tenants=False, journal=mock.ANY),
             mock.call().exterminate()
         ])
+
+    def test__get_families_graph(self):
+        heat = self._get_res_mock(_service="heat", _order=100)
+        senlin = self._get_res_mock(_service="senlin", _order=150)
+        nova_1 = self._get_res_mock(_service="nova", _order=200)
+        nova_2 = self._get_res_mock(_service="nova", _order=201)
+        neutron_1 = self._get_res_mock(_service="neutron", _order=300)
+        octavia = self._get_res_mock(_service="octavia", _order=301)
+        neutron_2 = self._get_res_mock(_service="neutron", _order=302)
+        glance = self._get_res_mock(_service="glance", _order=500)
+        keystone = self._get_res_mock(_service="keystone", _order=9000)
+
+        families, dependencies = manager._get_families_graph(
+            [heat, senlin, nova_1, nova_2, neutron_1, octavia, neutron_2,
+             glance, keystone])
+
+        self.assertEqual([("heat", [heat]), ("senlin", [senlin]),
+                          ("nova", [nova_1, nova_2]),
+                          ("neutron", [neutron_1, neutron_2]),
+                          ("octavia", [octavia]), ("glance", [glance]),
+                          ("keystone", [keystone])], families)
+        self.assertEqual(
+            {"heat": set(), "senlin": set(), "nova": {"heat", "senlin"},
+             # the edge to the family which goes later is kept as well
+             "neutron": {"heat", "senlin", "nova", "octavia"},
+             "octavia": {"heat", "senlin", "nova"},
+             "glance": set(),
+             "keystone": {"heat", "senlin", "nova", "neutron", "octavia",
+                          "glance"}},
+            dependencies)
+
+    @mock.patch("%s.LOG" % BASE)
+    @mock.patch.dict("%s._CLEANUP_DEPENDENCIES" % BASE,
+                     {"a": ("b",), "b": ("c",), "c": ("a",)}, clear=True)
+    def test__get_families_graph_with_cycle(self, mock_log):
+        a = self._get_res_mock(_service="a", _order=1)
+        b = self._get_res_mock(_service="b", _order=2)
+        c = self._get_res_mock(_service="c", _order=3)
+
+        families, dependencies = manager._get_families_graph([a, b, c])
+
+        self.assertEqual({"a": {"b"}, "b": {"c"}, "c": set()}, dependencies)
+        mock_log.warning.assert_called_once_with(
+            "Cleanup dependency of c on a is ignored since a already "
+            "depends on c.")
+
+    def test__run_families(self):
+        nova = self._get_res_mock(_service="nova")
+        neutron = self._get_res_mock(_service="neutron")
+        glance = self._get_res_mock(_service="glance")
+        processed = []
+
+        def process(mgr):
+            if mgr is glance:
+                raise Exception("Broken")
+            processed.append(mgr)
+
+        manager._run_families(
+            [("nova", [nova]), ("neutron", [neutron]), ("glance", [glance])],
+            {"nova": set(), "neutron": {"nova"}, "glance": set()}, process,
+            concurrency=2)
+
+        self.assertEqual([nova, neutron], processed)
+
+    @mock.patch("rally.common.plugin.discover.itersubclasses",
+                return_value=[])
+    @mock.patch("%s.SeekAndDestroy" % BASE)
+    @mock.patch("%s.find_resource_managers" % BASE)
+    @mock.patch("%s.cleanup_journal.Journal.for_cleanup" % BASE)
+    @mock.patch("%s.CONF" % BASE)
+    def test_cleanup_with_journal(self, mock_conf, mock_journal_for_cleanup,
+                                  mock_find_resource_managers,
+                                  mock_seek_and_destroy,
+                                  mock_itersubclasses):
+        mock_conf.openstack.cleanup_families_concurrency = 1
+        journal = mock_journal_for_cleanup.return_value
+        destroyer = mock_seek_and_destroy.return_value
+        destroyer.stats = {"discovered": 1, "deleted": 1, "failed": 0}
+        destroyer.errors = []
+        mock_find_resource_managers.return_value = [
+            self._get_res_mock(_service="nova", _order=200)]
+
+        manager.cleanup(names=["nova"], admin="admin", task_id="task_id")
+
+        mock_journal_for_cleanup.assert_called_once_with(
+            "task_id", names=["nova"], admin_required=None,
+            superclass=plugin.Plugin, resume=False)
+        self.assertEqual(journal,
+                         mock_seek_and_destroy.call_args[1]["journal"])
+        journal.close.assert_called_once_with(remove=True)
+
+        # keep the journal if something is not deleted
+        journal.close.reset_mock()
+        destroyer.errors = [{"message": "Timeout"}]
+        manager.cleanup(names=["nova"], admin="admin", task_id="task_id")
+        journal.close.assert_called_once_with(remove=False)
+
+        # keep the journal if cleanup is interrupted
+        journal.close.reset_mock()
+        destroyer.exterminate.side_effect = KeyboardInterrupt
+        self.assertRaises(KeyboardInterrupt, manager.cleanup,
+                          names=["nova"], admin="admin", task_id="task_id")
+        journal.close.assert_called_once_with(remove=False)
+
+    @mock.patch("rally.common.plugin.discover.itersubclasses")
+    @mock.patch("%s.SeekAndDestroy" % BASE)
+    @mock.patch("%s._run_families" % BASE)
+    @mock.patch("%s.find_resource_managers" % BASE)
+    @mock.patch("%s.CONF" % BASE)
+    def test_cleanup_in_parallel(self, mock_conf, mock_find_resource_managers,
+                                 mock__run_families, mock_seek_and_destroy,
+                                 mock_itersubclasses):
+        mock_conf.openstack.cleanup_families_concurrency = 3
+        nova = self._get_res_mock(_service="nova", _order=200)
+        glance = self._get_res_mock(_service="glance", _order=500)
+        mock_find_resource_managers.return_value = [nova, glance]
+        mock_itersubclasses.return_value = []
+
+        manager.cleanup(names=["nova", "glance"], admin="admin",
+                        users=["user"], task_id="task_id")
+
+        mock__run_families.assert_called_once_with(
+            [("nova", [nova]), ("glance", [glance])],
+            {"nova": set(), "glance": set()}, mock.ANY, 3)
+        self.assertFalse(mock_seek_and_destroy.called)
+
+        process = mock__run_families.call_args[0][2]
+        process(nova)
+        mock_seek_and_destroy.assert_called_once_with(
+            nova, "admin", ["user"], api_versions=None, resource_classes=[],
+            task_id="task_id", all_tenants=False, journal=mock.ANY)
+        self.assertTrue(mock_seek_and_destroy.return_value.exterminate.called)
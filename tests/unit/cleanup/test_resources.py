@@ -85,6 +85,18 @@ class NovaServerTestCase(test.TestCase):
 
         server._manager.return_value.list.assert_called_once_with(limit=-1)
 
+    def test_list_all_tenants(self):
+        admin = mock.MagicMock()
+        servers = [mock.Mock(tenant_id="t1"), mock.Mock(tenant_id="t2"),
+                   mock.Mock(tenant_id="t1")]
+        admin.nova.return_value.servers.list.return_value = servers
+
+        server = resources.NovaServer(admin=admin)
+        self.assertEqual({"t1": [servers[0], servers[2]], "t2": [servers[1]]},
+                         server.list_all_tenants())
+        admin.nova.return_value.servers.list.assert_called_once_with(
+            search_opts={"all_tenants": True}, limit=-1)
+
     def test_delete(self):
         server = resources.NovaServer()
         server.raw_resource = mock.Mock()
@@ -263,6 +275,23 @@ class NeutronMixinTestCase(test.TestCase):
         neut.user.neutron().list_some_resources.assert_called_once_with(
             tenant_id=neut.tenant_uuid)
 
+    def test_list_all_tenants(self):
+        neut = self.get_neutron_mixin()
+        neut.admin = mock.MagicMock()
+        neut._resource = "some_resource"
+
+        some_resources = [{"tenant_id": "a", "id": 1},
+                          {"project_id": "b", "id": 2},
+                          {"tenant_id": "a", "id": 3}]
+        neut.admin.neutron().list_some_resources.return_value = {
+            "some_resources": some_resources
+        }
+
+        self.assertEqual({"a": [some_resources[0], some_resources[2]],
+                          "b": [some_resources[1]]},
+                         neut.list_all_tenants())
+        neut.admin.neutron().list_some_resources.assert_called_once_with()
+
 
 class NeutronLbaasV1MixinTestCase(test.TestCase):
 
@@ -430,8 +459,7 @@ class NeutronTrunkTestcase(test.TestCase):
         user.neutron().list_trunks.return_value = {
             "trunks": ["trunk"]}
         self.assertEqual(["trunk"], trunk.list())
-        user.neutron().list_trunks.assert_called_once_with(
-            tenant_id=None)
+        user.neutron().list_trunks.assert_called_once_with()
 
     def test_list_with_not_found(self):
 
@@ -443,8 +471,7 @@ class NeutronTrunkTestcase(test.TestCase):
         user.neutron().list_trunks.side_effect = NotFound()
 
         self.assertEqual([], trunk.list())
-        user.neutron().list_trunks.assert_called_once_with(
-            tenant_id=None)
+        user.neutron().list_trunks.assert_called_once_with()
 
 
 class NeutronPortTestCase(test.TestCase):
@@ -675,6 +702,19 @@ class GlanceImageTestCase(test.TestCase):
             mock.call(owner=glance.tenant_uuid),
             mock.call(status="deactivated", owner=glance.tenant_uuid)])
 
+    def test_list_all_tenants(self):
+        glance = resources.GlanceImage()
+        glance._client = mock.Mock()
+        images = [mock.Mock(owner="t1"), mock.Mock(owner="t2"),
+                  mock.Mock(owner="t1")]
+        list_images = glance._client.return_value.list_images
+        list_images.side_effect = (images[:2], images[2:])
+
+        self.assertEqual({"t1": [images[0], images[2]], "t2": [images[1]]},
+                         glance.list_all_tenants())
+        list_images.assert_has_calls([mock.call(),
+                                      mock.call(status="deactivated")])
+
     def test_delete(self):
         glance = resources.GlanceImage()
         glance._client = mock.Mock()
@@ -806,6 +846,11 @@ class KeystoneEc2TestCase(test.TestCase):
             identity.list_ec2credentials.assert_called_once_with(
                 manager.user_id)
 
+    def test_list_without_user(self):
+        manager = resources.KeystoneEc2(admin=mock.Mock())
+
+        self.assertEqual([], manager.list())
+
     def test_delete(self):
         user_client = mock.Mock()
         admin_client = mock.Mock()
@@ -1101,6 +1146,43 @@ class WatcherActionPlanTestCase(test.TestCase):
         watcher._manager().list.assert_called_once_with(limit=0)
 
 
+class CinderVolumeTestCase(test.TestCase):
+
+    def test_list_all_tenants(self):
+        admin = mock.MagicMock()
+        volumes = [mock.Mock(), mock.Mock(), mock.Mock()]
+        for volume, tenant_id in zip(volumes, ("t1", "t2", "t1")):
+            setattr(volume, "os-vol-tenant-attr:tenant_id", tenant_id)
+        admin.cinder.return_value.volumes.list.return_value = volumes
+
+        manager = resources.CinderVolume(admin=admin)
+
+        self.assertEqual({"t1": [volumes[0], volumes[2]],
+                          "t2": [volumes[1]]},
+                         manager.list_all_tenants())
+        admin.cinder.return_value.volumes.list.assert_called_once_with(
+            search_opts={"all_tenants": True})
+
+
+class CinderVolumeSnapshotTestCase(test.TestCase):
+
+    def test_list_all_tenants(self):
+        admin = mock.MagicMock()
+        snapshots = [mock.Mock(), mock.Mock()]
+        for snapshot, tenant_id in zip(snapshots, ("t1", "t2")):
+            setattr(snapshot, "os-extended-snapshot-attributes:project_id",
+                    tenant_id)
+        cinder = admin.cinder.return_value
+        cinder.volume_snapshots.list.return_value = snapshots
+
+        manager = resources.CinderVolumeSnapshot(admin=admin)
+
+        self.assertEqual({"t1": [snapshots[0]], "t2": [snapshots[1]]},
+                         manager.list_all_tenants())
+        cinder.volume_snapshots.list.assert_called_once_with(
+            search_opts={"all_tenants": True})
+
+
 class CinderImageVolumeCacheTestCase(test.TestCase):
 
     class Resource(object):
@@ -46,7 +46,8 @@ class UserCleanupTestCase(test.TestCase):
 
     @mock.patch("rally.common.plugin.discover.itersubclasses")
     @mock.patch("%s.manager.find_resource_managers" % ADMIN,
-                return_value=[mock.MagicMock(), mock.MagicMock()])
+                return_value=[mock.MagicMock(_order=1, _service="a"),
+                              mock.MagicMock(_order=2, _service="b")])
     @mock.patch("%s.manager.SeekAndDestroy" % ADMIN)
     def test_cleanup(self, mock_seek_and_destroy, mock_find_resource_managers,
                      mock_itersubclasses):
@@ -55,6 +56,9 @@ class UserCleanupTestCase(test.TestCase):
             pass
 
         mock_itersubclasses.return_value = [ResourceClass]
+        mock_seek_and_destroy.return_value.stats = {
+            "discovered": 0, "deleted": 0, "failed": 0}
+        mock_seek_and_destroy.return_value.errors = []
 
         ctx = {
             "config": {"cleanup": ["a", "b"]},
@@ -71,10 +75,12 @@ class UserCleanupTestCase(test.TestCase):
         mock_seek_and_destroy.assert_has_calls([
             mock.call(mock_find_resource_managers.return_value[0],
                       None, ctx["users"], api_versions=None,
-                      resource_classes=[ResourceClass], task_id="task_id"),
+                      resource_classes=[ResourceClass], task_id="task_id",
+                      all_tenants=False, journal=mock.ANY),
             mock.call().exterminate(),
             mock.call(mock_find_resource_managers.return_value[1],
                       None, ctx["users"], api_versions=None,
-                      resource_classes=[ResourceClass], task_id="task_id"),
+                      resource_classes=[ResourceClass], task_id="task_id",
+                      all_tenants=False, journal=mock.ANY),
             mock.call().exterminate()
         ])
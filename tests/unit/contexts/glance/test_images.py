@@ -14,10 +14,13 @@
 
 
 import copy
+import os
+import tempfile
 
 import ddt
 import mock
 
+from rally import exceptions
 from rally_openstack.contexts.glance import images
 from tests.unit import test
 
@@ -210,6 +213,98 @@ class ImageGeneratorTestCase(test.ScenarioTestCase):
         # specified, warning message should be printed.
         self.assertEqual(expected_warns, mock_log.warning.call_args_list)
 
+    def _setup_context(self, tenants, images_per_tenant=1):
+        self.context.update({
+            "config": {
+                "images": {
+                    "image_url": "http://example.com/fake/url",
+                    "disk_format": "qcow2",
+                    "container_format": "bare",
+                    "images_per_tenant": images_per_tenant}},
+            "users": [{"tenant_id": str(i), "credential": mock.MagicMock()}
+                      for i in range(tenants)],
+            "tenants": self._gen_tenants(tenants)
+        })
+
+    @mock.patch("%s.requests" % CTX)
+    @mock.patch("%s.osclients.Clients" % CTX)
+    def test_setup_downloads_image_once(self, mock_clients, mock_requests):
+        mock_clients.return_value.glance.choose_version.return_value = "2"
+        response = mock_requests.get.return_value
+        response.status_code = 200
+        response.iter_content.return_value = [b"foo", b"bar"]
+        image_service = self.mock_image.return_value
+        uploaded = []
+
+        def create_image(image_location, **kwargs):
+            with open(image_location, "rb") as f:
+                uploaded.append((image_location, f.read()))
+            return mock.Mock(id="image-%s" % len(uploaded))
+
+        image_service.create_image.side_effect = create_image
+        self._setup_context(tenants=3, images_per_tenant=2)
+
+        images.ImageGenerator(self.context).setup()
+
+        mock_requests.get.assert_called_once_with(
+            "http://example.com/fake/url", stream=True)
+        self.assertEqual(6, len(uploaded))
+        self.assertEqual({b"foobar"}, set(data for path, data in uploaded))
+        image_path = uploaded[0][0]
+        self.assertEqual({image_path}, set(path for path, d in uploaded))
+        self.assertFalse(os.path.exists(image_path))
+        for tenant in self.context["tenants"].values():
+            self.assertEqual(2, len(tenant["images"]))
+
+    @ddt.data({"tenants": 1, "version": "2"},
+              {"tenants": 2, "version": "1"})
+    @ddt.unpack
+    @mock.patch("%s.requests" % CTX)
+    @mock.patch("%s.osclients.Clients" % CTX)
+    def test_setup_does_not_download_image(self, mock_clients, mock_requests,
+                                           tenants, version):
+        mock_clients.return_value.glance.choose_version.return_value = version
+        image_service = self.mock_image.return_value
+        self._setup_context(tenants=tenants)
+
+        images.ImageGenerator(self.context).setup()
+
+        self.assertFalse(mock_requests.get.called)
+        self.assertEqual(
+            [mock.call(image_name=None, container_format="bare",
+                       image_location="http://example.com/fake/url",
+                       disk_format="qcow2", visibility="private",
+                       min_disk=0, min_ram=0)] * tenants,
+            image_service.create_image.call_args_list)
+
+    @mock.patch("%s.tempfile" % CTX)
+    @mock.patch("%s.requests" % CTX)
+    def test__download_image_fails(self, mock_requests, mock_tempfile):
+        fd, path = tempfile.mkstemp()
+        mock_tempfile.mkstemp.return_value = (fd, path)
+        mock_requests.get.return_value.status_code = 404
+        images_ctx = images.ImageGenerator(self.context)
+
+        self.assertRaises(exceptions.RallyException,
+                          images_ctx._download_image, "http://example.com")
+        mock_tempfile.mkstemp.assert_called_once_with(prefix="rally-image-")
+        self.assertFalse(os.path.exists(path))
+        mock_requests.get.return_value.close.assert_called_once_with()
+
+    @mock.patch("rally_openstack.broker.LOG")
+    @mock.patch("%s.osclients.Clients" % CTX)
+    def test_setup_fails(self, mock_clients, mock_log):
+        image_service = self.mock_image.return_value
+        image_service.create_image.side_effect = [
+            mock.Mock(id="image"), exceptions.TimeoutException(
+                desired_status="active", resource_name="image",
+                resource_type="Image", resource_id="id", timeout=1,
+                resource_status="queued")]
+        self._setup_context(tenants=2)
+
+        self.assertRaises(exceptions.TimeoutException,
+                          images.ImageGenerator(self.context).setup)
+
     @ddt.data({"admin": True})
     @ddt.unpack
     @mock.patch("%s.resource_manager.cleanup" % CTX)
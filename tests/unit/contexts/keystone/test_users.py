@@ -13,11 +13,17 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import threading
+import time
+
+import ddt
 import mock
 
 from rally import exceptions
 from rally_openstack.contexts.keystone import users
 from rally_openstack import credential as oscredential
+from rally_openstack import osclients
 from tests.unit import test
 
 from rally_openstack import consts
@@ -98,7 +104,8 @@ class UserGeneratorBaseTestCase(test.ScenarioTestCase):
         self.assertEqual([foo_user], user_generator.existing_users)
         self.assertEqual({"user_choice_method": "foo"}, user_generator.config)
 
-    def test_setup(self):
+    @mock.patch("%s.osclients.NEUTRON_EXTENSIONS" % CTX)
+    def test_setup(self, mock_neutron_extensions):
         user_generator = users.UserGenerator(self.context)
         user_generator.use_existing_users = mock.Mock()
         user_generator.create_users = mock.Mock()
@@ -121,6 +128,8 @@ class UserGeneratorBaseTestCase(test.ScenarioTestCase):
 
         user_generator.use_existing_users.assert_called_once_with()
         self.assertFalse(user_generator.create_users.called)
+        self.assertEqual([mock.call(), mock.call()],
+                         mock_neutron_extensions.invalidate.call_args_list)
 
     def test_cleanup(self):
         user_generator = users.UserGenerator(self.context)
@@ -173,36 +182,21 @@ class UserGeneratorForExistingUsersTestCase(test.ScenarioTestCase):
                      "deployment_uuid": self.deployment_uuid}
         })
 
-    @mock.patch("%s.credential.OpenStackCredential" % CTX)
     @mock.patch("%s.osclients.Clients" % CTX)
-    def test_use_existing_users(self, mock_clients,
-                                mock_open_stack_credential):
-        user1 = {"tenant_name": "proj", "username": "usr",
-                 "password": "pswd", "auth_url": "https://example.com"}
-        user2 = {"tenant_name": "proj", "username": "usr",
-                 "password": "pswd", "auth_url": "https://example.com"}
-        user3 = {"tenant_name": "proj", "username": "usr",
-                 "password": "pswd", "auth_url": "https://example.com"}
-
-        user_list = [user1, user2, user3]
-
-        class AuthRef(object):
-            USER_ID_COUNT = 0
-            PROJECT_ID_COUNT = 0
-
-            @property
-            def user_id(self):
-                self.USER_ID_COUNT += 1
-                return "u%s" % self.USER_ID_COUNT
+    def test_use_existing_users(self, mock_clients):
+        user_list = [{"tenant_name": "proj%s" % (i % 2),
+                      "username": "usr%s" % i,
+                      "password": "pswd",
+                      "auth_url": "https://example.com"} for i in range(3)]
 
-            @property
-            def project_id(self):
-                self.PROJECT_ID_COUNT += 1
-                return "p%s" % (self.PROJECT_ID_COUNT % 2)
+        def get_clients(user_credential):
+            clients = mock.Mock()
+            auth_ref = clients.keystone.auth_ref
+            auth_ref.user_id = "u-%s" % user_credential.username
+            auth_ref.project_id = "p-%s" % user_credential.tenant_name
+            return clients
 
-        auth_ref = AuthRef()
-
-        mock_clients.return_value.keystone.auth_ref = auth_ref
+        mock_clients.side_effect = get_clients
 
         self.platforms["openstack"]["users"] = user_list
 
@@ -214,18 +208,89 @@ class UserGeneratorForExistingUsersTestCase(test.ScenarioTestCase):
         self.assertIn("user_choice_method", self.context)
         self.assertEqual("random", self.context["user_choice_method"])
 
-        creds = mock_open_stack_credential.return_value
         self.assertEqual(
-            [{"id": "u1", "credential": creds, "tenant_id": "p1"},
-             {"id": "u2", "credential": creds, "tenant_id": "p0"},
-             {"id": "u3", "credential": creds, "tenant_id": "p1"}],
-            self.context["users"]
-        )
-        self.assertEqual({"p0": {"id": "p0", "name": creds.tenant_name},
-                          "p1": {"id": "p1", "name": creds.tenant_name}},
+            [("u-usr0", "p-proj0", "usr0"),
+             ("u-usr1", "p-proj1", "usr1"),
+             ("u-usr2", "p-proj0", "usr2")],
+            [(u["id"], u["tenant_id"], u["credential"].username)
+             for u in self.context["users"]])
+        self.assertEqual({"p-proj0": {"id": "p-proj0", "name": "proj0"},
+                          "p-proj1": {"id": "p-proj1", "name": "proj1"}},
                          self.context["tenants"])
+        self.assertEqual(3, mock_clients.call_count)
+
+    @mock.patch("rally_openstack.osclients.Keystone.get_session")
+    def test_use_existing_users_authenticates_concurrently(
+            self, mock_keystone_get_session):
+        users_count = 5
+        auth_latency = 0.2
+        lock = threading.Lock()
+        active = {"current": 0, "max": 0}
+
+        def get_session(version=None):
+            def get_access(session):
+                with lock:
+                    active["current"] += 1
+                    active["max"] = max(active["max"], active["current"])
+                # time.sleep is mocked by the base test case
+                threading.Event().wait(auth_latency)
+                with lock:
+                    active["current"] -= 1
+                plugin.auth_ref = mock.Mock(
+                    user_id="u-%s" % id(plugin), project_id="p",
+                    **{"will_expire_soon.return_value": False})
+                return plugin.auth_ref
+
+            plugin = mock.Mock(auth_ref=None, get_access=get_access)
+            return mock.Mock(), plugin
+
+        mock_keystone_get_session.side_effect = get_session
+        self.platforms["openstack"]["users"] = [
+            {"tenant_name": "proj", "username": "usr%s" % i,
+             "password": "pswd", "auth_url": "https://example.com"}
+            for i in range(users_count)]
 
+        user_generator = users.UserGenerator(self.context)
+        self.context.update({"users": [], "tenants": {}})
+        started_at = time.time()
+        with mock.patch("%s.osclients" % CTX, new=osclients):
+            user_generator.use_existing_users()
+        duration = time.time() - started_at
+
+        self.assertEqual(users_count, len(self.context["users"]))
+        self.assertEqual(users_count,
+                         len(set(u["id"] for u in self.context["users"])))
+        self.assertGreater(active["max"], 1)
+        self.assertLess(duration, users_count * auth_latency)
+
+    @mock.patch("rally_openstack.broker.LOG.warning")
+    @mock.patch("%s.osclients.Clients" % CTX)
+    def test_use_existing_users_auth_fails(self, mock_clients,
+                                           mock_log_warning):
+        error = exceptions.AuthenticationFailed(
+            username="usr1", project="proj", url="https://example.com",
+            etype="Unauthorized", error="Invalid credentials")
+
+        def get_clients(user_credential):
+            clients = mock.Mock()
+            if user_credential.username == "usr1":
+                type(clients.keystone).auth_ref = mock.PropertyMock(
+                    side_effect=error)
+            return clients
+
+        mock_clients.side_effect = get_clients
+        self.platforms["openstack"]["users"] = [
+            {"tenant_name": "proj", "username": "usr%s" % i,
+             "password": "pswd", "auth_url": "https://example.com"}
+            for i in range(3)]
 
+        user_generator = users.UserGenerator(self.context)
+        self.assertRaises(exceptions.AuthenticationFailed,
+                          user_generator.setup)
+        self.assertEqual([], self.context["users"])
+
+
+@ddt.ddt
 class UserGeneratorForNewUsersTestCase(test.ScenarioTestCase):
 
     tenants_num = 1
@@ -376,6 +441,79 @@ class UserGeneratorForNewUsersTestCase(test.ScenarioTestCase):
             self.assertIn("credential", user)
             self.assertEqual("TrustMe", user["credential"]["password"])
 
+    @mock.patch("%s.identity" % CTX)
+    def test__create_tenants_and_users(self, mock_identity):
+        identity_service = mock_identity.Identity.return_value
+        identity_service.create_project.side_effect = [
+            mock.Mock(id="t%s" % i) for i in range(3)]
+        self.context["config"]["users"]["tenants"] = 3
+        self.context["config"]["users"]["users_per_tenant"] = 2
+        user_generator = users.UserGenerator(self.context)
+
+        tenants, users_ = user_generator._create_tenants_and_users(2)
+
+        self.assertEqual({"t0", "t1", "t2"}, set(tenants))
+        self.assertEqual(6, len(users_))
+        self.assertEqual(
+            {"t0": 2, "t1": 2, "t2": 2},
+            collections.Counter(u["tenant_id"] for u in users_))
+        for user in users_:
+            self.assertEqual(tenants[user["tenant_id"]]["name"],
+                             user["credential"]["tenant_name"])
+
+    @mock.patch("%s.LOG" % CTX)
+    @mock.patch("%s.identity" % CTX)
+    def test__create_tenants_and_users_user_fails(self, mock_identity,
+                                                  mock_log):
+        identity_service = mock_identity.Identity.return_value
+        identity_service.create_user.side_effect = [
+            Exception(), mock.Mock(id="u1")]
+        self.context["config"]["users"]["users_per_tenant"] = 2
+        user_generator = users.UserGenerator(self.context)
+
+        tenants, users_ = user_generator._create_tenants_and_users(1)
+
+        self.assertEqual(1, len(tenants))
+        self.assertEqual(["u1"], [u["id"] for u in users_])
+        self.assertTrue(mock_log.warning.called)
+
+    @ddt.data({"pipelined": True, "tenants": 2, "workers": 2,
+               "expected": True},
+              {"pipelined": True, "tenants": 2, "workers": 3,
+               "expected": False},
+              {"pipelined": False, "tenants": 2, "workers": 2,
+               "expected": False})
+    @ddt.unpack
+    @mock.patch("%s.CONF" % CTX)
+    def test_create_users_pipelined(self, mock_conf, pipelined, tenants,
+                                    workers, expected):
+        self.context["config"]["users"].update(
+            {"tenants": tenants, "users_per_tenant": 1,
+             "resource_management_workers": workers})
+        user_generator = users.UserGenerator(self.context)
+        tenants_dict = {"t1": {"id": "t1", "name": "t1", "users": []},
+                        "t2": {"id": "t2", "name": "t2", "users": []}}
+        users_ = [{"id": "u1", "tenant_id": "t1"},
+                  {"id": "u2", "tenant_id": "t2"}]
+        user_generator._create_tenants_and_users = mock.Mock(
+            return_value=(tenants_dict, users_))
+        user_generator._create_tenants = mock.Mock(return_value=tenants_dict)
+        user_generator._create_users = mock.Mock(return_value=users_)
+        mock_conf.openstack.users_context_pipelined = pipelined
+
+        user_generator.create_users()
+
+        self.assertEqual(users_, user_generator.context["users"])
+        self.assertEqual([users_[0]], tenants_dict["t1"]["users"])
+        if expected:
+            user_generator._create_tenants_and_users.assert_called_once_with(
+                2)
+            self.assertFalse(user_generator._create_tenants.called)
+        else:
+            self.assertFalse(user_generator._create_tenants_and_users.called)
+            user_generator._create_tenants.assert_called_once_with(2)
+            user_generator._create_users.assert_called_once_with(2)
+
     @mock.patch("%s.identity" % CTX)
     def test__delete_tenants(self, mock_identity):
         user_generator = users.UserGenerator(self.context)
@@ -402,6 +540,9 @@ class UserGeneratorForNewUsersTestCase(test.ScenarioTestCase):
         user_generator.context["users"] = [user1, user2]
         user_generator._delete_users()
         self.assertEqual(0, len(user_generator.context["users"]))
+        self.assertEqual(
+            [mock.call(user1["credential"]), mock.call(user2["credential"])],
+            self.osclients.SESSION_POOL.discard.call_args_list)
 
     @mock.patch("%s.identity" % CTX)
     def test__delete_users_failure(self, mock_identity):
@@ -431,7 +572,7 @@ class UserGeneratorForNewUsersTestCase(test.ScenarioTestCase):
         self.assertEqual(0, len(ctx.context["users"]))
         self.assertEqual(0, len(ctx.context["tenants"]))
 
-    @mock.patch("rally.common.broker.LOG.warning")
+    @mock.patch("rally_openstack.broker.LOG.warning")
     @mock.patch("%s.identity" % CTX)
     def test_setup_and_cleanup_with_error_during_create_user(
             self, mock_identity, mock_log_warning):
@@ -51,15 +51,30 @@ class AllowSSHContextTestCase(test.TestCase):
             "tenants": {"uuid1": {"id": "uuid1", "name": "uuid1"}},
         })
 
-    @mock.patch("%s.osclients.Clients" % CTX)
-    def test__prepare_open_secgroup_rules(self, mock_clients):
-        fake_neutron = mock_clients.return_value.neutron.return_value
+    def test__prepare_open_secgroup_rules(self):
+        credential = mock.MagicMock()
+        fake_neutron = credential.clients.return_value.neutron.return_value
         fake_neutron.list_security_groups.return_value = {
             "security_groups": [{"id": "id", "name": "foo",
                                  "security_group_rules": []}]}
 
-        allow_ssh._prepare_open_secgroup("credential", self.secgroup_name)
-        allow_ssh._prepare_open_secgroup("credential", "foo")
+        allow_ssh._prepare_open_secgroup(credential, self.secgroup_name)
+        allow_ssh._prepare_open_secgroup(credential, "foo")
+
+    def test__prepare_open_secgroup_without_lookup(self):
+        credential = mock.Mock()
+        fake_neutron = credential.clients.return_value.neutron.return_value
+        fake_neutron.create_security_group.return_value = {
+            "security_group": {"id": "id", "name": "foo",
+                               "security_group_rules": []}}
+
+        secgroup = allow_ssh._prepare_open_secgroup(credential, "foo",
+                                                    lookup=False)
+
+        self.assertEqual("id", secgroup["id"])
+        self.assertFalse(fake_neutron.list_security_groups.called)
+        self.assertEqual(
+            3, fake_neutron.create_security_group_rule.call_count)
 
     @mock.patch("%s.osclients.Clients" % CTX)
     @mock.patch("%s._prepare_open_secgroup" % CTX)
@@ -76,6 +91,7 @@ class AllowSSHContextTestCase(test.TestCase):
         mock_clients.return_value = mock.MagicMock()
 
         secgrp_ctx = allow_ssh.AllowSSH(self.ctx_with_secgroup)
+        secgrp_ctx.generate_random_name = mock.Mock()
         secgrp_ctx.setup()
         self.assertEqual(self.ctx_with_secgroup, secgrp_ctx.context)
         secgrp_ctx.cleanup()
@@ -91,6 +107,10 @@ class AllowSSHContextTestCase(test.TestCase):
 
         mock_network_wrap.assert_called_once_with(
             mock_clients.return_value, secgrp_ctx, config={})
+        # one security group per tenant
+        mock__prepare_open_secgroup.assert_called_once_with(
+            "credential", secgrp_ctx.generate_random_name.return_value,
+            lookup=False)
 
     @mock.patch("%s.osclients.Clients" % CTX)
     @mock.patch("rally_openstack.wrappers.network.wrap")
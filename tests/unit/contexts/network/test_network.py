@@ -91,7 +91,7 @@ class NetworkTestCase(test.TestCase):
                       router_create_args={"external": True},
                       **dns_kwargs)
             for user, tenant in mock_utils.iterate_per_tenants.return_value]
-        mock_create.assert_has_calls(create_calls)
+        mock_create.assert_has_calls(create_calls, any_order=True)
 
         mock_utils.iterate_per_tenants.assert_called_once_with(
             net_context.context["users"])
@@ -108,6 +108,32 @@ class NetworkTestCase(test.TestCase):
     def test_cleanup(self, mock_wrap, mock_clients):
         net_context = network_context.Network(self.get_context())
         net_context.cleanup()
-        mock_wrap().delete_network.assert_has_calls(
-            [mock.call({"id": "foo_net"}), mock.call({"id": "bar_net"})],
+        mock_wrap().delete_networks.assert_has_calls(
+            [mock.call([{"id": "foo_net"}]), mock.call([{"id": "bar_net"}])],
             any_order=True)
+
+    @mock.patch("%s.LOG" % network_context.__name__)
+    @mock.patch("rally_openstack.osclients.Clients")
+    @mock.patch(NET + "wrap")
+    def test_cleanup_fails(self, mock_wrap, mock_clients, mock_log):
+        mock_wrap.return_value.delete_networks.side_effect = [
+            Exception("Boom"), None]
+        ctx = self.get_context()
+        ctx["tenants"]["baz_tenant"] = {}
+        net_context = network_context.Network(ctx)
+
+        net_context.cleanup()
+
+        self.assertEqual(2, mock_wrap.return_value.delete_networks.call_count)
+        self.assertTrue(mock_log.warning.called)
+
+    @mock.patch("rally_openstack.broker.LOG")
+    @mock.patch("rally_openstack.osclients.Clients")
+    @mock.patch(NET + "wrap")
+    def test_setup_fails(self, mock_wrap, mock_clients, mock_log):
+        mock_wrap.return_value.create_network.side_effect = Exception("Boom")
+        net_context = network_context.Network(self.get_context())
+
+        e = self.assertRaises(Exception, net_context.setup)
+        self.assertEqual("Boom", str(e))
+        self.assertEqual(2, mock_wrap.return_value.create_network.call_count)
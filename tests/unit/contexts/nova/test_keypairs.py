@@ -14,6 +14,7 @@
 #    under the License.
 
 import mock
+from novaclient import exceptions as nova_exc
 
 from rally_openstack.contexts.nova import keypairs
 from tests.unit import test
@@ -57,16 +58,28 @@ class KeyPairContextTestCase(test.TestCase):
 
     def test_keypair_setup(self):
         keypair_ctx = keypairs.Keypair(self.ctx_without_keys)
-        keypair_ctx._generate_keypair = mock.Mock(side_effect=[
-            {"id": "key_id_1", "key": "key_1", "name": "key_name_1"},
-            {"id": "key_id_2", "key": "key_2", "name": "key_name_2"},
-        ])
+        keys = {
+            "credential_1": {"id": "key_id_1", "key": "key_1",
+                             "name": "key_name_1"},
+            "credential_2": {"id": "key_id_2", "key": "key_2",
+                             "name": "key_name_2"}}
+        keypair_ctx._generate_keypair = mock.Mock(side_effect=keys.get)
 
         keypair_ctx.setup()
         self.assertEqual(keypair_ctx.context, self.ctx_with_keys)
 
         keypair_ctx._generate_keypair.assert_has_calls(
-            [mock.call("credential_1"), mock.call("credential_2")])
+            [mock.call("credential_1"), mock.call("credential_2")],
+            any_order=True)
+
+    @mock.patch("rally_openstack.broker.LOG")
+    def test_keypair_setup_fails(self, mock_log):
+        keypair_ctx = keypairs.Keypair(self.ctx_without_keys)
+        keypair_ctx._generate_keypair = mock.Mock(
+            side_effect=[{"id": "key_id_1"}, nova_exc.Forbidden(403)])
+
+        self.assertRaises(nova_exc.Forbidden, keypair_ctx.setup)
+        self.assertEqual(2, keypair_ctx._generate_keypair.call_count)
 
     @mock.patch("%s.keypairs.resource_manager.cleanup" % CTX)
     def test_keypair_cleanup(self, mock_cleanup):
@@ -78,9 +91,10 @@ class KeyPairContextTestCase(test.TestCase):
             superclass=keypairs.Keypair,
             task_id=self.ctx_with_keys["task"]["uuid"])
 
-    @mock.patch("rally_openstack.osclients.Clients")
-    def test_keypair_generate(self, mock_clients):
-        mock_keypairs = mock_clients.return_value.nova.return_value.keypairs
+    def test_keypair_generate(self):
+        credential = mock.Mock()
+        mock_keypairs = credential.clients.return_value.nova.return_value.\
+            keypairs
         mock_keypair = mock_keypairs.create.return_value
         mock_keypair.public_key = "public_key"
         mock_keypair.private_key = "private_key"
@@ -88,7 +102,7 @@ class KeyPairContextTestCase(test.TestCase):
         keypair_ctx = keypairs.Keypair(self.ctx_without_keys)
         keypair_ctx.generate_random_name = mock.Mock()
 
-        key = keypair_ctx._generate_keypair("credential")
+        key = keypair_ctx._generate_keypair(credential)
 
         self.assertEqual({
             "id": "key_id",
@@ -97,7 +111,31 @@ class KeyPairContextTestCase(test.TestCase):
             "public": "public_key"
         }, key)
 
-        mock_clients.assert_has_calls([
-            mock.call().nova().keypairs.create(
-                keypair_ctx.generate_random_name.return_value),
-        ])
+        mock_keypairs.create.assert_called_once_with(
+            keypair_ctx.generate_random_name.return_value)
+        self.assertFalse(mock_keypairs.list.called)
+
+    def test_keypair_generate_name_conflict(self):
+        credential = mock.Mock()
+        mock_keypairs = credential.clients.return_value.nova.return_value.\
+            keypairs
+        mock_keypair = mock.Mock(public_key="public_key",
+                                 private_key="private_key", id="key_id")
+        mock_keypairs.create.side_effect = [nova_exc.Conflict(409),
+                                            mock_keypair]
+        keypair_ctx = keypairs.Keypair(self.ctx_without_keys)
+        keypair_ctx.generate_random_name = mock.Mock(
+            side_effect=["name_1", "name_2"])
+
+        key = keypair_ctx._generate_keypair(credential)
+
+        self.assertEqual("name_2", key["name"])
+        mock_keypairs.create.assert_has_calls([mock.call("name_1"),
+                                               mock.call("name_2")])
+
+        keypair_ctx.generate_random_name.side_effect = None
+        mock_keypairs.create.side_effect = nova_exc.Conflict(409)
+        self.assertRaises(nova_exc.Conflict,
+                          keypair_ctx._generate_keypair, credential)
+        self.assertEqual(2 + keypair_ctx.CREATE_ATTEMPTS,
+                         mock_keypairs.create.call_count)
@@ -17,6 +17,7 @@ import copy
 
 import mock
 
+from rally import exceptions
 from rally_openstack.contexts.nova import servers
 from rally_openstack.scenarios.nova import utils as nova_utils
 from tests.unit import fakes
@@ -122,6 +123,34 @@ class ServerGeneratorTestCase(test.ScenarioTestCase):
                       for i in range(called_times)]
         mock_nova_scenario__boot_servers.assert_has_calls(mock_calls)
 
+    @mock.patch("rally_openstack.broker.LOG")
+    @mock.patch("%s.nova.utils.NovaScenario._boot_servers" % SCN)
+    @mock.patch("%s.GlanceImage" % TYP)
+    @mock.patch("%s.Flavor" % TYP)
+    def test_setup_fails(self, mock_flavor, mock_glance_image,
+                         mock_nova_scenario__boot_servers, mock_log):
+        error = exceptions.GetResourceErrorStatus(
+            resource="server", status="ERROR", fault="")
+        mock_nova_scenario__boot_servers.side_effect = [
+            [fakes.FakeServer(id="uuid")], error]
+        self.context.update({
+            "config": {
+                "servers": {
+                    "servers_per_tenant": 1,
+                    "image": {"name": "cirros"},
+                    "flavor": {"name": "m1.tiny"}}},
+            "users": [{"id": "u1", "tenant_id": "0",
+                       "credential": mock.MagicMock()},
+                      {"id": "u2", "tenant_id": "1",
+                       "credential": mock.MagicMock()}],
+            "tenants": self._gen_tenants(2)
+        })
+
+        servers_ctx = servers.ServerGenerator(self.context)
+        self.assertRaises(exceptions.GetResourceErrorStatus,
+                          servers_ctx.setup)
+        self.assertEqual(2, mock_nova_scenario__boot_servers.call_count)
+
     @mock.patch("%s.servers.resource_manager.cleanup" % CTX)
     def test_cleanup(self, mock_cleanup):
 
@@ -42,6 +42,11 @@ class QuotasTestCase(test.TestCase):
             "task": mock.MagicMock()
         }
 
+    def _assert_calls(self, expected, mock_method):
+        # quotas of tenants are processed simultaneously
+        self.assertEqual(len(expected), mock_method.call_count)
+        mock_method.assert_has_calls(expected, any_order=True)
+
     @ddt.data(("cinder", "backup_gigabytes"),
               ("cinder", "backups"),
               ("cinder", "gigabytes"),
@@ -116,20 +121,18 @@ class QuotasTestCase(test.TestCase):
         with quotas.Quotas(ctx) as quotas_ctx:
             quotas_ctx.setup()
             if ex_users:
-                self.assertEqual([mock.call(tenant) for tenant in tenants],
-                                 cinder_quo.get.call_args_list)
-            self.assertEqual([mock.call(tenant, **cinder_quotas)
-                              for tenant in tenants],
-                             cinder_quo.update.call_args_list)
+                self._assert_calls([mock.call(tenant) for tenant in tenants],
+                                   cinder_quo.get)
+            self._assert_calls([mock.call(tenant, **cinder_quotas)
+                                for tenant in tenants], cinder_quo.update)
             mock_cinder_quotas.reset_mock()
 
         if ex_users:
-            self.assertEqual([mock.call(tenant, **cinder_quotas)
-                              for tenant in tenants],
-                             cinder_quo.update.call_args_list)
+            self._assert_calls([mock.call(tenant, **cinder_quotas)
+                                for tenant in tenants], cinder_quo.update)
         else:
-            self.assertEqual([mock.call(tenant) for tenant in tenants],
-                             cinder_quo.delete.call_args_list)
+            self._assert_calls([mock.call(tenant) for tenant in tenants],
+                               cinder_quo.delete)
 
     @mock.patch("%s.quotas.osclients.Clients" % QUOTAS_PATH)
     @mock.patch("%s.nova_quotas.NovaQuotas" % QUOTAS_PATH)
@@ -163,20 +166,18 @@ class QuotasTestCase(test.TestCase):
         with quotas.Quotas(ctx) as quotas_ctx:
             quotas_ctx.setup()
             if ex_users:
-                self.assertEqual([mock.call(tenant) for tenant in tenants],
-                                 nova_quo.get.call_args_list)
-            self.assertEqual([mock.call(tenant, **nova_quotas)
-                              for tenant in tenants],
-                             nova_quo.update.call_args_list)
+                self._assert_calls([mock.call(tenant) for tenant in tenants],
+                                   nova_quo.get)
+            self._assert_calls([mock.call(tenant, **nova_quotas)
+                                for tenant in tenants], nova_quo.update)
             mock_nova_quotas.reset_mock()
 
         if ex_users:
-            self.assertEqual([mock.call(tenant, **nova_quotas)
-                              for tenant in tenants],
-                             nova_quo.update.call_args_list)
+            self._assert_calls([mock.call(tenant, **nova_quotas)
+                                for tenant in tenants], nova_quo.update)
         else:
-            self.assertEqual([mock.call(tenant) for tenant in tenants],
-                             nova_quo.delete.call_args_list)
+            self._assert_calls([mock.call(tenant) for tenant in tenants],
+                               nova_quo.delete)
 
     @mock.patch("%s.quotas.osclients.Clients" % QUOTAS_PATH)
     @mock.patch("%s.neutron_quotas.NeutronQuotas" % QUOTAS_PATH)
@@ -205,20 +206,59 @@ class QuotasTestCase(test.TestCase):
         with quotas.Quotas(ctx) as quotas_ctx:
             quotas_ctx.setup()
             if ex_users:
-                self.assertEqual([mock.call(tenant) for tenant in tenants],
-                                 neutron_quo.get.call_args_list)
-            self.assertEqual([mock.call(tenant, **neutron_quotas)
-                              for tenant in tenants],
-                             neutron_quo.update.call_args_list)
+                self._assert_calls([mock.call(tenant) for tenant in tenants],
+                                   neutron_quo.get)
+            self._assert_calls([mock.call(tenant, **neutron_quotas)
+                                for tenant in tenants], neutron_quo.update)
             neutron_quo.reset_mock()
 
         if ex_users:
-            self.assertEqual([mock.call(tenant, **neutron_quotas)
-                              for tenant in tenants],
-                             neutron_quo.update.call_args_list)
+            self._assert_calls([mock.call(tenant, **neutron_quotas)
+                                for tenant in tenants], neutron_quo.update)
         else:
-            self.assertEqual([mock.call(tenant) for tenant in tenants],
-                             neutron_quo.delete.call_args_list)
+            self._assert_calls([mock.call(tenant) for tenant in tenants],
+                               neutron_quo.delete)
+
+    @mock.patch("%s.quotas.osclients.Clients" % QUOTAS_PATH)
+    @mock.patch("%s.neutron_quotas.NeutronQuotas" % QUOTAS_PATH)
+    @mock.patch("%s.nova_quotas.NovaQuotas" % QUOTAS_PATH)
+    def test_atomic_actions(self, mock_nova_quotas, mock_neutron_quotas,
+                            mock_clients):
+        ctx = copy.deepcopy(self.context)
+        ctx["config"]["quotas"] = {"nova": {"cores": 1},
+                                   "neutron": {"network": 1}}
+
+        quotas_ctx = quotas.Quotas(ctx)
+        quotas_ctx.setup()
+        self.assertEqual(
+            ["neutron.update_quotas", "nova.update_quotas"],
+            [a["name"] for a in quotas_ctx.atomic_actions()])
+        for action in quotas_ctx.atomic_actions():
+            self.assertLessEqual(action["started_at"], action["finished_at"])
+            self.assertNotIn("failed", action)
+
+        quotas_ctx.reset_atomic_actions()
+        quotas_ctx.cleanup()
+        self.assertEqual(
+            ["neutron.delete_quotas", "nova.delete_quotas"],
+            [a["name"] for a in quotas_ctx.atomic_actions()])
+
+    @mock.patch("rally_openstack.broker.LOG")
+    @mock.patch("%s.quotas.osclients.Clients" % QUOTAS_PATH)
+    @mock.patch("%s.nova_quotas.NovaQuotas" % QUOTAS_PATH)
+    def test_setup_fails(self, mock_nova_quotas, mock_clients, mock_log):
+        nova_quo = mock_nova_quotas.return_value
+        nova_quo.update.side_effect = [None, KeyError("t2")]
+        ctx = copy.deepcopy(self.context)
+        ctx["config"]["quotas"] = {"nova": {"cores": 1}}
+
+        quotas_ctx = quotas.Quotas(ctx)
+        self.assertRaises(KeyError, quotas_ctx.setup)
+        self.assertEqual(2, nova_quo.update.call_count)
+        self.assertEqual(
+            [{"name": "nova.update_quotas", "children": [], "failed": True,
+              "started_at": mock.ANY, "finished_at": mock.ANY}],
+            quotas_ctx.atomic_actions())
 
     @mock.patch("rally_openstack.contexts."
                 "quotas.quotas.osclients.Clients")
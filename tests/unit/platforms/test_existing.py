@@ -256,13 +256,16 @@ class ExistingPlatformTestCase(PlatformBaseTestCase):
     def test_destroy(self):
         self.assertIsNone(existing.OpenStack({}).destroy())
 
-    def test_cleanup(self):
+    def test_cleanup_without_admin(self):
         result1 = existing.OpenStack({}).cleanup()
-        result2 = existing.OpenStack({}).cleanup(task_uuid="any")
+        result2 = existing.OpenStack(
+            {}, platform_data={"admin": None, "users": []}).cleanup(
+            task_uuid="any")
         self.assertEqual(result1, result2)
         self.assertEqual(
             {
-                "message": "Coming soon!",
+                "message": "Skipped. Admin credential is required to "
+                           "cleanup the whole cloud.",
                 "discovered": 0,
                 "deleted": 0,
                 "failed": 0,
@@ -273,6 +276,54 @@ class ExistingPlatformTestCase(PlatformBaseTestCase):
         )
         self._check_cleanup_schema(result1)
 
+    @mock.patch("rally_openstack.platforms.existing.credential."
+                "OpenStackCredential")
+    @mock.patch("rally_openstack.platforms.existing.manager")
+    def test_cleanup(self, mock_manager, mock_open_stack_credential):
+        mock_manager.cleanup.return_value = {
+            "discovered": 3, "deleted": 2, "failed": 1,
+            "resources": {"nova.servers": {"discovered": 3, "deleted": 2,
+                                           "failed": 1}},
+            "errors": [{"resource_id": "id", "resource_type": "nova.servers",
+                        "message": "Timeout"}]}
+        pdata = {"admin": {"username": "admin",
+                           "api_info": {"nova": {"version": "2.1"}}},
+                 "users": [],
+                 "api_info": {"nova": {"version": "2"},
+                              "cinder": {"version": "3"}}}
+
+        result = existing.OpenStack({}, platform_data=pdata).cleanup(
+            task_uuid="task_uuid")
+
+        self.assertEqual("Failed", result["message"])
+        self.assertEqual(3, result["discovered"])
+        self._check_cleanup_schema(result)
+        mock_open_stack_credential.assert_called_once_with(
+            username="admin",
+            api_info={"nova": {"version": "2.1"},
+                      "cinder": {"version": "3"}})
+        mock_manager.cleanup.assert_called_once_with(
+            names=mock_manager.list_resource_names.return_value,
+            admin={"credential": mock_open_stack_credential.return_value},
+            users=[], task_id="task_uuid", all_tenants=True, resume=True)
+        # platform data should stay untouched
+        self.assertEqual({"nova": {"version": "2.1"}},
+                         pdata["admin"]["api_info"])
+
+    @mock.patch("rally_openstack.platforms.existing.manager")
+    def test_cleanup_succeeded(self, mock_manager):
+        mock_manager.cleanup.return_value = {
+            "discovered": 0, "deleted": 0, "failed": 0, "resources": {},
+            "errors": []}
+        pdata = {"admin": {"auth_url": "http://example.com",
+                           "username": "admin", "password": "pass"},
+                 "users": []}
+
+        result = existing.OpenStack({}, platform_data=pdata).cleanup()
+
+        self.assertEqual("Succeeded", result["message"])
+        self._check_cleanup_schema(result)
+
     @mock.patch("rally_openstack.osclients.Clients")
     def test_check_health(self, mock_clients):
         pdata = {
@@ -16,6 +16,7 @@
 import ddt
 import mock
 
+from rally import exceptions as rally_exceptions
 from rally_openstack.scenarios.cinder import volumes
 from tests.unit import test
 
@@ -54,6 +55,43 @@ class CinderServersTestCase(test.ScenarioTestCase):
         mock_service.create_volume.assert_called_once_with(1, fakearg="f")
         mock_service.list_volumes.assert_called_once_with(True)
 
+    def test_create_and_list_volume_by_pages(self):
+        mock_service = self.mock_cinder.return_value
+        mock_service.version = "3"
+        volume = mock_service.create_volume.return_value
+        cinder = self.clients("cinder", "3")
+        cinder.volumes.list.side_effect = [
+            [mock.Mock(id="foo"), mock.Mock(id="bar")],
+            [mock.Mock(id=volume.id), mock.Mock(id="baz")]]
+        scenario = volumes.CreateAndListVolume(self._get_context())
+        scenario.run(1, False, list_page_size=2, fakearg="f")
+
+        mock_service.create_volume.assert_called_once_with(1, fakearg="f")
+        self.assertEqual(
+            [mock.call(False, marker=None, limit=2),
+             mock.call(False, marker="bar", limit=2)],
+            cinder.volumes.list.call_args_list)
+        self.assertFalse(mock_service.list_volumes.called)
+        self._test_atomic_action_timer(scenario.atomic_actions(),
+                                       "cinder_v3.list_volumes")
+
+    def test_create_and_list_volume_by_pages_not_found(self):
+        mock_service = self.mock_cinder.return_value
+        mock_service.version = "2"
+        self.clients("cinder", "2").volumes.list.return_value = [
+            mock.Mock(id="foo")]
+        scenario = volumes.CreateAndListVolume(self._get_context())
+        self.assertRaises(rally_exceptions.RallyAssertionError,
+                          scenario.run, 1, list_page_size=2)
+
+    def test_create_and_list_volume_by_pages_v1(self):
+        mock_service = self.mock_cinder.return_value
+        mock_service.version = "1"
+        scenario = volumes.CreateAndListVolume(self._get_context())
+        self.assertRaises(rally_exceptions.InvalidArgumentsException,
+                          scenario.run, 1, list_page_size=2)
+        self.assertFalse(mock_service.create_volume.called)
+
     def test_create_and_get_volume(self):
         mock_service = self.mock_cinder.return_value
         scenario = volumes.CreateAndGetVolume(self._get_context())
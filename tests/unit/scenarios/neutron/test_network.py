@@ -47,6 +47,25 @@ class NeutronNetworksTestCase(test.ScenarioTestCase):
         mock__create_network.reset_mock()
         mock__list_networks.reset_mock()
 
+    @mock.patch("%s.CreateAndListNetworks._find_listed_network" % BASE)
+    @mock.patch("%s.CreateAndListNetworks._list_networks" % BASE)
+    @mock.patch("%s.CreateAndListNetworks._create_network" % BASE)
+    def test_create_and_list_networks_by_pages(self, mock__create_network,
+                                               mock__list_networks,
+                                               mock__find_listed_network):
+        mock__create_network.return_value = {"network": {"id": "foo"}}
+        scenario = network.CreateAndListNetworks(self.context)
+
+        scenario.run(list_page_size=10)
+        mock__create_network.assert_called_once_with({})
+        mock__find_listed_network.assert_called_once_with("foo",
+                                                          page_size=10)
+        self.assertFalse(mock__list_networks.called)
+
+        mock__find_listed_network.return_value = None
+        self.assertRaises(rally_exceptions.RallyAssertionError,
+                          scenario.run, list_page_size=10)
+
     @ddt.data(
         {"network_create_args": {}},
         {"network_create_args": {"name": "given-name"}},
@@ -90,6 +90,28 @@ class NeutronScenarioTestCase(test.ScenarioTestCase):
         self._test_atomic_action_timer(self.scenario.atomic_actions(),
                                        "neutron.list_networks", count=2)
 
+    @ddt.data(("bar", True), ("baz", False))
+    @ddt.unpack
+    def test_find_listed_network(self, network_id, found):
+        consumed = []
+
+        def list_networks(**kwargs):
+            for page in ([{"id": "foo"}, {"id": "bar"}], [{"id": "qux"}]):
+                consumed.append(page)
+                yield {"networks": page}
+
+        self.clients("neutron").list_networks.side_effect = list_networks
+
+        network = self.scenario._find_listed_network(network_id, page_size=2,
+                                                     shared=False)
+
+        self.assertEqual({"id": network_id} if found else None, network)
+        self.assertEqual(1 if found else 2, len(consumed))
+        self.clients("neutron").list_networks.assert_called_once_with(
+            retrieve_all=False, limit=2, shared=False)
+        self._test_atomic_action_timer(self.scenario.atomic_actions(),
+                                       "neutron.list_networks")
+
     def test_show_network(self):
         network = {
             "network": {
@@ -281,6 +281,25 @@ class NovaServersTestCase(test.ScenarioTestCase):
                                                  fakearg="fakearg")
         scenario._list_servers.assert_called_with(details)
 
+    def test_boot_and_list_server_by_pages(self):
+        scenario = servers.BootAndListServer(self.context)
+        scenario._boot_server = mock.MagicMock()
+        scenario._list_servers = mock.MagicMock()
+        scenario._find_listed_server = mock.MagicMock()
+
+        scenario.run("img", 0, detailed=False, list_page_size=10,
+                     fakearg="fakearg")
+
+        scenario._boot_server.assert_called_once_with("img", 0,
+                                                      fakearg="fakearg")
+        scenario._find_listed_server.assert_called_once_with(
+            scenario._boot_server.return_value.id, False, page_size=10)
+        self.assertFalse(scenario._list_servers.called)
+
+        scenario._find_listed_server.return_value = None
+        self.assertRaises(rally_exceptions.RallyAssertionError,
+                          scenario.run, "img", 0, list_page_size=10)
+
     def test_suspend_and_resume_server(self):
         fake_server = object()
 
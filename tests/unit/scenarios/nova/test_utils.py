@@ -56,6 +56,27 @@ class NovaScenarioTestCase(test.ScenarioTestCase):
         self._test_atomic_action_timer(nova_scenario.atomic_actions(),
                                        "nova.list_servers")
 
+    @ddt.data(("b", 1), ("c", 2), ("d", 2))
+    @ddt.unpack
+    def test__find_listed_server(self, server_id, requests):
+        pages = [[mock.Mock(id="a"), mock.Mock(id="b")], [mock.Mock(id="c")]]
+        self.clients("nova").servers.list.side_effect = pages
+        nova_scenario = utils.NovaScenario(self.context)
+
+        server = nova_scenario._find_listed_server(server_id, False,
+                                                   page_size=2)
+
+        if server_id == "d":
+            self.assertIsNone(server)
+        else:
+            self.assertEqual(server_id, server.id)
+        self.assertEqual(
+            [mock.call(False, marker=None, limit=2),
+             mock.call(False, marker="b", limit=2)][:requests],
+            self.clients("nova").servers.list.call_args_list)
+        self._test_atomic_action_timer(nova_scenario.atomic_actions(),
+                                       "nova.list_servers")
+
     def test__pick_random_nic(self):
         context = {"tenant": {"networks": [{"id": "net_id_1"},
                                            {"id": "net_id_2"}]},
@@ -386,31 +407,41 @@ class NovaScenarioTestCase(test.ScenarioTestCase):
         self._test_atomic_action_timer(nova_scenario.atomic_actions(),
                                        "nova.unrescue_server")
 
-    def _test_delete_servers(self, force=False):
+    @mock.patch("%s.osclients" % NOVA_UTILS)
+    def _test_delete_servers(self, mock_osclients, force=False):
+        nova = mock_osclients.Clients.return_value.nova.return_value
         servers = [self.server, self.server1]
         nova_scenario = utils.NovaScenario(context=self.context)
-        nova_scenario._delete_servers(servers, force=force)
-        check_interval = CONF.openstack.nova_server_delete_poll_interval
-        expected = []
-        for server in servers:
-            expected.append(mock.call(
-                server,
-                ready_statuses=["deleted"],
-                check_deletion=True,
-                update_resource=self.mock_get_from_manager.mock.return_value,
-                check_interval=check_interval,
-                timeout=CONF.openstack.nova_server_delete_timeout))
-            if force:
-                server.force_delete.assert_called_once_with()
-                self.assertFalse(server.delete.called)
-            else:
-                server.delete.assert_called_once_with()
-                self.assertFalse(server.force_delete.called)
 
-        self.mock_wait_for_status.mock.assert_has_calls(expected)
-        timer_name = "nova.%sdelete_servers" % ("force_" if force else "")
+        def wait_for_statuses(resources, on_ready, **kwargs):
+            for resource in resources:
+                on_ready(resource.id, None)
+
+        self.mock_waiter_wait_for_statuses.mock.side_effect = (
+            wait_for_statuses)
+        nova_scenario._delete_servers(servers, force=force)
+        calls = [mock.call(server) for server in servers]
+        if force:
+            nova.servers.force_delete.assert_has_calls(calls, any_order=True)
+            self.assertFalse(nova.servers.delete.called)
+        else:
+            nova.servers.delete.assert_has_calls(calls, any_order=True)
+            self.assertFalse(nova.servers.force_delete.called)
+        mock_osclients.Clients.assert_called_with(
+            self.context["user"]["credential"])
+
+        self.mock_waiter_wait_for_statuses.mock.assert_called_once_with(
+            servers, ready_statuses=["deleted"], failure_statuses=["error"],
+            list_resources=mock.ANY, key=mock.ANY,
+            timeout=CONF.openstack.nova_server_delete_timeout,
+            check_interval=CONF.openstack.nova_server_delete_poll_interval,
+            check_deletion=True, on_ready=mock.ANY)
+        prefix = "force_" if force else ""
         self._test_atomic_action_timer(nova_scenario.atomic_actions(),
-                                       timer_name)
+                                       "nova.%sdelete_servers" % prefix)
+        self._test_atomic_action_timer(
+            nova_scenario.atomic_actions(), "nova.%sdelete_server" % prefix,
+            count=2, parent=["nova.%sdelete_servers" % prefix])
 
     def test__default_delete_servers(self):
         self._test_delete_servers()
@@ -418,6 +449,37 @@ class NovaScenarioTestCase(test.ScenarioTestCase):
     def test__force_delete_servers(self):
         self._test_delete_servers(force=True)
 
+    @mock.patch("%s.osclients" % NOVA_UTILS)
+    def test__delete_servers_with_changes_since(self, mock_osclients):
+        servers = [mock.Mock(updated="2019-07-01T10:00:05Z"),
+                   mock.Mock(updated="2019-07-01T10:00:01Z")]
+        nova_scenario = utils.NovaScenario(context=self.context)
+        nova_scenario._wait_for_servers = mock.Mock()
+
+        nova_scenario._delete_servers(servers)
+
+        nova_scenario._wait_for_servers.assert_called_once_with(
+            servers, ready_statuses=["deleted"], failure_statuses=["error"],
+            check_deletion=True,
+            timeout=CONF.openstack.nova_server_delete_timeout,
+            check_interval=CONF.openstack.nova_server_delete_poll_interval,
+            search_opts={"changes-since": "2019-07-01T10:00:01Z"},
+            on_ready=mock.ANY)
+
+    @mock.patch("%s.osclients" % NOVA_UTILS)
+    @mock.patch("rally_openstack.broker.LOG")
+    def test__delete_servers_fails(self, mock_log, mock_osclients):
+        nova = mock_osclients.Clients.return_value.nova.return_value
+        nova.servers.delete.side_effect = [
+            None, rally_exceptions.RallyException()]
+        nova_scenario = utils.NovaScenario(context=self.context)
+
+        self.assertRaises(rally_exceptions.RallyException,
+                          nova_scenario._delete_servers,
+                          [self.server, self.server1])
+        self.assertEqual(2, nova.servers.delete.call_count)
+        self.assertFalse(self.mock_waiter_wait_for_statuses.mock.called)
+
     @mock.patch("rally_openstack.scenarios.nova.utils.image_service")
     def test__delete_image(self, mock_image_service):
         glance = mock_image_service.Image.return_value
@@ -444,19 +506,38 @@ class NovaScenarioTestCase(test.ScenarioTestCase):
         {"auto_assign_nic": True, "nics": [{"net-id": "foo"}]},
         {"auto_assign_nic": False, "nics": [{"net-id": "foo"}]})
     @ddt.unpack
-    def test__boot_servers(self, image_id="image", flavor_id="flavor",
-                           requests=1, instances_amount=1,
+    @mock.patch("%s.osclients" % NOVA_UTILS)
+    def test__boot_servers(self, mock_osclients, image_id="image",
+                           flavor_id="flavor", requests=1, instances_amount=1,
                            auto_assign_nic=False, **kwargs):
-        servers = [mock.Mock() for i in range(instances_amount)]
-        self.clients("nova").servers.list.return_value = servers
+        nova = mock_osclients.Clients.return_value.nova.return_value
         scenario = utils.NovaScenario(context=self.context)
-        scenario.generate_random_name = mock.Mock()
+        scenario.generate_random_name = mock.Mock(return_value="foo")
         scenario._pick_random_nic = mock.Mock()
-
-        scenario._boot_servers(image_id, flavor_id, requests,
-                               instances_amount=instances_amount,
-                               auto_assign_nic=auto_assign_nic,
-                               **kwargs)
+        if instances_amount > 1:
+            names = ["foo_0-%d" % (i + 1) for i in range(instances_amount)]
+        else:
+            names = ["foo_%d" % i for i in range(requests)]
+        servers = [mock.Mock(id=i) for i in range(len(names))]
+        for server, name in zip(servers, names):
+            server.name = name
+        foreign_server = mock.Mock(id="foreign")
+        foreign_server.name = "bar_0"
+        self.clients("nova").servers.list.return_value = (
+            servers + [foreign_server])
+        scenario._wait_for_servers = mock.Mock()
+
+        def wait_for_servers(servers, on_ready, **kwargs):
+            for server in servers:
+                on_ready(server.id, server)
+            return servers
+
+        scenario._wait_for_servers.side_effect = wait_for_servers
+
+        result = scenario._boot_servers(image_id, flavor_id, requests,
+                                        instances_amount=instances_amount,
+                                        auto_assign_nic=auto_assign_nic,
+                                        **kwargs)
 
         expected_kwargs = dict(kwargs)
         if auto_assign_nic and "nics" not in kwargs:
@@ -464,27 +545,75 @@ class NovaScenarioTestCase(test.ScenarioTestCase):
 
         create_calls = [
             mock.call(
-                "%s_%d" % (scenario.generate_random_name.return_value, i),
-                image_id, flavor_id,
+                "foo_%d" % i, image_id, flavor_id,
                 min_count=instances_amount, max_count=instances_amount,
                 **expected_kwargs)
             for i in range(requests)]
-        self.clients("nova").servers.create.assert_has_calls(create_calls)
-
-        wait_for_status_calls = [
-            mock.call(
-                servers[i],
-                ready_statuses=["ACTIVE"],
-                update_resource=self.mock_get_from_manager.mock.return_value,
-                check_interval=CONF.openstack.nova_server_boot_poll_interval,
-                timeout=CONF.openstack.nova_server_boot_timeout)
-            for i in range(instances_amount)]
-        self.mock_wait_for_status.mock.assert_has_calls(wait_for_status_calls)
-
-        self.mock_get_from_manager.mock.assert_has_calls(
-            [mock.call() for i in range(instances_amount)])
+        nova.servers.create.assert_has_calls(create_calls, any_order=True)
+        self.assertEqual(requests, nova.servers.create.call_count)
+        self.assertFalse(self.clients("nova").servers.create.called)
+        mock_osclients.Clients.assert_called_with(
+            self.context["user"]["credential"])
+        self.clients("nova").servers.list.assert_called_once_with(
+            search_opts={"name": "^foo_"}, limit=-1)
+
+        self.assertEqual(servers, result)
+        scenario._wait_for_servers.assert_called_once_with(
+            servers, ready_statuses=["ACTIVE"],
+            check_interval=CONF.openstack.nova_server_boot_poll_interval,
+            timeout=CONF.openstack.nova_server_boot_timeout,
+            search_opts={"name": "^foo_"}, on_ready=mock.ANY)
         self._test_atomic_action_timer(scenario.atomic_actions(),
                                        "nova.boot_servers")
+        self._test_atomic_action_timer(
+            scenario.atomic_actions(), "nova.boot_server",
+            count=len(servers), parent=["nova.boot_servers"])
+
+    def test__wait_for_servers(self):
+        servers = [mock.Mock(), mock.Mock()]
+        scenario = utils.NovaScenario(context=self.context)
+        mock_wait_for_statuses = self.mock_waiter_wait_for_statuses.mock
+
+        result = scenario._wait_for_servers(servers, ["ACTIVE"],
+                                            check_interval=0)
+
+        self.assertEqual(mock_wait_for_statuses.return_value, result)
+        mock_wait_for_statuses.assert_called_once_with(
+            servers, ready_statuses=["ACTIVE"], failure_statuses=("ERROR",),
+            list_resources=mock.ANY, key=mock.ANY, timeout=60,
+            check_interval=0, check_deletion=False, on_ready=None)
+        kwargs = mock_wait_for_statuses.call_args[1]
+        self.assertEqual("nova.servers", kwargs["key"][0])
+        self.assertEqual(self.clients("nova").servers.list.return_value,
+                         kwargs["list_resources"]())
+        self.clients("nova").servers.list.assert_called_once_with(
+            detailed=True, search_opts=None, limit=-1)
+
+    def test__wait_for_servers_with_search_opts(self):
+        servers = [mock.Mock()]
+        scenario = utils.NovaScenario(context=self.context)
+        mock_wait_for_statuses = self.mock_waiter_wait_for_statuses.mock
+
+        scenario._wait_for_servers(servers, ["ACTIVE"],
+                                   search_opts={"name": "^foo_"})
+        scenario._wait_for_servers(servers, ["ACTIVE"])
+
+        keys = [c[1]["key"] for c in mock_wait_for_statuses.call_args_list]
+        # waits with different filters do not share list calls
+        self.assertNotEqual(keys[0], keys[1])
+        mock_wait_for_statuses.call_args_list[0][1]["list_resources"]()
+        self.clients("nova").servers.list.assert_called_once_with(
+            detailed=True, search_opts={"name": "^foo_"}, limit=-1)
+
+    @ddt.data(([], None),
+              ([mock.Mock(updated="b"), mock.Mock(updated="a")],
+               {"changes-since": "a"}),
+              ([mock.Mock(updated="b"), mock.Mock(spec=[])], None))
+    @ddt.unpack
+    def test__get_changes_since_filter(self, servers, expected):
+        self.assertEqual(
+            expected,
+            utils.NovaScenario._get_changes_since_filter(servers))
 
     def test__show_server(self):
         nova_scenario = utils.NovaScenario(context=self.context)
@@ -30,10 +30,12 @@ class SwiftObjectsTestCase(test.ScenarioTestCase):
         scenario._upload_object = mock.MagicMock()
         scenario._list_objects = mock.MagicMock()
 
-        scenario.run(objects_per_container=5, object_size=100)
+        scenario.run(objects_per_container=5, object_size=100,
+                     random_content=True)
 
         self.assertEqual(1, scenario._create_container.call_count)
-        self.assertEqual(5, scenario._upload_object.call_count)
+        scenario._upload_object.assert_has_calls(
+            [mock.call("AA", mock.ANY, content_length=100)] * 5)
         scenario._list_objects.assert_called_once_with("AA")
 
     def test_create_container_and_object_then_delete_all(self):
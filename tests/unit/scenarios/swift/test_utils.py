@@ -121,6 +121,21 @@ class SwiftScenarioTestCase(test.ScenarioTestCase):
         self._test_atomic_action_timer(scenario.atomic_actions(),
                                        "swift.upload_object")
 
+    def test__upload_payload(self):
+        payload = utils.ObjectPayload(5)
+        scenario = utils.SwiftScenario(self.context)
+        scenario._upload_object = mock.Mock()
+
+        self.assertEqual(
+            scenario._upload_object.return_value,
+            scenario._upload_payload("container", payload, fargs="f"))
+
+        scenario._upload_object.assert_called_once_with(
+            "container", mock.ANY, content_length=5, fargs="f")
+        reader = scenario._upload_object.call_args[0][1]
+        self.assertIsInstance(reader, utils.PayloadReader)
+        self.assertEqual(b"\0" * 5, reader.read().tobytes())
+
     def test__download_object(self):
         container_name = mock.MagicMock()
         object_name = mock.MagicMock()
@@ -152,3 +167,81 @@ class SwiftScenarioTestCase(test.ScenarioTestCase):
             **kw)
         self._test_atomic_action_timer(scenario.atomic_actions(),
                                        "swift.delete_object")
+
+
+class PayloadReaderTestCase(test.TestCase):
+
+    def test_read(self):
+        reader = utils.PayloadReader(memoryview(b"abcdefg"))
+
+        self.assertEqual(7, len(reader))
+        self.assertEqual(b"abc", reader.read(3).tobytes())
+        self.assertEqual(3, reader.tell())
+        self.assertEqual(b"defg", reader.read(10).tobytes())
+        self.assertEqual(b"", reader.read().tobytes())
+
+    def test_seek(self):
+        reader = utils.PayloadReader(memoryview(b"abcdefg"))
+
+        self.assertEqual(5, reader.seek(5))
+        self.assertEqual(b"fg", reader.read().tobytes())
+        self.assertEqual(3, reader.seek(-4, 2))
+        self.assertEqual(4, reader.seek(1, 1))
+        self.assertEqual(b"efg", reader.read().tobytes())
+        self.assertEqual(0, reader.seek(-100, 1))
+        self.assertEqual(7, reader.seek(100))
+
+
+class ObjectPayloadTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ObjectPayloadTestCase, self).setUp()
+        self.addCleanup(utils._payloads.clear)
+
+    def test_zeros(self):
+        payload = utils.ObjectPayload(1024)
+
+        self.assertEqual(1024, payload.size)
+        for i in range(2):
+            self.assertEqual(b"\0" * 1024,
+                             payload.reader().read().tobytes())
+
+    def test_empty(self):
+        payload = utils.ObjectPayload(0)
+
+        self.assertEqual(b"", payload.reader().read().tobytes())
+
+    @mock.patch("%s.RANDOM_BLOCK_SIZE" % SWIFT_UTILS, new=7)
+    def test_random_content(self):
+        payload = utils.ObjectPayload(100, random_content=True, seed=42)
+        same = utils.ObjectPayload(100, random_content=True, seed=42)
+
+        first = payload.reader().read().tobytes()
+        second = payload.reader().read().tobytes()
+        self.assertEqual(100, len(first))
+        self.assertNotEqual(b"\0" * 100, first)
+        self.assertEqual(first[1:], second[:-1])
+        self.assertEqual(first, same.reader().read().tobytes())
+
+    def test_random_content_shifts_wrap(self):
+        payload = utils.ObjectPayload(10, random_content=True)
+        first = payload.reader().read().tobytes()
+
+        for i in range(payload.SHIFTS - 1):
+            payload.reader()
+
+        self.assertEqual(first, payload.reader().read().tobytes())
+
+    @mock.patch("%s.PAYLOADS_CACHE_SIZE" % SWIFT_UTILS, new=2)
+    def test_get_payload(self):
+        payload = utils.get_payload(10)
+
+        self.assertIs(payload, utils.get_payload(10))
+        random_payload = utils.get_payload(10, random_content=True)
+        self.assertIsNot(payload, random_payload)
+        self.assertTrue(random_payload.random_content)
+
+        # the least recently used payload is dropped
+        utils.get_payload(10)
+        utils.get_payload(20)
+        self.assertEqual([(10, False), (20, False)], list(utils._payloads))
@@ -41,18 +41,22 @@ class StackTestCase(test.ScenarioTestCase):
         reads[0].read.assert_called_once_with()
         reads[1].read.assert_called_once_with()
 
-    @mock.patch("rally_openstack.services.heat.main.utils")
-    def test__wait(self, mock_utils):
-        fake_stack = mock.Mock()
+    def test__wait(self):
         stack = Stack()
         stack.stack = fake_stack = mock.Mock()
+        stack.stack_id = "fake_id"
+        heat = stack.scenario.clients.return_value
         stack._wait(["ready_statuses"], ["failure_statuses"])
-        mock_utils.wait_for_status.assert_called_once_with(
+        self.mock_waiter_wait_for_status.mock.assert_called_once_with(
             fake_stack, check_interval=1.0,
             ready_statuses=["ready_statuses"],
             failure_statuses=["failure_statuses"],
             timeout=3600.0,
-            update_resource=mock_utils.get_from_manager())
+            list_resources=heat.stacks.list,
+            key=mock.ANY)
+        stack.scenario.clients.assert_called_with("heat")
+        heat.stacks.get.assert_called_once_with("fake_id")
+        self.assertEqual(heat.stacks.get.return_value, stack.stack)
 
     @mock.patch("rally.task.atomic")
     @mock.patch("rally_openstack.services.heat.main.open")
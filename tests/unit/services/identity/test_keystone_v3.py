@@ -205,6 +205,37 @@ class KeystoneV3ServiceTestCase(test.TestCase):
             user_id=user.id,
             project_id=project_id)
 
+    @mock.patch("%s.KeystoneV3Service._get_domain_id" % PATH)
+    def test_create_user_caches_lookups(self, mock__get_domain_id):
+        role = mock.Mock()
+        role.name = "_member_"
+        self.service.list_roles = mock.MagicMock(return_value=[role])
+        self.service.add_role = mock.MagicMock()
+
+        for i in range(3):
+            self.service.create_user("name-%s" % i, project_id="project",
+                                     domain_name="domain")
+
+        mock__get_domain_id.assert_called_once_with("domain")
+        self.service.list_roles.assert_called_once_with()
+        self.assertEqual(
+            [mock.call(role_id=role.id,
+                       user_id=self.kc.users.create.return_value.id,
+                       project_id="project")] * 3,
+            self.service.add_role.call_args_list)
+
+    @mock.patch("%s.LOG" % PATH)
+    @mock.patch("%s.KeystoneV3Service._get_domain_id" % PATH)
+    def test_create_user_does_not_cache_missing_role(
+            self, mock__get_domain_id, mock_log):
+        self.service.list_roles = mock.MagicMock(return_value=[])
+
+        self.service.create_user("name-1", project_id="project")
+        self.service.create_user("name-2", project_id="project")
+
+        self.assertEqual(2, self.service.list_roles.call_count)
+        self.assertEqual(2, mock_log.warning.call_count)
+
     def test_create_users(self):
         self.service.create_user = mock.MagicMock()
 
@@ -98,18 +98,31 @@ class CinderMixinTestCase(test.ScenarioTestCase):
         self.assertRaises(exceptions.GetResourceFailure,
                           self.service._update_resource, resource)
 
-    def test__wait_available_volume(self):
-        volume = fakes.FakeVolume()
-        self.assertEqual(self.mock_wait_for_status.mock.return_value,
-                         self.service._wait_available_volume(volume))
-
-        self.mock_wait_for_status.mock.assert_called_once_with(
-            volume,
+    @ddt.data("volumes", "volume_snapshots", "backups")
+    def test__wait_available_volume(self, resources):
+        resource = fakes.FakeVolume()
+        mock_wait_for_status = self.mock_waiter_wait_for_status.mock
+        if resources == "volumes":
+            result = self.service._wait_available_volume(resource)
+        else:
+            result = self.service._wait_available_volume(resource, resources)
+        self.assertEqual(mock_wait_for_status.return_value, result)
+
+        mock_wait_for_status.assert_called_once_with(
+            resource,
             ready_statuses=["available"],
-            update_resource=self.service._update_resource,
+            list_resources=mock.ANY,
+            key=mock.ANY,
             timeout=CONF.openstack.cinder_volume_create_timeout,
-            check_interval=CONF.openstack.cinder_volume_create_poll_interval
+            check_interval=CONF.openstack.cinder_volume_create_poll_interval,
+            get_resource=self.service._update_resource
         )
+        kwargs = mock_wait_for_status.call_args[1]
+        manager = getattr(self.cinder, resources)
+        self.assertEqual(manager.list.return_value,
+                         kwargs["list_resources"]())
+        manager.list.assert_called_once_with(detailed=True)
+        self.assertEqual("cinder.%s" % resources, kwargs["key"][0])
 
     def test_get_volume(self):
         self.assertEqual(self.cinder.volumes.get.return_value,
@@ -204,14 +217,15 @@ class CinderMixinTestCase(test.ScenarioTestCase):
 
         self.cinder.volumes.upload_to_image.assert_called_once_with(
             volume, False, "test_vol", "container", "disk")
+        self.mock_waiter_wait_for_status.mock.assert_called_once_with(
+            volume,
+            ready_statuses=["available"],
+            list_resources=mock.ANY,
+            key=mock.ANY,
+            timeout=CONF.openstack.cinder_volume_create_timeout,
+            check_interval=CONF.openstack.cinder_volume_create_poll_interval,
+            get_resource=self.service._update_resource)
         self.mock_wait_for_status.mock.assert_has_calls([
-            mock.call(
-                volume,
-                ready_statuses=["available"],
-                update_resource=self.service._update_resource,
-                timeout=CONF.openstack.cinder_volume_create_timeout,
-                check_interval=CONF.openstack.
-                cinder_volume_create_poll_interval),
             mock.call(
                 glance.get_image.return_value,
                 ready_statuses=["active"],
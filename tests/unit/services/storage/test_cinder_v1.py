@@ -140,7 +140,8 @@ class CinderV1ServiceTestCase(test.ScenarioTestCase):
             1, display_name="snapshot", display_description=None,
             force=False)
         self.service._wait_available_volume.assert_called_once_with(
-            self.cinder.volume_snapshots.create.return_value)
+            self.cinder.volume_snapshots.create.return_value,
+            "volume_snapshots")
         self.assertEqual(self.service._wait_available_volume.return_value,
                          return_snapshot)
         self._test_atomic_action_timer(self.atomic_actions(),
@@ -157,7 +158,8 @@ class CinderV1ServiceTestCase(test.ScenarioTestCase):
             1, display_name="snapshot", display_description=None,
             force=False)
         self.service._wait_available_volume.assert_called_once_with(
-            self.cinder.volume_snapshots.create.return_value)
+            self.cinder.volume_snapshots.create.return_value,
+            "volume_snapshots")
         self.assertEqual(self.service._wait_available_volume.return_value,
                          return_snapshot)
         self._test_atomic_action_timer(self.atomic_actions(),
@@ -174,7 +176,7 @@ class CinderV1ServiceTestCase(test.ScenarioTestCase):
         self.cinder.backups.create.assert_called_once_with(
             1, name="backup", description=None, container=None)
         self.service._wait_available_volume.assert_called_once_with(
-            self.cinder.backups.create.return_value)
+            self.cinder.backups.create.return_value, "backups")
         self.assertEqual(self.service._wait_available_volume.return_value,
                          return_backup)
         self._test_atomic_action_timer(self.atomic_actions(),
@@ -189,7 +191,7 @@ class CinderV1ServiceTestCase(test.ScenarioTestCase):
         self.cinder.backups.create.assert_called_once_with(
             1, name="backup", description=None, container=None)
         self.service._wait_available_volume.assert_called_once_with(
-            self.cinder.backups.create.return_value)
+            self.cinder.backups.create.return_value, "backups")
         self.assertEqual(self.service._wait_available_volume.return_value,
                          return_backup)
         self._test_atomic_action_timer(self.atomic_actions(),
@@ -149,7 +149,8 @@ class CinderV2ServiceTestCase(test.ScenarioTestCase):
             1, name="snapshot", description=None, force=False,
             metadata=None)
         self.service._wait_available_volume.assert_called_once_with(
-            self.cinder.volume_snapshots.create.return_value)
+            self.cinder.volume_snapshots.create.return_value,
+            "volume_snapshots")
         self.assertEqual(self.service._wait_available_volume.return_value,
                          return_snapshot)
         self._test_atomic_action_timer(self.atomic_actions(),
@@ -165,7 +166,8 @@ class CinderV2ServiceTestCase(test.ScenarioTestCase):
             1, name="snapshot", description=None, force=False,
             metadata=None)
         self.service._wait_available_volume.assert_called_once_with(
-            self.cinder.volume_snapshots.create.return_value)
+            self.cinder.volume_snapshots.create.return_value,
+            "volume_snapshots")
         self.assertEqual(self.service._wait_available_volume.return_value,
                          return_snapshot)
         self._test_atomic_action_timer(self.atomic_actions(),
@@ -183,7 +185,7 @@ class CinderV2ServiceTestCase(test.ScenarioTestCase):
             1, name="backup", description=None, container=None,
             incremental=False, force=False, snapshot_id=None)
         self.service._wait_available_volume.assert_called_once_with(
-            self.cinder.backups.create.return_value)
+            self.cinder.backups.create.return_value, "backups")
         self.assertEqual(self.service._wait_available_volume.return_value,
                          return_backup)
         self._test_atomic_action_timer(self.atomic_actions(),
@@ -199,7 +201,7 @@ class CinderV2ServiceTestCase(test.ScenarioTestCase):
             1, name="backup", description=None, container=None,
             incremental=False, force=False, snapshot_id=None)
         self.service._wait_available_volume.assert_called_once_with(
-            self.cinder.backups.create.return_value)
+            self.cinder.backups.create.return_value, "backups")
         self.assertEqual(self.service._wait_available_volume.return_value,
                          return_backup)
         self._test_atomic_action_timer(self.atomic_actions(),
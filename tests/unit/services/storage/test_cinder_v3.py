@@ -153,7 +153,8 @@ class CinderV3ServiceTestCase(test.ScenarioTestCase):
             1, name="snapshot", description=None, force=False,
             metadata=None)
         self.service._wait_available_volume.assert_called_once_with(
-            self.cinder.volume_snapshots.create.return_value)
+            self.cinder.volume_snapshots.create.return_value,
+            "volume_snapshots")
         self.assertEqual(self.service._wait_available_volume.return_value,
                          return_snapshot)
         self._test_atomic_action_timer(self.atomic_actions(),
@@ -169,7 +170,8 @@ class CinderV3ServiceTestCase(test.ScenarioTestCase):
             1, name="snapshot", description=None, force=False,
             metadata=None)
         self.service._wait_available_volume.assert_called_once_with(
-            self.cinder.volume_snapshots.create.return_value)
+            self.cinder.volume_snapshots.create.return_value,
+            "volume_snapshots")
         self.assertEqual(self.service._wait_available_volume.return_value,
                          return_snapshot)
         self._test_atomic_action_timer(self.atomic_actions(),
@@ -187,7 +189,7 @@ class CinderV3ServiceTestCase(test.ScenarioTestCase):
             1, name="backup", description=None, container=None,
             incremental=False, force=False, snapshot_id=None)
         self.service._wait_available_volume.assert_called_once_with(
-            self.cinder.backups.create.return_value)
+            self.cinder.backups.create.return_value, "backups")
         self.assertEqual(self.service._wait_available_volume.return_value,
                          return_backup)
         self._test_atomic_action_timer(self.atomic_actions(),
@@ -203,7 +205,7 @@ class CinderV3ServiceTestCase(test.ScenarioTestCase):
             1, name="backup", description=None, container=None,
             incremental=False, force=False, snapshot_id=None)
         self.service._wait_available_volume.assert_called_once_with(
-            self.cinder.backups.create.return_value)
+            self.cinder.backups.create.return_value, "backups")
         self.assertEqual(self.service._wait_available_volume.return_value,
                          return_backup)
         self._test_atomic_action_timer(self.atomic_actions(),
@@ -23,6 +23,7 @@ from oslotest import base
 from rally.common import cfg
 from rally.common import db
 from rally import plugins
+from rally_openstack import osclients
 from tests.unit import fakes
 
 
@@ -46,6 +47,12 @@ class TestCase(base.BaseTestCase):
     def setUp(self):
         super(TestCase, self).setUp()
         self.addCleanup(mock.patch.stopall)
+        # NOTE: sessions are shared within process, so tests should not see
+        #   mocks created by other tests
+        osclients.SESSION_POOL.clear()
+        self.addCleanup(osclients.SESSION_POOL.clear)
+        osclients.NEUTRON_EXTENSIONS.invalidate()
+        self.addCleanup(osclients.NEUTRON_EXTENSIONS.invalidate)
 
     def _test_atomic_action_timer(self, atomic_actions, name, count=1,
                                   parent=[]):
@@ -158,6 +165,13 @@ class ScenarioTestCase(TestCase):
             self.useFixture(self.mock_wait_for_delete)
             self.useFixture(self.mock_wait_for_status)
 
+            self.mock_waiter_wait_for_status = fixtures.MockPatch(
+                "rally_openstack.waiter.wait_for_status")
+            self.mock_waiter_wait_for_statuses = fixtures.MockPatch(
+                "rally_openstack.waiter.wait_for_statuses")
+            self.useFixture(self.mock_waiter_wait_for_status)
+            self.useFixture(self.mock_waiter_wait_for_statuses)
+
         self.mock_sleep = fixtures.MockPatch("time.sleep")
         self.useFixture(self.mock_sleep)
 
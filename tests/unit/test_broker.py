@@ -0,0 +1,278 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import threading
+
+import ddt
+import mock
+
+from rally_openstack import broker
+from tests.unit import test
+
+
+class FakeHTTPError(Exception):
+    def __init__(self, code):
+        super(FakeHTTPError, self).__init__("HTTP %s" % code)
+        self.code = code
+
+
+@ddt.ddt
+class BrokerTestCase(test.TestCase):
+
+    @ddt.data((FakeHTTPError(503), True),
+              (FakeHTTPError(409), True),
+              (FakeHTTPError(404), False),
+              (Exception(), False))
+    @ddt.unpack
+    def test_is_overload_error(self, error, expected):
+        self.assertEqual(expected, broker.is_overload_error(error))
+
+    def test_is_overload_error_http_status(self):
+        error = Exception()
+        error.http_status = 413
+        self.assertTrue(broker.is_overload_error(error))
+
+    def test_report_error(self):
+        # nothing happens outside of consumers
+        broker.report_error(FakeHTTPError(503))
+
+        limit = mock.Mock()
+        broker._local.limit = limit
+        try:
+            broker.report_error(FakeHTTPError(404))
+            self.assertFalse(limit.decrease.called)
+            broker.report_error(FakeHTTPError(503))
+            limit.decrease.assert_called_once_with()
+        finally:
+            broker._local.limit = None
+
+    def test__publisher(self):
+        queue = collections.deque()
+
+        def publish(queue):
+            queue.append(1)
+            queue.append(2)
+
+        broker._publisher(publish, queue)
+        self.assertEqual([1, 2], list(queue))
+
+    @mock.patch("%s.LOG" % broker.__name__)
+    def test__publisher_fails(self, mock_log):
+        publish = mock.Mock(side_effect=Exception("Boom"))
+
+        broker._publisher(publish, collections.deque())
+        mock_log.warning.assert_called_once_with(
+            "Failed to publish a task to the queue: Boom")
+
+    @mock.patch("%s.LOG" % broker.__name__)
+    def test__consumer(self, mock_log):
+        queue = collections.deque([1, 2, FakeHTTPError(503), 3])
+        limit = broker.AdaptiveLimit(4, initial=4)
+        consumed = []
+
+        def consume(cache, obj):
+            if isinstance(obj, Exception):
+                raise obj
+            self.assertIs(limit, broker._local.limit)
+            cache.setdefault("calls", 0)
+            cache["calls"] += 1
+            consumed.append((obj, cache["calls"]))
+
+        broker._consumer(consume, queue, limit)
+
+        self.assertEqual([(1, 1), (2, 2), (3, 3)], consumed)
+        self.assertEqual(0, len(queue))
+        self.assertEqual(2, limit.value)
+        self.assertEqual(1, mock_log.warning.call_count)
+        self.assertIsNone(broker._local.limit)
+
+    def test_ignore_latency(self):
+        # outside of consumers
+        broker.ignore_latency()
+        self.assertFalse(getattr(broker._local, "ignore_latency", False))
+
+        queue = collections.deque([0.2, None])
+        limit = mock.Mock()
+
+        def consume(cache, obj):
+            if obj is None:
+                broker.ignore_latency()
+
+        broker._consumer(consume, queue, limit)
+
+        self.assertEqual([mock.call.acquire(), mock.call.release(mock.ANY,
+                                                                 False),
+                          mock.call.acquire(), mock.call.release(None, False),
+                          mock.call.acquire(), mock.call.release()],
+                         limit.mock_calls)
+        self.assertIsNotNone(limit.release.call_args_list[0][0][0])
+
+    @ddt.data(True, False)
+    def test_run(self, adaptive):
+        consumed = collections.deque()
+        lock = threading.Lock()
+        active = {"current": 0, "max": 0}
+
+        def publish(queue):
+            for i in range(50):
+                queue.append(i)
+
+        def consume(cache, obj):
+            with lock:
+                active["current"] += 1
+                active["max"] = max(active["max"], active["current"])
+            consumed.append(obj)
+            with lock:
+                active["current"] -= 1
+
+        broker.run(publish, consume, consumers_count=5, adaptive=adaptive)
+
+        self.assertEqual(list(range(50)), sorted(consumed))
+        self.assertLessEqual(active["max"], 5)
+
+    @mock.patch("%s.LOG" % broker.__name__)
+    def test_run_reraise(self, mock_log):
+        consumed = collections.deque()
+
+        def publish(queue):
+            for i in range(10):
+                queue.append(i)
+
+        def consume(cache, obj):
+            if obj == 3:
+                raise KeyError(obj)
+            consumed.append(obj)
+
+        broker.run(publish, consume, consumers_count=3)
+        self.assertEqual(9, len(consumed))
+
+        consumed.clear()
+        self.assertRaises(KeyError, broker.run, publish, consume,
+                          consumers_count=3, reraise=True)
+        # all the jobs are processed anyway
+        self.assertEqual(9, len(consumed))
+
+    def test_run_without_jobs(self):
+        consume = mock.Mock()
+        broker.run(lambda queue: None, consume, consumers_count=5)
+        self.assertFalse(consume.called)
+
+
+class AdaptiveLimitTestCase(test.TestCase):
+
+    def test_init(self):
+        limit = broker.AdaptiveLimit(10)
+        self.assertEqual(broker.INITIAL_CONSUMERS, limit.value)
+        self.assertEqual(1, limit.min_value)
+
+        limit = broker.AdaptiveLimit(1)
+        self.assertEqual(1, limit.value)
+
+        limit = broker.AdaptiveLimit(0)
+        self.assertEqual(1, limit.value)
+
+        limit = broker.AdaptiveLimit(10, min_value=10, initial=10)
+        self.assertEqual(10, limit.value)
+
+    def _run_job(self, limit, latency=0.1, overloaded=False):
+        limit.acquire()
+        limit.release(latency, overloaded)
+
+    def test_increase_while_latency_is_flat(self):
+        limit = broker.AdaptiveLimit(4, initial=1)
+
+        self._run_job(limit)
+        self.assertEqual(2, limit.value)
+        self._run_job(limit)
+        self.assertEqual(2, limit.value)
+        self._run_job(limit)
+        self.assertEqual(3, limit.value)
+
+        for i in range(20):
+            self._run_job(limit)
+        self.assertEqual(4, limit.value)
+
+    def test_decrease_on_latency_growth(self):
+        limit = broker.AdaptiveLimit(20, initial=16)
+        self._run_job(limit, latency=0.1)
+        self._run_job(limit, latency=10)
+        self.assertEqual(8, limit.value)
+
+    def test_decrease_once_per_latency_climb(self):
+        limit = broker.AdaptiveLimit(20, initial=16)
+        self._run_job(limit, latency=0.001)
+        for i in range(7):
+            self._run_job(limit, latency=0.1)
+        self.assertEqual(8, limit.value)
+
+    def test_best_latency_drifts(self):
+        limit = broker.AdaptiveLimit(4, initial=4)
+        self._run_job(limit, latency=0.05)
+        for i in range(3):
+            self._run_job(limit, latency=0.09)
+        self.assertEqual(4, limit.value)
+        self.assertGreater(limit._best_latency, 0.05)
+
+    def test_decrease_on_overload(self):
+        limit = broker.AdaptiveLimit(20, initial=16)
+        self._run_job(limit, overloaded=True)
+        self.assertEqual(8, limit.value)
+        self._run_job(limit, overloaded=True)
+        self.assertEqual(4, limit.value)
+
+        limit.decrease()
+        self.assertEqual(2, limit.value)
+        limit.decrease()
+        limit.decrease()
+        self.assertEqual(1, limit.value)
+
+    def test_decrease_once_per_burst(self):
+        limit = broker.AdaptiveLimit(20, initial=8)
+        for i in range(4):
+            limit.acquire()
+
+        # all jobs which are in flight fail
+        limit.release(overloaded=True)
+        self.assertEqual(4, limit.value)
+        for i in range(3):
+            limit.release(overloaded=True)
+            self.assertEqual(4, limit.value)
+
+        # new jobs are taken into account again
+        self._run_job(limit, overloaded=True)
+        self.assertEqual(2, limit.value)
+
+    def test_not_adaptive(self):
+        limit = broker.AdaptiveLimit(5, min_value=5, initial=5)
+        self._run_job(limit, overloaded=True)
+        self.assertEqual(5, limit.value)
+        self._run_job(limit)
+        self.assertEqual(5, limit.value)
+
+    def test_acquire_waits_for_release(self):
+        limit = broker.AdaptiveLimit(1)
+        limit.acquire()
+        acquired = threading.Event()
+
+        def acquire():
+            limit.acquire()
+            acquired.set()
+
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        self.assertFalse(acquired.wait(0.05))
+        limit.release()
+        self.assertTrue(acquired.wait(5))
+        thread.join()
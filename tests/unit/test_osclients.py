@@ -13,6 +13,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+import time
+
 import ddt
 import mock
 
@@ -123,6 +126,111 @@ class OSClientTestCase(test.TestCase, OSClientTestCaseUtils):
         mock_url_for.assert_called_once_with(**call_args)
         mock_choose_service_type.assert_called_once_with(service_type)
 
+        # the endpoint is resolved once per catalog
+        osclient._get_endpoint(service_type)
+        mock_url_for.assert_called_once_with(**call_args)
+
+
+class EndpointIndexTestCase(test.TestCase):
+
+    def test_url_for(self):
+        index = osclients.EndpointIndex()
+        catalog = mock.Mock()
+        catalog.url_for.side_effect = ["url1", "url2", "url3"]
+
+        self.assertEqual("url1", index.url_for(catalog, "compute"))
+        self.assertEqual("url1", index.url_for(catalog, "compute"))
+        self.assertEqual("url2", index.url_for(catalog, "compute",
+                                               region_name="rn",
+                                               interface="internal"))
+        self.assertEqual("url2", index.url_for(catalog, "compute",
+                                               region_name="rn",
+                                               interface="internal"))
+        self.assertEqual(
+            [mock.call(service_type="compute", region_name=None),
+             mock.call(service_type="compute", region_name="rn",
+                       interface="internal")],
+            catalog.url_for.call_args_list)
+
+        # every catalog (token) has own index
+        other_catalog = mock.Mock()
+        self.assertEqual(other_catalog.url_for.return_value,
+                         index.url_for(other_catalog, "compute"))
+
+    def test_url_for_fails(self):
+        index = osclients.EndpointIndex()
+        catalog = mock.Mock()
+        catalog.url_for.side_effect = [ValueError, "url"]
+
+        self.assertRaises(ValueError, index.url_for, catalog, "compute")
+        self.assertEqual("url", index.url_for(catalog, "compute"))
+
+    def test_index_is_dropped_with_catalog(self):
+        class FakeCatalog(object):
+            def url_for(self, **kwargs):
+                return "url"
+
+        index = osclients.EndpointIndex()
+        catalog = FakeCatalog()
+        index.url_for(catalog, "compute")
+        self.assertEqual(1, len(index._indexes))
+
+        del catalog
+        self.assertEqual(0, len(index._indexes))
+
+
+class NeutronExtensionsTestCase(test.TestCase):
+
+    def _client(self, endpoint, aliases):
+        client = mock.Mock()
+        client.httpclient.endpoint_override = endpoint
+        client.list_extensions.return_value = {
+            "extensions": [{"alias": alias} for alias in aliases]}
+        return client
+
+    def test_get_aliases(self):
+        extensions = osclients.NeutronExtensions()
+        client = self._client("http://neutron:9696", ["foo", "bar"])
+        # clients of other users of the same endpoint
+        same_endpoint = self._client("http://neutron:9696", [])
+        other_endpoint = self._client("http://other:9696", ["baz"])
+
+        self.assertEqual({"foo", "bar"}, extensions.get_aliases(client))
+        self.assertEqual({"foo", "bar"},
+                         extensions.get_aliases(same_endpoint))
+        self.assertEqual({"baz"}, extensions.get_aliases(other_endpoint))
+        client.list_extensions.assert_called_once_with()
+        self.assertFalse(same_endpoint.list_extensions.called)
+        other_endpoint.list_extensions.assert_called_once_with()
+
+    def test_get_aliases_without_endpoint(self):
+        extensions = osclients.NeutronExtensions()
+        client = mock.Mock(spec=["list_extensions"])
+        client.list_extensions.return_value = {}
+
+        self.assertEqual(set(), extensions.get_aliases(client))
+        self.assertEqual(set(), extensions.get_aliases(client))
+        self.assertEqual(2, client.list_extensions.call_count)
+
+    def test_invalidate(self):
+        extensions = osclients.NeutronExtensions()
+        client = self._client("http://neutron:9696", ["foo"])
+        other_client = self._client("http://other:9696", ["bar"])
+        extensions.get_aliases(client)
+        extensions.get_aliases(other_client)
+
+        extensions.invalidate(client)
+        extensions.get_aliases(client)
+        extensions.get_aliases(other_client)
+        self.assertEqual(2, client.list_extensions.call_count)
+        self.assertEqual(1, other_client.list_extensions.call_count)
+
+        extensions.invalidate()
+        extensions.get_aliases(client)
+        extensions.get_aliases(other_client)
+        self.assertEqual(3, client.list_extensions.call_count)
+        self.assertEqual(2, other_client.list_extensions.call_count)
+
 
 class CachedTestCase(test.TestCase):
 
@@ -154,6 +262,279 @@ class CachedTestCase(test.TestCase):
         clients.clear()
         self.assertEqual({}, clients.cache)
 
+    def test_cached_with_expiring_token(self):
+        auth_ref = mock.Mock()
+        auth_ref.will_expire_soon.return_value = False
+        clients = osclients.Clients({"auth_url": "url", "username": "user",
+                                     "password": "pass"},
+                                    cache={"keystone_auth_ref": auth_ref})
+
+        @osclients.configure(self.id())
+        class SomeClient(osclients.OSClient):
+            pass
+
+        fake_client = SomeClient(clients.credential, clients.api_info,
+                                 clients.cache)
+        fake_client.create_client = mock.Mock(side_effect=["c1", "c2"])
+
+        self.assertEqual("c1", fake_client())
+        self.assertEqual("c1", fake_client())
+        self.assertEqual({self.id(): auth_ref},
+                         clients.cache["clients_auth_refs"])
+
+        # the token which is used by the client expires soon
+        auth_ref.will_expire_soon.return_value = True
+        new_auth_ref = mock.Mock()
+        clients.cache["keystone_auth_ref"] = new_auth_ref
+        self.assertEqual("c2", fake_client())
+        self.assertEqual({self.id(): new_auth_ref},
+                         clients.cache["clients_auth_refs"])
+
+
+class SessionPoolTestCase(test.TestCase):
+
+    def test_get(self):
+        pool = osclients.SessionPool()
+        create = mock.Mock(side_effect=["session1", "session2"])
+
+        self.assertEqual("session1", pool.get("key1", create))
+        self.assertEqual("session1", pool.get("key1", create))
+        self.assertEqual("session2", pool.get("key2", create))
+        self.assertEqual(2, create.call_count)
+
+        pool.clear()
+        create.side_effect = ["session3"]
+        self.assertEqual("session3", pool.get("key1", create))
+
+    @mock.patch("%s.CONF" % PATH)
+    def test_discard(self, mock_conf):
+        mock_conf.openstack.keystone_session_pool_size = 10
+        mock_conf.openstack.keystone_token_refresh_margin = 0
+        pool = osclients.SessionPool()
+        create = mock.Mock(side_effect=lambda: mock.Mock())
+        user1 = oscredential.OpenStackCredential(
+            "http://example.com", "user1", "pass", tenant_name="t1")
+        user2 = oscredential.OpenStackCredential(
+            "http://example.com", "user2", "pass", tenant_name="t1")
+        key1 = osclients._get_credential_key(user1)
+        key2 = osclients._get_credential_key(user2)
+
+        sessions = [pool.get(key1 + (version,), create)
+                    for version in ("2", "3")]
+        session2 = pool.get(key2 + ("3",), create)
+
+        pool.discard(user1)
+
+        self.assertIs(session2, pool.get(key2 + ("3",), create))
+        self.assertIsNot(sessions[1], pool.get(key1 + ("3",), create))
+        self.assertEqual(4, create.call_count)
+
+    @mock.patch("%s.CONF" % PATH)
+    def test_get_evicts_least_recently_used(self, mock_conf):
+        mock_conf.openstack.keystone_session_pool_size = 2
+        mock_conf.openstack.keystone_token_refresh_margin = 0
+        pool = osclients.SessionPool()
+        create = mock.Mock(side_effect=lambda: mock.Mock())
+
+        first = pool.get("key1", create)
+        pool.get("key2", create)
+        # key1 becomes the most recently used one
+        self.assertIs(first, pool.get("key1", create))
+        pool.get("key3", create)
+
+        self.assertIs(first, pool.get("key1", create))
+        self.assertEqual(3, create.call_count)
+        pool.get("key2", create)
+        self.assertEqual(4, create.call_count)
+
+    @mock.patch("%s.CONF" % PATH)
+    def test_get_disabled(self, mock_conf):
+        mock_conf.openstack.keystone_session_pool_size = 0
+        pool = osclients.SessionPool()
+        create = mock.Mock(side_effect=["session1", "session2"])
+
+        self.assertEqual("session1", pool.get("key1", create))
+        self.assertEqual("session2", pool.get("key1", create))
+
+    def test_get_fails(self):
+        pool = osclients.SessionPool()
+        create = mock.Mock(side_effect=[ValueError, "session"])
+
+        self.assertRaises(ValueError, pool.get, "key", create)
+        self.assertEqual("session", pool.get("key", create))
+        self.assertEqual("session", pool.get("key", create))
+
+    @mock.patch("%s.CONF" % PATH)
+    def test_refresh(self, mock_conf):
+        mock_conf.openstack.keystone_token_refresh_margin = 300
+        pool = osclients.SessionPool()
+        session = mock.Mock()
+        plugin = mock.Mock(auth_ref=None)
+        auth_ref = plugin.get_access.return_value
+        auth_ref.will_expire_soon.return_value = False
+
+        # the first authentication
+        self.assertEqual(auth_ref, pool.refresh(session, plugin))
+        auth_ref.will_expire_soon.assert_called_once_with(stale_duration=300)
+        self.assertFalse(plugin.invalidate.called)
+        self.assertIn(plugin, pool._refresh_locks)
+
+        # the valid token
+        plugin.auth_ref = auth_ref
+        self.assertEqual(auth_ref, pool.refresh(session, plugin))
+        self.assertFalse(plugin.invalidate.called)
+        self.assertEqual(2, plugin.get_access.call_count)
+
+        new_auth_ref = mock.Mock()
+        auth_ref.will_expire_soon.return_value = True
+        plugin.get_access.side_effect = [auth_ref, new_auth_ref]
+        self.assertEqual(new_auth_ref, pool.refresh(session, plugin))
+        plugin.invalidate.assert_called_once_with()
+        self.assertEqual(4, plugin.get_access.call_count)
+
+        # proactive refresh is disabled
+        mock_conf.openstack.keystone_token_refresh_margin = 0
+        plugin.get_access.side_effect = None
+        plugin.get_access.return_value = auth_ref
+        self.assertEqual(auth_ref, pool.refresh(session, plugin))
+        plugin.invalidate.assert_called_once_with()
+
+    @mock.patch("%s.CONF" % PATH)
+    def test_refresh_different_plugins_concurrently(self, mock_conf):
+        mock_conf.openstack.keystone_token_refresh_margin = 300
+        pool = osclients.SessionPool()
+        plugins_count = 5
+        state = {"started": 0, "overlapped": 0}
+        cond = threading.Condition()
+
+        def get_access(session):
+            # every authentication waits for all the rest to start, which
+            # is possible only if they are not serialized
+            with cond:
+                state["started"] += 1
+                cond.notify_all()
+                deadline = time.time() + 5
+                while (state["started"] < plugins_count
+                       and time.time() < deadline):
+                    cond.wait(deadline - time.time())
+                if state["started"] == plugins_count:
+                    state["overlapped"] += 1
+            return mock.Mock(**{"will_expire_soon.return_value": False})
+
+        plugins = [mock.Mock(auth_ref=None, get_access=get_access)
+                   for i in range(plugins_count)]
+        threads = [threading.Thread(target=pool.refresh,
+                                    args=(mock.Mock(), plugin))
+                   for plugin in plugins]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(plugins_count, state["overlapped"])
+
+    @mock.patch("%s.CONF" % PATH)
+    def test_refresh_same_plugin_once(self, mock_conf):
+        mock_conf.openstack.keystone_token_refresh_margin = 300
+        pool = osclients.SessionPool()
+        auth_ref = mock.Mock(**{"will_expire_soon.return_value": False})
+        plugin = mock.Mock(auth_ref=None)
+        authentications = []
+
+        def get_access(session):
+            if plugin.auth_ref is None:
+                authentications.append(1)
+                time.sleep(0.05)
+                plugin.auth_ref = auth_ref
+            return plugin.auth_ref
+
+        plugin.get_access = mock.Mock(side_effect=get_access)
+        threads = [threading.Thread(target=pool.refresh,
+                                    args=(mock.Mock(), plugin))
+                   for i in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertFalse(plugin.invalidate.called)
+        self.assertEqual(1, len(authentications))
+
+    @mock.patch("%s.time.sleep" % PATH)
+    @mock.patch("%s.CONF" % PATH)
+    def test__refresh_tokens(self, mock_conf, mock_sleep):
+        mock_conf.openstack.keystone_session_pool_size = 10
+        mock_conf.openstack.keystone_token_refresh_margin = 0
+        pool = osclients.SessionPool()
+        fresh = mock.Mock()
+        fresh.auth_ref.will_expire_soon.return_value = False
+        expiring = mock.Mock()
+        expiring.auth_ref.will_expire_soon.return_value = True
+        unused = mock.Mock(auth_ref=None)
+        broken = mock.Mock()
+        broken.auth_ref.will_expire_soon.side_effect = ValueError
+        for name, plugin in (("fresh", fresh), ("expiring", expiring),
+                             ("unused", unused), ("broken", broken)):
+            pool.get(name, lambda: ("session", plugin))
+        mock_conf.openstack.keystone_token_refresh_margin = 300
+
+        def sleep(interval):
+            if mock_sleep.call_count > 1:
+                pool.clear()
+        mock_sleep.side_effect = sleep
+
+        with mock.patch.object(pool, "refresh") as mock_refresh:
+            pool._refresh_tokens(30)
+
+        mock_refresh.assert_called_once_with("session", expiring)
+        mock_sleep.assert_has_calls([mock.call(30)] * 2)
+        self.assertIsNone(pool._refresher)
+
+    @mock.patch("%s.threading.Thread" % PATH)
+    @mock.patch("%s.CONF" % PATH)
+    def test__start_refresher(self, mock_conf, mock_thread):
+        mock_conf.openstack.keystone_token_refresh_margin = 0
+        pool = osclients.SessionPool()
+        pool._start_refresher()
+        self.assertFalse(mock_thread.called)
+
+        mock_conf.openstack.keystone_token_refresh_margin = 20
+        pool._start_refresher()
+        mock_thread.assert_called_once_with(target=pool._refresh_tokens,
+                                            args=(10.0,))
+        mock_thread.return_value.start.assert_called_once_with()
+
+        # already started
+        mock_thread.return_value.is_alive.return_value = True
+        pool._start_refresher()
+        self.assertEqual(1, mock_thread.call_count)
+
+    def test_get_concurrently(self):
+        pool = osclients.SessionPool()
+        started = threading.Event()
+        release = threading.Event()
+
+        def create():
+            started.set()
+            release.wait(5)
+            return mock.Mock()
+
+        create = mock.Mock(side_effect=create)
+        results = []
+        threads = [threading.Thread(
+            target=lambda: results.append(pool.get("key", create)))
+            for i in range(5)]
+        for t in threads:
+            t.start()
+        started.wait(5)
+        release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(1, create.call_count)
+        self.assertEqual(5, len(results))
+        self.assertEqual(1, len(set(id(r) for r in results)))
+
 
 @ddt.ddt
 class TestCreateKeystoneClient(test.TestCase, OSClientTestCaseUtils):
@@ -256,6 +637,27 @@ class TestCreateKeystoneClient(test.TestCase, OSClientTestCaseUtils):
              mock.call(auth=self.ksa_identity_plugin, timeout=180.0,
                        verify=True, cert=None)])
 
+    @mock.patch("%s.Keystone._create_session" % PATH)
+    def test_keystone_get_session_is_shared(self, mock__create_session):
+        keystone1 = osclients.Keystone(self.credential, {}, {})
+        keystone2 = osclients.Keystone(
+            oscredential.OpenStackCredential(
+                "http://auth_url/v2.0", "user", "pass", "tenant"), {}, {})
+        other = osclients.Keystone(
+            oscredential.OpenStackCredential(
+                "http://auth_url/v2.0", "user2", "pass", "tenant"), {}, {})
+
+        self.assertIs(keystone1.get_session(), keystone2.get_session())
+        mock__create_session.assert_called_once_with(None)
+        self.assertIs(mock__create_session.return_value,
+                      keystone1.cache["keystone_session_and_plugin_None"])
+
+        keystone1.get_session(version="3")
+        other.get_session()
+        self.assertEqual(
+            [mock.call(None), mock.call("3"), mock.call(None)],
+            mock__create_session.call_args_list)
+
     def test_keystone_property(self):
         keystone = osclients.Keystone(self.credential, None, None)
         self.assertRaises(exceptions.RallyException, lambda: keystone.keystone)
@@ -264,19 +666,29 @@ class TestCreateKeystoneClient(test.TestCase, OSClientTestCaseUtils):
     def test_auth_ref(self, mock_keystone_get_session):
         session = mock.MagicMock()
         auth_plugin = mock.MagicMock()
+        auth_ref = auth_plugin.get_access.return_value
+        auth_ref.will_expire_soon.return_value = False
         mock_keystone_get_session.return_value = (session, auth_plugin)
         cache = {}
         keystone = osclients.Keystone(self.credential, None, cache)
 
-        self.assertEqual(auth_plugin.get_access.return_value,
-                         keystone.auth_ref)
-        self.assertEqual(auth_plugin.get_access.return_value,
-                         cache["keystone_auth_ref"])
+        self.assertEqual(auth_ref, keystone.auth_ref)
+        self.assertEqual(auth_ref, cache["keystone_auth_ref"])
 
         # check that auth_ref was cached.
         keystone.auth_ref
         mock_keystone_get_session.assert_called_once_with()
 
+        # the token expires soon
+        new_auth_ref = mock.Mock()
+        new_auth_ref.will_expire_soon.return_value = False
+        auth_ref.will_expire_soon.return_value = True
+        auth_plugin.get_access.side_effect = [auth_ref, new_auth_ref]
+
+        self.assertEqual(new_auth_ref, keystone.auth_ref)
+        auth_plugin.invalidate.assert_called_once_with()
+        self.assertEqual(new_auth_ref, cache["keystone_auth_ref"])
+
     @mock.patch("%s.LOG.exception" % PATH)
     @mock.patch("%s.logging.is_debug" % PATH)
     def test_auth_ref_fails(self, mock_is_debug, mock_log_exception):
@@ -16,6 +16,7 @@ import ddt
 import fixtures
 import mock
 
+from rally import exceptions
 from rally_openstack.credential import OpenStackCredential
 from rally_openstack import scenario as base_scenario
 from tests.unit import test
@@ -169,3 +170,64 @@ class OpenStackScenarioTestCase(test.TestCase):
         self.assertEqual(self.context["tenants"][tenant_id],
                          self.context["tenant"])
         self.assertEqual(expected_tenant_id, tenant_id)
+
+    def test_assertIn(self):
+        scenario = base_scenario.OpenStackScenario()
+        container = mock.MagicMock()
+        container.__contains__.return_value = True
+        container.__repr__ = mock.Mock(return_value="container")
+        err_msg = mock.Mock()
+
+        scenario.assertIn("foo", container, err_msg=err_msg)
+        # the container is not rendered if the check passes
+        self.assertFalse(container.__repr__.called)
+        self.assertFalse(err_msg.called)
+
+        container.__contains__.return_value = False
+        err_msg.return_value = "Foo is missing"
+        e = self.assertRaises(exceptions.RallyAssertionError,
+                              scenario.assertIn, "foo", container,
+                              err_msg=err_msg)
+        err_msg.assert_called_once_with()
+        self.assertIn("Foo is missing", "%s" % e)
+
+        e = self.assertRaises(exceptions.RallyAssertionError,
+                              scenario.assertIn, "foo", ["bar"],
+                              err_msg="String message")
+        self.assertIn("String message", "%s" % e)
+
+    @ddt.data((5, 2, [2, 4, 5], [None, 1, 3]),
+              (4, 2, [2, 4, 4], [None, 1, 3]),
+              (0, 2, [0], [None]),
+              (3, 5, [3], [None]))
+    @ddt.unpack
+    def test__iterate_pages(self, total, page_size, expected_ends,
+                            expected_markers):
+        resources = [mock.Mock(id=i) for i in range(total)]
+        calls = []
+
+        def list_page(marker, limit):
+            start = 0 if marker is None else marker + 1
+            calls.append(marker)
+            return resources[start:start + limit]
+
+        pages = base_scenario.OpenStackScenario._iterate_pages(list_page,
+                                                               page_size)
+        self.assertEqual(resources, list(pages))
+        self.assertEqual(expected_markers, calls)
+
+    def test__iterate_pages_marker_is_ignored(self):
+        page = [mock.Mock(id=1), mock.Mock(id=2)]
+        list_page = mock.Mock(return_value=page)
+        pages = base_scenario.OpenStackScenario._iterate_pages(list_page, 2)
+        self.assertEqual(page, list(pages))
+        self.assertEqual([mock.call(marker=None, limit=2),
+                          mock.call(marker=2, limit=2)],
+                         list_page.call_args_list)
+
+    def test__iterate_pages_stops_early(self):
+        list_page = mock.Mock(return_value=[mock.Mock(id=1),
+                                            mock.Mock(id=2)])
+        pages = base_scenario.OpenStackScenario._iterate_pages(list_page, 2)
+        self.assertEqual(1, next(pages).id)
+        list_page.assert_called_once_with(marker=None, limit=2)
@@ -13,6 +13,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import re
+
+import ddt
 import mock
 
 from rally import exceptions
@@ -21,6 +24,91 @@ from tests.unit import fakes
 from tests.unit import test
 
 
+class LookupCacheTestCase(test.TestCase):
+
+    def test_get_lookup_cache(self):
+        context = {}
+        cache = types.get_lookup_cache(context)
+        self.assertEqual({}, cache)
+        self.assertIs(cache, types.get_lookup_cache(context))
+
+    def test_cached_lookup(self):
+        cache = {}
+        method = mock.Mock()
+        credential = fakes.FakeCredential(tenant_name="foo")
+
+        for i in range(3):
+            self.assertEqual(
+                method.return_value,
+                types.cached_lookup(cache, credential, "images", method,
+                                    "arg", visibility="public"))
+        method.assert_called_once_with("arg", visibility="public")
+
+        # another arguments
+        types.cached_lookup(cache, credential, "images", method)
+        # another project
+        types.cached_lookup(cache, fakes.FakeCredential(tenant_name="bar"),
+                            "images", method, "arg", visibility="public")
+        self.assertEqual(3, method.call_count)
+
+        # the same project of another domain, another users
+        for creds in ({"project_domain_name": "foo_domain"},
+                      {"username": "foo_user"},
+                      {"username": "admin", "user_domain_name": "foo_domain"}):
+            types.cached_lookup(
+                cache, fakes.FakeCredential(tenant_name="foo", **creds),
+                "images", method, "arg", visibility="public")
+        self.assertEqual(6, method.call_count)
+
+
+@ddt.ddt
+class ResourceIndexTestCase(test.TestCase):
+
+    @ddt.data(("^cirros-0.3.4-uec$", "cirros-0"),
+              ("^cirros", "cirros"),
+              (r"^cirros-0\.3\.4", "cirros-0.3.4"),
+              ("^ab?c", "a"),
+              ("^abc*", "ab"),
+              ("^ab{2}", "a"),
+              ("^ab+", "ab"),
+              (r"^a\d", "a"),
+              ("^a[bc]", "a"),
+              ("^", ""),
+              ("cirros", ""),
+              ("^a|b", ""),
+              ("^(?:a)", ""))
+    @ddt.unpack
+    def test__literal_prefix(self, pattern, prefix):
+        self.assertEqual(prefix, types._literal_prefix(pattern))
+
+    def test_get_by_name(self):
+        resources = [fakes.FakeResource(name="foo", id="1"),
+                     fakes.FakeResource(name="bar", id="2"),
+                     fakes.FakeResource(name="foo", id="3")]
+        index = types.ResourceIndex(resources)
+
+        self.assertEqual([resources[0], resources[2]],
+                         index.get_by_name("foo"))
+        self.assertEqual([], index.get_by_name("baz"))
+        self.assertEqual(resources, list(index))
+        self.assertEqual(3, len(index))
+
+    def test_search(self):
+        names = ["cirros-0.3.5", "ubuntu", "cirros-0.3.4-uec", "xcirros",
+                 None, "cirros-0.3.4-uec-ramdisk", "cirros"]
+        resources = [fakes.FakeResource(name=name, id=str(i))
+                     for i, name in enumerate(names)]
+        resources[4].name = None
+        index = types.ResourceIndex(resources)
+
+        for pattern in ("^cirros-0.3.4-uec$", "^cirros", "cirros",
+                        "^cirros-0\\.3\\.[45]", "^$", "^", "^x|ubuntu"):
+            pattern = re.compile(pattern)
+            self.assertEqual(
+                [r for r in resources if pattern.search(r.name or "")],
+                index.search(pattern))
+
+
 class OpenStackResourceTypeTestCase(test.TestCase):
     def test__find_resource(self):
 
@@ -54,6 +142,15 @@ class OpenStackResourceTypeTestCase(test.TestCase):
             resources["Fake3"],
             ftype._find_resource({"regex": "Fake"}, resources.values()))
 
+        # case #5: resources are indexed already
+        index = types.ResourceIndex(resources.values())
+        self.assertEqual(
+            resources["Fake3"],
+            ftype._find_resource({"regex": "^Fake"}, index))
+        self.assertEqual(
+            resources["Fake1"],
+            ftype._find_resource({"name": "Fake1"}, index))
+
     def test__find_resource_negative(self):
 
         @types.configure(name=self.id())
@@ -270,6 +367,21 @@ class GlanceImageTestCase(test.TestCase):
                           self.type_cls.pre_process,
                           resource_spec=resource_spec, config={})
 
+    @mock.patch("rally_openstack.types.image.Image")
+    def test_preprocess_with_shared_cache(self, mock_image):
+        mock_image.return_value.list_images.return_value = [
+            fakes.FakeResource(name="cirros", id="100")]
+        credential = fakes.FakeCredential()
+        cache = {}
+
+        for i in range(3):
+            type_cls = types.GlanceImage(
+                context={"admin": {"credential": credential}}, cache=cache)
+            self.assertEqual("100", type_cls.pre_process(
+                resource_spec={"name": "cirros"}, config={}))
+
+        mock_image.return_value.list_images.assert_called_once_with()
+
 
 class GlanceImageArgsTestCase(test.TestCase):
 
@@ -169,14 +169,20 @@ class ImageExistsValidatorTestCase(test.TestCase):
 
         mock_glance_image.assert_called_once_with(
             context={"admin": {
-                "credential": self.context["users"][0]["credential"]}})
+                "credential": self.context["users"][0]["credential"]}},
+            cache=self.context["openstack_lookup_cache"])
         mock_glance_image.return_value.pre_process.assert_called_once_with(
             config["args"]["image"], config={})
         clients.glance().images.get.assert_called_with("image_id")
 
+        # the image is looked up once per task
+        self.validator.validate(self.context, config, None, None)
+        clients.glance().images.get.assert_called_once_with("image_id")
+
         exs = [exceptions.InvalidScenarioArgument(),
                glance_exc.HTTPNotFound()]
         for ex in exs:
+            self.context.pop("openstack_lookup_cache")
             clients.glance().images.get.side_effect = ex
 
             e = self.assertRaises(
@@ -297,8 +303,8 @@ class FlavorExistsValidatorTestCase(test.TestCase):
         self.assertEqual("flavor", result)
 
         mock_flavor.assert_called_once_with(
-            context={"admin": {"credential": clients.credential}}
-        )
+            context={"admin": {"credential": clients.credential}},
+            cache=mock.ANY)
         mock_flavor_obj = mock_flavor.return_value
         mock_flavor_obj.pre_process.assert_called_once_with(
             self.config["args"]["flavor"], config={})
@@ -363,7 +369,8 @@ class FlavorExistsValidatorTestCase(test.TestCase):
         self.validator._get_validated_flavor.assert_called_once_with(
             config=config,
             clients=ctx["users"][0]["credential"].clients(),
-            param_name=self.validator.param_name)
+            param_name=self.validator.param_name,
+            cache=ctx.setdefault.return_value)
 
 
 @ddt.ddt
@@ -545,7 +552,8 @@ class ImageValidOnFlavorValidatorTestCase(test.TestCase):
                                                      "image")
         self.assertEqual(image, result)
         mock_glance_image.assert_called_once_with(
-            context={"admin": {"credential": clients.credential}})
+            context={"admin": {"credential": clients.credential}},
+            cache=mock.ANY)
         mock_glance_image.return_value.pre_process.assert_called_once_with(
             config["args"]["image"], config={})
         clients.glance().images.get.assert_called_with("image_id")
@@ -576,7 +584,8 @@ class ImageValidOnFlavorValidatorTestCase(test.TestCase):
         self.assertEqual(image, result)
 
         mock_glance_image.assert_called_once_with(
-            context={"admin": {"credential": clients.credential}})
+            context={"admin": {"credential": clients.credential}},
+            cache=mock.ANY)
         mock_glance_image.return_value.pre_process.assert_called_once_with(
             config["args"]["image"], config={})
         clients.glance().images.get.assert_called_with("image_id")
@@ -594,7 +603,8 @@ class ImageValidOnFlavorValidatorTestCase(test.TestCase):
                          e.message)
 
         mock_glance_image.assert_called_once_with(
-            context={"admin": {"credential": clients.credential}})
+            context={"admin": {"credential": clients.credential}},
+            cache=mock.ANY)
         mock_glance_image.return_value.pre_process.assert_called_once_with(
             config["args"]["image"], config={})
         clients.glance().images.get.assert_called_with("image_id")
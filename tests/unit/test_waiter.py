@@ -0,0 +1,210 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+import mock
+
+from rally import exceptions
+from rally_openstack import waiter
+from tests.unit import fakes
+from tests.unit import test
+
+
+class WaiterTestCase(test.TestCase):
+
+    def setUp(self):
+        super(WaiterTestCase, self).setUp()
+        self.addCleanup(waiter._groups.clear)
+
+    def _server(self, server_id, status):
+        return fakes.FakeServer(id=server_id, status=status)
+
+    def _lister(self, *polls):
+        """Return a list function which returns given polls one by one."""
+        polls = list(polls)
+
+        def list_resources():
+            if len(polls) > 1:
+                return polls.pop(0)
+            return polls[0]
+
+        return mock.Mock(side_effect=list_resources)
+
+    def test_make_key(self):
+        credential = mock.Mock(auth_url="http://example.com",
+                               region_name="RegionOne", tenant_name="demo")
+        self.assertEqual(
+            ("nova.servers", "http://example.com", "RegionOne", "demo"),
+            waiter.make_key("nova.servers", credential))
+
+    def test_wait_for_statuses(self):
+        servers = [self._server("a", "BUILD"), self._server("b", "BUILD")]
+        list_resources = self._lister(
+            [self._server("a", "ACTIVE"), self._server("b", "BUILD")],
+            [self._server("c", "ACTIVE"), self._server("b", "ACTIVE"),
+             self._server("a", "ACTIVE")])
+
+        result = waiter.wait_for_statuses(
+            servers, ["ACTIVE"], list_resources, key="key",
+            check_interval=0)
+
+        self.assertEqual(["a", "b"], [s.id for s in result])
+        self.assertEqual(["ACTIVE", "ACTIVE"], [s.status for s in result])
+        self.assertEqual(2, list_resources.call_count)
+        self.assertEqual({}, waiter._groups)
+
+    def test_wait_for_status_with_dicts(self):
+        lb = {"lb_id": "a", "provisioning_status": "PENDING_CREATE"}
+        list_resources = self._lister(
+            [{"lb_id": "a", "provisioning_status": "ACTIVE"}])
+
+        result = waiter.wait_for_status(
+            lb, ["active"], list_resources, key="key",
+            status_attr="provisioning_status", id_attr="lb_id",
+            check_interval=0)
+
+        self.assertEqual({"lb_id": "a", "provisioning_status": "ACTIVE"},
+                         result)
+
+    def test_wait_for_statuses_error_status(self):
+        servers = [self._server("a", "BUILD")]
+        list_resources = self._lister([self._server("a", "ERROR")])
+
+        self.assertRaises(exceptions.GetResourceErrorStatus,
+                          waiter.wait_for_statuses, servers, ["ACTIVE"],
+                          list_resources, key="key", check_interval=0)
+        self.assertEqual({}, waiter._groups)
+
+    def test_wait_for_statuses_not_found(self):
+        servers = [self._server("a", "BUILD")]
+        list_resources = self._lister([self._server("b", "ACTIVE")])
+
+        self.assertRaises(exceptions.GetResourceNotFound,
+                          waiter.wait_for_statuses, servers, ["ACTIVE"],
+                          list_resources, key="key", check_interval=0)
+
+    def test_wait_for_statuses_missing_in_list(self):
+        servers = [self._server("a", "BUILD"), self._server("b", "BUILD")]
+        # "a" is not on the listed page of servers
+        list_resources = self._lister(
+            [self._server("b", "BUILD")], [self._server("b", "ACTIVE")])
+        get_resource = mock.Mock(side_effect=[self._server("a", "BUILD"),
+                                              self._server("a", "ACTIVE")])
+
+        result = waiter.wait_for_statuses(
+            servers, ["ACTIVE"], list_resources, key="key",
+            check_interval=0, get_resource=get_resource)
+
+        self.assertEqual(["ACTIVE", "ACTIVE"], [s.status for s in result])
+        self.assertEqual(2, get_resource.call_count)
+        self.assertEqual(["a", "a"], [c[0][0].id
+                                      for c in get_resource.call_args_list])
+
+    def test_wait_for_statuses_missing_in_list_not_found(self):
+        servers = [self._server("a", "BUILD")]
+        list_resources = self._lister([self._server("b", "ACTIVE")])
+        get_resource = mock.Mock(
+            side_effect=exceptions.GetResourceNotFound(resource="a"))
+
+        self.assertRaises(exceptions.GetResourceNotFound,
+                          waiter.wait_for_statuses, servers, ["ACTIVE"],
+                          list_resources, key="key", check_interval=0,
+                          get_resource=get_resource)
+        get_resource.assert_called_once_with(servers[0])
+
+    def test_wait_for_statuses_check_deletion(self):
+        servers = [self._server("a", "ACTIVE"), self._server("b", "ACTIVE")]
+        list_resources = self._lister(
+            [self._server("b", "DELETING")], [])
+
+        result = waiter.wait_for_statuses(
+            servers, ["deleted"], list_resources, key="key",
+            check_deletion=True, check_interval=0)
+
+        self.assertEqual([None, None], result)
+        self.assertEqual(2, list_resources.call_count)
+
+    def test_wait_for_statuses_timeout(self):
+        servers = [self._server("a", "BUILD")]
+        list_resources = self._lister([self._server("a", "BUILD")])
+
+        self.assertRaises(exceptions.TimeoutException,
+                          waiter.wait_for_statuses, servers, ["ACTIVE"],
+                          list_resources, key="key", timeout=0.05,
+                          check_interval=0.01)
+        self.assertTrue(list_resources.called)
+        self.assertEqual({}, waiter._groups)
+
+    def test_wait_for_statuses_list_fails(self):
+        servers = [self._server("a", "BUILD")]
+        list_resources = mock.Mock(side_effect=KeyError("boom"))
+
+        self.assertRaises(KeyError, waiter.wait_for_statuses, servers,
+                          ["ACTIVE"], list_resources, key="key",
+                          check_interval=0)
+        self.assertEqual({}, waiter._groups)
+
+    def test_wait_for_statuses_shares_list_calls(self):
+        waiters = 5
+        servers = [self._server(str(i), "BUILD") for i in range(waiters)]
+        started = threading.Event()
+        release = threading.Event()
+        polls = []
+
+        def list_resources():
+            polls.append(1)
+            if len(polls) == 1:
+                # the first call is in progress while the rest of waiters
+                # join, so they have to wait for the next one
+                started.set()
+                release.wait(5)
+                return [self._server(s.id, "BUILD") for s in servers]
+            return [self._server(s.id, "ACTIVE") for s in servers]
+
+        results = {}
+
+        def wait(server):
+            results[server.id] = waiter.wait_for_status(
+                server, ["ACTIVE"], list_resources, key="key",
+                check_interval=0.01, timeout=5)
+
+        threads = [threading.Thread(target=wait, args=(servers[0],))]
+        threads[0].start()
+        self.assertTrue(started.wait(5))
+        for server in servers[1:]:
+            thread = threading.Thread(target=wait, args=(server,))
+            thread.start()
+            threads.append(thread)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(s.id for s in servers), sorted(results))
+        self.assertEqual(["ACTIVE"] * waiters,
+                         [r.status for r in results.values()])
+        self.assertEqual(2, len(polls))
+        self.assertEqual({}, waiter._groups)
+
+    def test_wait_for_statuses_different_keys(self):
+        list_a = self._lister([self._server("a", "ACTIVE")])
+        list_b = self._lister([self._server("b", "ACTIVE")])
+
+        waiter.wait_for_status(self._server("a", "BUILD"), ["ACTIVE"],
+                               list_a, key="a", check_interval=0)
+        waiter.wait_for_status(self._server("b", "BUILD"), ["ACTIVE"],
+                               list_b, key="b", check_interval=0)
+
+        list_a.assert_called_once_with()
+        list_b.assert_called_once_with()
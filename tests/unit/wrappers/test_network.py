@@ -20,6 +20,7 @@ from neutronclient.common import exceptions as neutron_exceptions
 from rally.common import utils
 
 from rally_openstack import consts
+from rally_openstack import osclients
 from rally_openstack.wrappers import network
 from tests.unit import test
 
@@ -145,8 +146,9 @@ class NeutronWrapperTestCase(test.TestCase):
         service._generate_cidr = mock.Mock(
             side_effect=lambda v: "cidr-%d" % next(subnets_cidrs))
         service.client.create_subnet = mock.Mock(
-            side_effect=lambda i: {
-                "subnet": {"id": "subnet-%d" % next(subnets_ids)}})
+            side_effect=lambda body: {
+                "subnets": [{"id": "subnet-%d" % next(subnets_ids)}
+                            for subnet in body["subnets"]]})
         service.client.create_network.return_value = {
             "network": {"id": "foo_id",
                         "name": self.owner.generate_random_name.return_value,
@@ -165,17 +167,56 @@ class NeutronWrapperTestCase(test.TestCase):
                           "tenant_id": "foo_tenant",
                           "subnets": ["subnet-%d" % i
                                       for i in range(subnets_num)]}, net)
+        service.client.create_subnet.assert_called_once_with(
+            {"subnets": [
+                {"name": self.owner.generate_random_name.return_value,
+                 "enable_dhcp": True,
+                 "network_id": "foo_id",
+                 "tenant_id": "foo_tenant",
+                 "ip_version": service.SUBNET_IP_VERSION,
+                 "dns_nameservers": ["8.8.8.8", "8.8.4.4"],
+                 "cidr": "cidr-%d" % i}
+                for i in range(subnets_num)]})
+
+    def test_create_network_with_subnets_without_bulk_support(self):
+        subnets_num = 3
+        service = self.get_wrapper()
+        service._generate_cidr = mock.Mock(return_value="foo_cidr")
+        subnets_ids = iter(range(subnets_num))
+
+        def create_subnet(body):
+            if "subnets" in body:
+                raise neutron_exceptions.BadRequest(
+                    "Bulk operation not supported")
+            return {"subnet": {"id": "subnet-%d" % next(subnets_ids)}}
+
+        service.client.create_subnet = mock.Mock(side_effect=create_subnet)
+        service.client.create_network.return_value = {
+            "network": {"id": "foo_id", "name": "foo_name",
+                        "status": "foo_status"}}
+
+        net = service.create_network("foo_tenant", subnets_num=subnets_num)
+
+        self.assertEqual(["subnet-%d" % i for i in range(subnets_num)],
+                         net["subnets"])
+        subnet = {"name": self.owner.generate_random_name.return_value,
+                  "enable_dhcp": True,
+                  "network_id": "foo_id",
+                  "tenant_id": "foo_tenant",
+                  "ip_version": service.SUBNET_IP_VERSION,
+                  "dns_nameservers": ["8.8.8.8", "8.8.4.4"],
+                  "cidr": "foo_cidr"}
         self.assertEqual(
-            service.client.create_subnet.mock_calls,
-            [mock.call({"subnet":
-                        {"name": self.owner.generate_random_name.return_value,
-                         "enable_dhcp": True,
-                         "network_id": "foo_id",
-                         "tenant_id": "foo_tenant",
-                         "ip_version": service.SUBNET_IP_VERSION,
-                         "dns_nameservers": ["8.8.8.8", "8.8.4.4"],
-                         "cidr": "cidr-%d" % i}})
-             for i in range(subnets_num)])
+            [mock.call({"subnets": [subnet] * subnets_num})]
+            + [mock.call({"subnet": subnet})] * subnets_num,
+            service.client.create_subnet.call_args_list)
+
+        # bulk requests are not sent anymore
+        service.client.create_subnet.reset_mock()
+        subnets_ids = iter(range(subnets_num))
+        service.create_network("foo_tenant", subnets_num=subnets_num)
+        self.assertEqual([mock.call({"subnet": subnet})] * subnets_num,
+                         service.client.create_subnet.call_args_list)
 
     def test_create_network_with_router(self):
         service = self.get_wrapper()
@@ -201,7 +242,7 @@ class NeutronWrapperTestCase(test.TestCase):
         service._generate_cidr = mock.Mock(return_value="foo_cidr")
         service.create_router = mock.Mock(return_value={"id": "foo_router"})
         service.client.create_subnet = mock.Mock(
-            return_value={"subnet": {"id": "foo_subnet"}})
+            return_value={"subnets": [{"id": "foo_subnet"}] * subnets_num})
         service.client.create_network.return_value = {
             "network": {"id": "foo_id",
                         "name": self.owner.generate_random_name.return_value,
@@ -218,16 +259,15 @@ class NeutronWrapperTestCase(test.TestCase):
                           "subnets": ["foo_subnet"] * subnets_num}, net)
         service.create_router.assert_called_once_with(external=True,
                                                       tenant_id="foo_tenant")
-        self.assertEqual(
-            service.client.create_subnet.mock_calls,
-            [mock.call({"subnet":
-                        {"name": self.owner.generate_random_name.return_value,
-                         "enable_dhcp": True,
-                         "network_id": "foo_id",
-                         "tenant_id": "foo_tenant",
-                         "ip_version": service.SUBNET_IP_VERSION,
-                         "dns_nameservers": ["foo_nameservers"],
-                         "cidr": "foo_cidr"}})] * subnets_num)
+        service.client.create_subnet.assert_called_once_with(
+            {"subnets": [
+                {"name": self.owner.generate_random_name.return_value,
+                 "enable_dhcp": True,
+                 "network_id": "foo_id",
+                 "tenant_id": "foo_tenant",
+                 "ip_version": service.SUBNET_IP_VERSION,
+                 "dns_nameservers": ["foo_nameservers"],
+                 "cidr": "foo_cidr"}] * subnets_num})
         self.assertEqual(service.client.add_interface_router.mock_calls,
                          [mock.call("foo_router", {"subnet_id": "foo_subnet"})
                           for i in range(subnets_num)])
@@ -255,6 +295,55 @@ class NeutronWrapperTestCase(test.TestCase):
         service.delete_v1_pool(pool["pool"]["id"])
         service.client.delete_pool.assert_called_once_with("pool-id")
 
+    def test_delete_network_with_given_ports_and_subnets(self):
+        service = self.get_wrapper()
+        ports = [{"id": "foo_port", "device_owner": "network:dhcp"}]
+
+        service.delete_network({"id": "foo_id", "router_id": None},
+                               ports=ports, subnets=[{"id": "foo_subnet"}])
+
+        self.assertFalse(service.client.list_ports.called)
+        self.assertFalse(service.client.list_subnets.called)
+        service.client.delete_port.assert_called_once_with("foo_port")
+        service.client.delete_subnet.assert_called_once_with("foo_subnet")
+        service.client.delete_network.assert_called_once_with("foo_id")
+
+    @mock.patch("rally_openstack.wrappers.network.LOG")
+    def test_delete_networks(self, mock_log):
+        service = self.get_wrapper()
+        service.client.list_ports.return_value = {"ports": [
+            {"id": "port1", "network_id": "net1"},
+            {"id": "port2", "network_id": "net2"},
+            {"id": "port3", "network_id": "net1"}]}
+        service.client.list_subnets.return_value = {"subnets": [
+            {"id": "subnet1", "network_id": "net2"}]}
+        service.delete_network = mock.Mock(side_effect=[Exception(), None,
+                                                        None])
+        networks = [{"id": "net1"}, {"id": "net2"}, {"id": "net3"}]
+
+        service.delete_networks(networks)
+
+        service.client.list_ports.assert_called_once_with(
+            network_id=["net1", "net2", "net3"])
+        service.client.list_subnets.assert_called_once_with(
+            network_id=["net1", "net2", "net3"])
+        self.assertEqual(
+            [mock.call(networks[0],
+                       ports=[{"id": "port1", "network_id": "net1"},
+                              {"id": "port3", "network_id": "net1"}],
+                       subnets=[]),
+             mock.call(networks[1],
+                       ports=[{"id": "port2", "network_id": "net2"}],
+                       subnets=[{"id": "subnet1", "network_id": "net2"}]),
+             mock.call(networks[2], ports=[], subnets=[])],
+            service.delete_network.call_args_list)
+        self.assertTrue(mock_log.warning.called)
+
+    def test_delete_networks_without_networks(self):
+        service = self.get_wrapper()
+        service.delete_networks([])
+        self.assertFalse(service.client.list_ports.called)
+
     @mock.patch("rally_openstack.wrappers.network.NeutronWrapper"
                 ".supports_extension", return_value=(True, ""))
     def test_delete_network_with_dhcp_and_router_and_ports_and_subnets(
@@ -448,17 +537,70 @@ class NeutronWrapperTestCase(test.TestCase):
                       "name": self.owner.generate_random_name.return_value,
                       "foo": "bar"}})
 
+    def test__create_bulk(self):
+        wrap = self.get_wrapper()
+        wrap.client.create_subnet.return_value = {"subnets": ["s1", "s2"]}
+
+        subnets = wrap._create_bulk("subnet", [{"cidr": "c1"},
+                                               {"cidr": "c2"}])
+
+        self.assertEqual(["s1", "s2"], subnets)
+        wrap.client.create_subnet.assert_called_once_with(
+            {"subnets": [{"cidr": "c1"}, {"cidr": "c2"}]})
+
+    def test__create_bulk_one_resource(self):
+        wrap = self.get_wrapper()
+        wrap.client.create_subnet.return_value = {"subnet": "s1"}
+
+        self.assertEqual(["s1"], wrap._create_bulk("subnet", [{"cidr": "c1"}]))
+        wrap.client.create_subnet.assert_called_once_with(
+            {"subnet": {"cidr": "c1"}})
+
+    @ddt.data(neutron_exceptions.BadRequest("Bulk operation not supported"),
+              neutron_exceptions.NotFound(),
+              neutron_exceptions.NeutronClientException(status_code=501))
+    @mock.patch("%sLOG" % SVC)
+    def test__create_bulk_without_bulk_support(self, error, mock_log):
+        wrap = self.get_wrapper()
+        wrap.client.create_subnet.side_effect = [
+            error, {"subnet": "s1"}, {"subnet": "s2"}]
+
+        self.assertEqual(["s1", "s2"],
+                         wrap._create_bulk("subnet", [{"cidr": "c1"},
+                                                      {"cidr": "c2"}]))
+        self.assertEqual([mock.call({"subnets": [{"cidr": "c1"},
+                                                 {"cidr": "c2"}]}),
+                          mock.call({"subnet": {"cidr": "c1"}}),
+                          mock.call({"subnet": {"cidr": "c2"}})],
+                         wrap.client.create_subnet.call_args_list)
+        self.assertTrue(mock_log.debug.called)
+        self.assertFalse(wrap._bulk_supported)
+
+    @ddt.data(neutron_exceptions.BadRequest("Invalid input for cidr"),
+              neutron_exceptions.Conflict(),
+              neutron_exceptions.OverQuotaClient())
+    def test__create_bulk_error(self, error):
+        wrap = self.get_wrapper()
+        wrap.client.create_subnet.side_effect = error
+
+        self.assertRaises(type(error), wrap._create_bulk,
+                          "subnet", [{"cidr": "c1"}, {"cidr": "c2"}])
+        wrap.client.create_subnet.assert_called_once_with(
+            {"subnets": [{"cidr": "c1"}, {"cidr": "c2"}]})
+        self.assertTrue(wrap._bulk_supported)
+
     def test_supports_extension(self):
         wrap = self.get_wrapper()
         wrap.client.list_extensions.return_value = (
             {"extensions": [{"alias": "extension"}]})
         self.assertTrue(wrap.supports_extension("extension")[0])
-
-        wrap.client.list_extensions.return_value = (
-            {"extensions": [{"alias": "extension"}]})
         self.assertFalse(wrap.supports_extension("dummy-group")[0])
+        # extensions are listed once
+        wrap.client.list_extensions.assert_called_once_with()
 
         wrap.client.list_extensions.return_value = {}
+        self.assertTrue(wrap.supports_extension("extension")[0])
+        osclients.NEUTRON_EXTENSIONS.invalidate(wrap.client)
         self.assertFalse(wrap.supports_extension("extension")[0])
 
 